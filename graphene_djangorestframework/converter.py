@@ -22,7 +22,7 @@ from graphene.utils.str_converters import to_camel_case, to_const
 from graphql import assert_valid_name
 
 from .compat import ArrayField, HStoreField, JSONField, RangeField
-from .fields import DjangoListField
+from .fields import DjangoForeignKeyField, DjangoListField
 from .relay.fields import DjangoConnectionField
 from .utils import import_single_dispatch
 
@@ -205,7 +205,9 @@ def convert_field_to_djangomodel(field, registry=None):
         if not _type:
             return
 
-        return Field(_type, description=field.help_text, required=not field.null)
+        return DjangoForeignKeyField(
+            _type, field, description=field.help_text, required=not field.null
+        )
 
     return Dynamic(dynamic_type)
 
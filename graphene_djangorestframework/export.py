@@ -0,0 +1,33 @@
+class ExportState(object):
+    """
+    Progress of an export, shared through the GraphQL context with the
+    connection field being exported. Every page of the export executes the
+    query again, the connection resolves the `first` rows after `after`.
+    """
+
+    def __init__(self, chunk_size):
+        self.first = chunk_size
+        self.after = None
+        self.page = 0
+        self.page_info = None
+
+    def next_page(self, first):
+        self.first = first
+        self.after = self.page_info.end_cursor
+        self.page += 1
+        self.page_info = None
+
+    @property
+    def has_next_page(self):
+        return self.page_info is not None and self.page_info.has_next_page
+
+
+def get_export_state(info):
+    """
+    Return the export state if the field being resolved is the exported
+    connection, the single top level field of an export query.
+    """
+    context = getattr(info, "context", None)
+    if not isinstance(context, dict) or len(info.path or ()) != 1:
+        return None
+    return context.get("export")
@@ -3,10 +3,17 @@ import warnings
 from functools import partial
 
 from graphene.types import Field, List
+from graphql.type.definition import get_named_type
+
+from django.db.models import Model
+from django.db.models.query import QuerySet
 
 from rest_framework.exceptions import PermissionDenied, Throttled
 
-from .utils import maybe_queryset
+from .settings import graphene_settings
+from .utils import iterate_queryset, maybe_queryset
+from .optimizer import optimize_queryset
+from .identity_map import get_identity_map
 
 
 def check_permission_classes(info, field, permission_classes):
@@ -41,6 +48,12 @@ class DjangoField(Field):
     def __init__(self, *args, **kwargs):
         self.permission_classes = kwargs.pop("permission_classes", None)
         self.throttle_classes = kwargs.pop("throttle_classes", None)
+        # Lookups and columns the parent queryset needs for this field to be
+        # resolved without extra queries, picked up by the query optimizer.
+        self.select_related = kwargs.pop("select_related", ())
+        self.prefetch_related = kwargs.pop("prefetch_related", ())
+        self.only = kwargs.pop("only", None)
+        self.annotate = kwargs.pop("annotate", None)
         super(DjangoField, self).__init__(*args, **kwargs)
 
     @classmethod
@@ -72,6 +85,13 @@ class DjangoListField(Field):
     def __init__(self, _type, *args, **kwargs):
         self.permission_classes = kwargs.pop("permission_classes", None)
         self.throttle_classes = kwargs.pop("throttle_classes", None)
+        self.select_related = kwargs.pop("select_related", ())
+        self.prefetch_related = kwargs.pop("prefetch_related", ())
+        self.only = kwargs.pop("only", None)
+        self.annotate = kwargs.pop("annotate", None)
+        self.chunk_size = kwargs.pop(
+            "chunk_size", graphene_settings.QUERYSET_ITERATOR_CHUNK_SIZE
+        )
         super(DjangoListField, self).__init__(List(_type), *args, **kwargs)
 
     @property
@@ -86,12 +106,29 @@ class DjangoListField(Field):
         info,
         permission_classes=None,
         throttle_classes=None,
+        chunk_size=None,
         **args
     ):
         check_permission_classes(info, cls, permission_classes)
         check_throttle_classes(info, cls, throttle_classes)
 
-        return maybe_queryset(resolver(root, info, **args), info)
+        iterable = maybe_queryset(resolver(root, info, **args), info)
+        object_type = getattr(get_named_type(info.return_type), "graphene_type", None)
+        iterable = optimize_queryset(
+            iterable,
+            info,
+            object_type,
+            lean_rows=getattr(getattr(object_type, "_meta", None), "lean_rows", False),
+        )
+
+        if (
+            chunk_size
+            and isinstance(iterable, QuerySet)
+            and iterable._result_cache is None
+        ):
+            # Rows are released once they have been serialized.
+            return iterate_queryset(iterable, chunk_size)
+        return iterable
 
     def get_resolver(self, parent_resolver):
         return partial(
@@ -99,4 +136,46 @@ class DjangoListField(Field):
             parent_resolver,
             permission_classes=self.permission_classes,
             throttle_classes=self.throttle_classes,
+            chunk_size=self.chunk_size,
+        )
+
+
+class DjangoForeignKeyField(Field):
+    """
+    Field for forward foreign keys and one to one fields. The related instance
+    is looked up in the request identity map before the model descriptor
+    queries for it, and stored there once it has been loaded.
+    """
+
+    def __init__(self, _type, model_field, *args, **kwargs):
+        self.model_field = model_field
+        super(DjangoForeignKeyField, self).__init__(_type, *args, **kwargs)
+
+    @classmethod
+    def foreign_key_resolver(cls, resolver, model_field, root, info, **args):
+        identity_map = get_identity_map(info)
+        if identity_map is None or not isinstance(root, Model):
+            return resolver(root, info, **args)
+
+        related_model = model_field.related_model
+        if (
+            not model_field.is_cached(root)
+            and model_field.attname in root.__dict__
+            and model_field.target_field == related_model._meta.pk
+        ):
+            pk = getattr(root, model_field.attname)
+            instance = identity_map.get(related_model, pk) if pk is not None else None
+            if instance is not None:
+                model_field.set_cached_value(root, instance)
+
+        related = resolver(root, info, **args)
+        if isinstance(related, Model):
+            identity_map.add(related)
+        return related
+
+    def get_resolver(self, parent_resolver):
+        return partial(
+            self.foreign_key_resolver,
+            self.resolver or parent_resolver,
+            self.model_field,
         )
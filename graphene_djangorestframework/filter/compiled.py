@@ -0,0 +1,97 @@
+from django import forms
+from django.core.exceptions import ValidationError
+from django_filters import filters
+from django_filters.filterset import BaseFilterSet
+
+from .filterset import GlobalIDFilter, GlobalIDMultipleChoiceFilter
+from .search import SearchFilter
+
+# Filter implementations that only depend on the filter's own options, the
+# filters of a FilterSet using them can be applied without the FilterSet.
+COMPILABLE_FILTER_METHODS = (
+    filters.Filter.filter,
+    filters.ChoiceFilter.filter,
+    filters.MultipleChoiceFilter.filter,
+    filters.RangeFilter.filter,
+    filters.OrderingFilter.filter,
+    GlobalIDFilter.filter,
+    GlobalIDMultipleChoiceFilter.filter,
+    SearchFilter.filter,
+)
+
+# FilterSet members which, when overridden, may change how the queryset is
+# filtered.
+FILTERSET_MEMBERS = (
+    "__init__",
+    "qs",
+    "filter_queryset",
+    "form",
+    "get_form_class",
+    "errors",
+    "is_valid",
+)
+
+_compiled_filtersets = {}
+
+
+def can_compile_filter(filter_):
+    if filter_.method or isinstance(filter_, filters.QuerySetRequestMixin):
+        return False
+    return getattr(type(filter_), "filter", None) in COMPILABLE_FILTER_METHODS
+
+
+def can_compile_filterset(filterset_class):
+    if filterset_class._meta.form is not forms.Form:
+        return False
+
+    for name in FILTERSET_MEMBERS:
+        if getattr(filterset_class, name) is not getattr(BaseFilterSet, name):
+            return False
+    return True
+
+
+class CompiledFilterSet(object):
+    """
+    Applies the filters of a FilterSet to a queryset without building the
+    FilterSet and its form for every request. Each argument is read and
+    cleaned by the form field of its filter, the way the form would, and
+    arguments that don't validate are ignored, like `FilterSet.qs` does.
+    """
+
+    def __init__(self, filterset_class):
+        # The filters get their model and parent from a FilterSet instance,
+        # which isn't bound to any data.
+        self.filters = filterset_class().filters
+
+    def filter(self, queryset, data):
+        queryset = queryset.all()
+        for name, filter_ in self.filters.items():
+            if name not in data:
+                # Filters compiled here don't filter on empty values.
+                continue
+
+            field = filter_.field
+            try:
+                value = field.clean(field.widget.value_from_datadict(data, {}, name))
+            except ValidationError:
+                continue
+
+            queryset = filter_.filter(queryset, value)
+        return queryset
+
+
+def get_compiled_filterset(filterset_class):
+    """
+    Return the CompiledFilterSet of the filterset class, or None if its
+    filters have to be applied by a FilterSet instance.
+    """
+    if filterset_class not in _compiled_filtersets:
+        compiled = None
+        if can_compile_filterset(filterset_class) and all(
+            can_compile_filter(filter_)
+            for filter_ in filterset_class.base_filters.values()
+        ):
+            compiled = CompiledFilterSet(filterset_class)
+        _compiled_filtersets[filterset_class] = compiled
+
+    return _compiled_filtersets[filterset_class]
@@ -1,10 +1,16 @@
+import warnings
 from collections import OrderedDict
+from contextlib import ExitStack
 from functools import partial
 
+from graphene import Argument, List, NonNull
 from graphene.types.argument import to_arguments
 from ..relay.fields import DjangoConnectionField
-from ..utils import maybe_queryset
-from ..fields import check_permission_classes, check_throttle_classes
+from ..settings import graphene_settings
+from ..utils import get_instance, maybe_queryset
+from .compiled import get_compiled_filterset
+from .ordering import check_ordering_indexes, get_order_by_enum, get_ordering
+from .usage import QueryTimer
 from .utils import get_filtering_args_from_filterset, get_filterset_class
 
 
@@ -19,20 +25,38 @@ class DjangoFilterConnectionField(DjangoConnectionField):
         *args,
         **kwargs
     ):
+        if order_by not in (None, False):
+            warnings.warn(
+                DeprecationWarning(
+                    "order_by only accepts False, to disable the orderBy argument, "
+                    "other values are ignored. Its values are declared with "
+                    "order_by_fields on the type's Meta."
+                ),
+                stacklevel=2,
+            )
+            order_by = None
         self._fields = fields
+        self._order_by = order_by
         self._provided_filterset_class = filterset_class
         self._filterset_class = None
         self._extra_filter_meta = extra_filter_meta
         self._base_args = None
+        self._args = None
+        self._filtering_args = None
         super(DjangoFilterConnectionField, self).__init__(type, *args, **kwargs)
 
     @property
     def args(self):
-        return to_arguments(self._base_args or OrderedDict(), self.filtering_args)
+        if self._args is None:
+            self._args = to_arguments(
+                self._base_args or OrderedDict(), self.get_extra_args()
+            )
+        return self._args
 
     @args.setter
     def args(self, args):
         self._base_args = args
+        self._args = None
 
     @property
     def filterset_class(self):
@@ -43,14 +67,48 @@ class DjangoFilterConnectionField(DjangoConnectionField):
                 meta.update(self._extra_filter_meta)
 
             self._filterset_class = get_filterset_class(
-                self._provided_filterset_class, **meta
+                self._provided_filterset_class,
+                registry=self.node_type._meta.registry,
+                **meta
             )
 
         return self._filterset_class
 
     @property
     def filtering_args(self):
-        return get_filtering_args_from_filterset(self.filterset_class, self.node_type)
+        if self._filtering_args is None:
+            self._filtering_args = get_filtering_args_from_filterset(
+                self.filterset_class, self.node_type
+            )
+        return self._filtering_args
+
+    @property
+    def order_by_fields(self):
+        # An ordering filter of the filterset takes the orderBy argument.
+        if self._order_by is False or "order_by" in self.filtering_args:
+            return ()
+        return tuple(self.node_type._meta.order_by_fields)
+
+    def get_extra_args(self):
+        order_by_fields = self.order_by_fields
+        if not order_by_fields:
+            return self.filtering_args
+
+        if graphene_settings.CHECK_ORDERING_INDEXES:
+            check_ordering_indexes(self.model, order_by_fields, self.filterset_class)
+
+        order_by_enum = get_order_by_enum(self.node_type, order_by_fields)
+        return dict(
+            self.filtering_args,
+            order_by=Argument(
+                List(NonNull(order_by_enum)),
+                description="Orderings of the connection, ties are broken by the id.",
+            ),
+        )
+
+    def get_prefetch_queryset(self, info, model_field):
+        # The rows depend on the filtering arguments of every parent.
+        return None
 
     @classmethod
     def merge_querysets(cls, default_queryset, queryset):
@@ -86,37 +144,70 @@ class DjangoFilterConnectionField(DjangoConnectionField):
         enforce_first_or_last,
         permission_classes,
         throttle_classes,
+        keyset_pagination,
+        count_strategy,
+        window_count,
+        chunk_size,
+        result_cache,
+        lean_rows,
         filterset_class,
         filtering_args,
         root,
         info,
         **args
     ):
-        check_permission_classes(info, cls, permission_classes)
-        check_throttle_classes(info, cls, throttle_classes)
+        cls.check_permissions(info, permission_classes, throttle_classes)
 
         permission_classes = []  # already checked, should be skipped
         throttle_classes = []  # already checked, should be skipped
 
         filter_kwargs = {k: v for k, v in args.items() if k in filtering_args}
-        qs = filterset_class(
-            data=filter_kwargs,
-            queryset=maybe_queryset(default_manager, info),
-            request=info.context.get('request', None) if info.context else None,
-        ).qs
-
-        return super(DjangoFilterConnectionField, cls).connection_resolver(
-            resolver,
-            connection,
-            qs,
-            max_limit,
-            enforce_first_or_last,
-            permission_classes,
-            throttle_classes,
-            root,
-            info,
-            **args
+        compiled = (
+            get_compiled_filterset(filterset_class)
+            if graphene_settings.COMPILE_FILTERSETS
+            else None
         )
+        if compiled is not None:
+            qs = compiled.filter(maybe_queryset(default_manager, info), filter_kwargs)
+        else:
+            qs = filterset_class(
+                data=filter_kwargs,
+                queryset=maybe_queryset(default_manager, info),
+                request=info.context.get('request', None) if info.context else None,
+            ).qs
+
+        if args.get("order_by") and "order_by" not in filtering_args:
+            qs = qs.order_by(*get_ordering(qs.model, args["order_by"]))
+
+        recorder = get_instance(graphene_settings.FILTER_USAGE_RECORDER)
+        timer = QueryTimer() if recorder is not None else None
+        with ExitStack() as stack:
+            if timer is not None:
+                stack.enter_context(timer.time(qs.db))
+            resolved = super(DjangoFilterConnectionField, cls).connection_resolver(
+                resolver,
+                connection,
+                qs,
+                max_limit,
+                enforce_first_or_last,
+                permission_classes,
+                throttle_classes,
+                keyset_pagination,
+                count_strategy,
+                window_count,
+                chunk_size,
+                result_cache,
+                lean_rows,
+                root,
+                info,
+                **args
+            )
+        if recorder is not None:
+            resolved = timer.time_connection(resolved, qs.db)
+            recorder.record(
+                qs, filterset_class, filter_kwargs, args.get("order_by"), timer
+            )
+        return resolved
 
     def get_resolver(self, parent_resolver):
         return partial(
@@ -128,6 +219,12 @@ class DjangoFilterConnectionField(DjangoConnectionField):
             self.enforce_first_or_last,
             self.permission_classes,
             self.throttle_classes,
+            self.keyset_pagination,
+            self.count_strategy,
+            self.window_count,
+            self.chunk_size,
+            self.result_cache,
+            self.get_lean_rows(),
             self.filterset_class,
             self.filtering_args,
         )
@@ -1,32 +1,136 @@
+import binascii
 import itertools
+from collections import OrderedDict
 
+from django.core.exceptions import FieldDoesNotExist, ValidationError
 from django.db import models
+from django.db.models.constants import LOOKUP_SEP
 from django_filters import Filter, MultipleChoiceFilter, VERSION
+from django_filters.constants import EMPTY_VALUES
 from django_filters.filterset import BaseFilterSet, FilterSet
 from django_filters.filterset import FILTER_FOR_DBFIELD_DEFAULTS
 
+from graphql import GraphQLError
 from graphql_relay.node.node import from_global_id
 
+from ..registry import get_global_registry
+from ..settings import graphene_settings
 from .forms import GlobalIDFormField, GlobalIDMultipleChoiceField
+from .search import SearchFilter
 
 
-class GlobalIDFilter(Filter):
+def get_related_model(model, field_name):
+    """
+    Return the model the global IDs compared to a field path are IDs of,
+    following its relations, or None if the path isn't made of fields.
+    """
+    for name in field_name.split(LOOKUP_SEP):
+        if name == "pk":
+            continue
+        try:
+            field = model._meta.get_field(name)
+        except FieldDoesNotExist:
+            return None
+        if field.is_relation:
+            model = field.related_model
+    return model
+
+
+def get_model_types(model, registry):
+    """
+    Return the types of the registry global IDs of the model may be of, by
+    name, the type of its concrete model as well for proxies.
+    """
+    types = {}
+    for type_model in (model, model._meta.concrete_model):
+        object_type = registry.get_type_for_model(type_model)
+        if object_type is not None:
+            types[object_type._meta.name] = object_type
+    return types
+
+
+def decode_global_ids(global_ids, model, types=None):
+    """
+    Decode global IDs of nodes of the model to their distinct primary keys,
+    in order. Every ID is checked to be of one of the types, if any are
+    given, and to hold a valid primary key, raising a GraphQLError
+    otherwise, so no query runs with IDs that can't match.
+    """
+    global_ids = list(OrderedDict.fromkeys(global_ids))
+    max_ids = graphene_settings.FILTER_MAX_GLOBAL_IDS
+    if max_ids is not None and len(global_ids) > max_ids:
+        raise GraphQLError("At most {} IDs can be given.".format(max_ids))
+
+    pk_field = model._meta.pk if model is not None else None
+    pks = OrderedDict()
+    for global_id in global_ids:
+        try:
+            type_name, _id = from_global_id(global_id)
+        except (TypeError, ValueError, UnicodeDecodeError, binascii.Error):
+            raise GraphQLError("Invalid ID specified.")
+
+        if types:
+            object_type = types.get(type_name)
+            if object_type is None:
+                raise GraphQLError(
+                    "Must receive {} IDs, not {}.".format(
+                        " or ".join(sorted(types)), type_name
+                    )
+                )
+            if object_type._meta.id_field in ("pk", pk_field.name):
+                try:
+                    _id = pk_field.to_python(_id)
+                except ValidationError:
+                    raise GraphQLError("Invalid ID specified.")
+        pks[_id] = None
+    return list(pks)
+
+
+class GlobalIDFilterMixin(object):
+    def decode(self, qs, global_ids):
+        # The model and its types are resolved on the first call, from the
+        # registry of the types the filterset was built for.
+        if not hasattr(self, "_model_types"):
+            self._related_model = get_related_model(qs.model, self.field_name)
+            registry = getattr(getattr(self, "parent", None), "registry", None)
+            self._model_types = (
+                get_model_types(self._related_model, registry or get_global_registry())
+                if self._related_model is not None
+                else {}
+            )
+        return decode_global_ids(global_ids, self._related_model, self._model_types)
+
+
+class GlobalIDFilter(GlobalIDFilterMixin, Filter):
     field_class = GlobalIDFormField
 
     def filter(self, qs, value):
         """ Convert the filter value to a primary key before filtering """
-        _id = None
-        if value is not None:
-            _, _id = from_global_id(value)
+        if value in EMPTY_VALUES:
+            return super(GlobalIDFilter, self).filter(qs, value)
+
+        if isinstance(value, (list, tuple)):
+            # The IDs of an "in" lookup.
+            return super(GlobalIDFilter, self).filter(qs, self.decode(qs, value))
+        _id, = self.decode(qs, [value])
         return super(GlobalIDFilter, self).filter(qs, _id)
 
 
-class GlobalIDMultipleChoiceFilter(MultipleChoiceFilter):
+class GlobalIDMultipleChoiceFilter(GlobalIDFilterMixin, MultipleChoiceFilter):
     field_class = GlobalIDMultipleChoiceField
 
     def filter(self, qs, value):
-        gids = [from_global_id(v)[1] for v in value]
-        return super(GlobalIDMultipleChoiceFilter, self).filter(qs, gids)
+        if not value:
+            return qs
+
+        pks = self.decode(qs, value)
+        if self.conjoined or self.lookup_expr != "exact":
+            return super(GlobalIDMultipleChoiceFilter, self).filter(qs, pks)
+
+        # A single IN clause instead of one condition per ID, its length is
+        # bounded by FILTER_MAX_GLOBAL_IDS if set.
+        qs = self.get_method(qs)(**{"{}__in".format(self.field_name): pks})
+        return qs.distinct() if self.distinct else qs
 
 
 GRAPHENE_FILTER_SET_OVERRIDES = {
@@ -43,12 +147,25 @@ class GrapheneFilterSetMixin(BaseFilterSet):
     """ A django_filters.filterset.BaseFilterSet with default filter overrides
     to handle global IDs """
 
+    # Registry of the types global IDs are checked against, the global one
+    # unless the filterset was built for the types of another.
+    registry = None
+
     FILTER_DEFAULTS = dict(
         itertools.chain(
             FILTER_FOR_DBFIELD_DEFAULTS.items(), GRAPHENE_FILTER_SET_OVERRIDES.items()
         )
     )
 
+    @classmethod
+    def get_filters(cls):
+        filters = super(GrapheneFilterSetMixin, cls).get_filters()
+        if cls._meta.model is not None:
+            for filter_ in filters.values():
+                if isinstance(filter_, SearchFilter):
+                    filter_.register(cls._meta.model)
+        return filters
+
 
 # To support a Django 1.11 + Python 2.7 combination django-filter must be
 # < 2.x.x. To support the earlier version of django-filter, the
@@ -0,0 +1,151 @@
+import warnings
+
+from django.core.exceptions import FieldDoesNotExist
+from django.db.models.constants import LOOKUP_SEP
+
+import graphene
+
+from django_filters import filters
+
+_order_by_enums = {}
+
+
+def get_order_by_enum(node_type, orderings):
+    """
+    Return the enum of the orderings clients may sort a connection of the
+    node type by, one ascending and one descending value per ordering.
+    """
+    if node_type not in _order_by_enums:
+        values = {}
+        for lookup in orderings:
+            values["{}_ASC".format(lookup.upper())] = lookup
+            values["{}_DESC".format(lookup.upper())] = "-" + lookup
+
+        _order_by_enums[node_type] = type(
+            str("{}OrderBy".format(node_type._meta.name)), (graphene.Enum,), values
+        )
+    return _order_by_enums[node_type]
+
+
+def get_local_field(model, lookup):
+    """
+    Return the model field of a lookup that doesn't span relations, or
+    None if it does.
+    """
+    if lookup == "pk":
+        return model._meta.pk
+    if LOOKUP_SEP in lookup:
+        return None
+    try:
+        return model._meta.get_field(lookup)
+    except FieldDoesNotExist:
+        return None
+
+
+def is_unique_field(field):
+    return field is not None and (field.primary_key or (field.unique and not field.null))
+
+
+def get_ordering(model, order_by):
+    """
+    Add the primary key to the ordering unless it already orders by a unique
+    column, so rows comparing equal keep the same order across pages. The
+    primary key follows the direction of the last ordering, which an index
+    ending with it can serve in a single scan.
+    """
+    order_by = list(order_by)
+    if not order_by:
+        return order_by
+
+    if any(
+        is_unique_field(get_local_field(model, lookup.lstrip("-")))
+        for lookup in order_by
+    ):
+        return order_by
+    return order_by + ["-pk" if order_by[-1].startswith("-") else "pk"]
+
+
+def get_model_indexes(model):
+    """
+    Return the field names of every index of the model, in column order.
+    """
+    opts = model._meta
+    indexes = [(opts.pk.name,)]
+    for field in opts.local_fields:
+        if (field.db_index or field.unique) and not field.primary_key:
+            indexes.append((field.name,))
+    for index in opts.indexes:
+        indexes.append(tuple(name.lstrip("-") for name in index.fields))
+    for fields in list(opts.index_together) + list(opts.unique_together):
+        indexes.append(tuple(fields))
+    return indexes
+
+
+def has_index(indexes, columns):
+    columns = tuple(columns)
+    return any(index[: len(columns)] == columns for index in indexes)
+
+
+def get_equality_filter_fields(model, filterset_class):
+    """
+    Return the local fields the filterset compares to a single value.
+    """
+    fields = []
+    for filter_ in filterset_class.base_filters.values():
+        if isinstance(filter_, filters.OrderingFilter):
+            continue
+        if filter_.lookup_expr != "exact" or filter_.method:
+            continue
+        field = get_local_field(model, filter_.field_name)
+        if field is not None and not is_unique_field(field) and field not in fields:
+            fields.append(field)
+    return fields
+
+
+def check_ordering_indexes(model, orderings, filterset_class=None):
+    """
+    Warn about orderings no index of the model can serve, alone or after
+    the equality filters of the filterset.
+    """
+    indexes = get_model_indexes(model)
+    filter_fields = (
+        get_equality_filter_fields(model, filterset_class) if filterset_class else []
+    )
+
+    for lookup in orderings:
+        field = get_local_field(model, lookup)
+        if field is None:
+            warnings.warn(
+                UserWarning(
+                    "Ordering {} by {} spans a relation, no index can serve it.".format(
+                        model.__name__, lookup
+                    )
+                )
+            )
+            continue
+
+        if not has_index(indexes, [field.name]):
+            warnings.warn(
+                UserWarning(
+                    "Ordering {} by {} has no supporting index.".format(
+                        model.__name__, lookup
+                    )
+                )
+            )
+
+        for filter_field in filter_fields:
+            if filter_field != field and not has_index(
+                indexes, [filter_field.name, field.name]
+            ):
+                warnings.warn(
+                    UserWarning(
+                        "Ordering {} by {} filtered by {} has no index on "
+                        "({}, {}).".format(
+                            model.__name__,
+                            lookup,
+                            filter_field.name,
+                            filter_field.name,
+                            field.name,
+                        )
+                    )
+                )
@@ -0,0 +1,304 @@
+import hashlib
+import warnings
+
+from django import forms
+from django.db import OperationalError, connections, router, transaction
+from django.db.models import F, Q
+from django.db.models.constants import LOOKUP_SEP
+from django.db.models.expressions import RawSQL
+from django.db.models.signals import post_delete, post_save
+from django_filters import Filter
+
+SEARCH_RANK = "search_rank"
+
+INTEGER_FIELD_TYPES = (
+    "AutoField",
+    "BigAutoField",
+    "IntegerField",
+    "BigIntegerField",
+    "PositiveIntegerField",
+    "SmallIntegerField",
+    "PositiveSmallIntegerField",
+)
+
+# SQLite full-text indexes by table name.
+_search_indexes = {}
+
+
+def get_search_terms(value):
+    return value.split()
+
+
+class RawSubquery(RawSQL):
+    """
+    Raw SQL subquery for `__in` lookups, which already parenthesize it.
+    SQLite reads a doubly parenthesized subquery as a single value.
+    """
+
+    def as_sql(self, compiler, connection):
+        return self.sql, self.params
+
+
+class SQLiteSearchIndex(object):
+    """
+    FTS5 table holding the searched columns of a model, with the primary
+    key of each row as its rowid. The table is built, or rebuilt, from the
+    rows of the model by the `graphql_search_index` command, and kept in
+    sync by the `post_save` and `post_delete` signals of the model.
+
+    `bulk_create()`, `QuerySet.update()` and raw SQL don't send the signals,
+    rows written that way aren't searched by their new values until the
+    command rebuilds the table. Until the table is found, or if SQLite was
+    built without FTS5, searches fall back to `icontains` and saves don't
+    sync it, the table is looked up again by each of them so that a table
+    built by another process is used and kept in sync.
+    """
+
+    def __init__(self, model, fields):
+        self.model = model
+        self.fields = fields
+        self.table = self.get_table_name(model, fields)
+
+        # Whether the table can be queried, by database alias. Only found
+        # tables are remembered, missing ones are warned about once.
+        self.built = {}
+        self.warned = set()
+
+        uid = "graphene_search_{}".format(self.table)
+        post_save.connect(self.update_row, sender=model, dispatch_uid=uid)
+        post_delete.connect(self.delete_row, sender=model, dispatch_uid=uid)
+
+    @staticmethod
+    def get_table_name(model, fields):
+        digest = hashlib.md5(",".join(fields).encode("utf-8")).hexdigest()[:8]
+        return "{}_fts_{}".format(model._meta.db_table, digest)
+
+    @classmethod
+    def can_index(cls, model, fields):
+        if model._meta.pk.get_internal_type() not in INTEGER_FIELD_TYPES:
+            return False
+        return all(LOOKUP_SEP not in field for field in fields)
+
+    def get_columns(self, connection):
+        return ", ".join(connection.ops.quote_name(field) for field in self.fields)
+
+    def is_built(self, connection):
+        if self.built.get(connection.alias):
+            return True
+        try:
+            with connection.cursor() as cursor:
+                cursor.execute(
+                    "SELECT rowid FROM {} LIMIT 0".format(
+                        connection.ops.quote_name(self.table)
+                    )
+                )
+        except OperationalError:
+            # The table is missing, or the fts5 module is.
+            if connection.alias not in self.warned:
+                self.warned.add(connection.alias)
+                warnings.warn(
+                    UserWarning(
+                        "The search index {} of {} isn't built, searches fall back "
+                        "to icontains. Build it with the graphql_search_index "
+                        "command.".format(self.table, self.model._meta.label)
+                    )
+                )
+            return False
+        self.built[connection.alias] = True
+        return True
+
+    def build(self, connection):
+        """
+        Create the table, replacing it if it exists, and fill it with the
+        rows of the model. Raises OperationalError without FTS5.
+        """
+        quote_name = connection.ops.quote_name
+        columns = self.get_columns(connection)
+        opts = self.model._meta
+        with transaction.atomic(using=connection.alias), connection.cursor() as cursor:
+            cursor.execute("DROP TABLE IF EXISTS {}".format(quote_name(self.table)))
+            cursor.execute(
+                "CREATE VIRTUAL TABLE {} USING fts5({})".format(
+                    quote_name(self.table), columns
+                )
+            )
+            cursor.execute(
+                "INSERT INTO {} (rowid, {}) SELECT {}, {} FROM {}".format(
+                    quote_name(self.table),
+                    columns,
+                    quote_name(opts.pk.column),
+                    ", ".join(
+                        quote_name(opts.get_field(field).column) for field in self.fields
+                    ),
+                    quote_name(opts.db_table),
+                )
+            )
+        self.built[connection.alias] = True
+
+    def get_connection(self, instance):
+        connection = connections[router.db_for_write(type(instance), instance=instance)]
+        if connection.vendor == "sqlite" and self.is_built(connection):
+            return connection
+        return None
+
+    def update_row(self, instance, **kwargs):
+        connection = self.get_connection(instance)
+        if connection is None:
+            return
+
+        table = connection.ops.quote_name(self.table)
+        values = [getattr(instance, field) for field in self.fields]
+        with connection.cursor() as cursor:
+            cursor.execute("DELETE FROM {} WHERE rowid = %s".format(table), [instance.pk])
+            cursor.execute(
+                "INSERT INTO {} (rowid, {}) VALUES (%s, {})".format(
+                    table,
+                    self.get_columns(connection),
+                    ", ".join(["%s"] * len(values)),
+                ),
+                [instance.pk] + values,
+            )
+
+    def delete_row(self, instance, **kwargs):
+        connection = self.get_connection(instance)
+        if connection is None:
+            return
+
+        with connection.cursor() as cursor:
+            cursor.execute(
+                "DELETE FROM {} WHERE rowid = %s".format(
+                    connection.ops.quote_name(self.table)
+                ),
+                [instance.pk],
+            )
+
+    def get_match(self, value):
+        # Every term is quoted, so FTS5 query syntax in the value is searched
+        # for instead of being interpreted.
+        return " ".join(
+            '"{}"'.format(term.replace('"', '""')) for term in get_search_terms(value)
+        )
+
+    def filter(self, queryset, value, rank):
+        connection = connections[queryset.db]
+        quote_name = connection.ops.quote_name
+        table = quote_name(self.table)
+        match = self.get_match(value)
+        queryset = queryset.filter(
+            pk__in=RawSubquery(
+                "SELECT rowid FROM {0} WHERE {0} MATCH %s".format(table), [match]
+            )
+        )
+        if rank:
+            # FTS5 ranks better matches lower.
+            queryset = queryset.annotate(
+                **{
+                    SEARCH_RANK: RawSQL(
+                        "SELECT -rank FROM {0} WHERE {0} MATCH %s AND "
+                        "{0}.rowid = {1}.{2}".format(
+                            table,
+                            quote_name(self.model._meta.db_table),
+                            quote_name(self.model._meta.pk.column),
+                        ),
+                        [match],
+                    )
+                }
+            )
+        return queryset
+
+
+def get_sqlite_search_index(model, fields):
+    table = SQLiteSearchIndex.get_table_name(model, fields)
+    if table not in _search_indexes:
+        _search_indexes[table] = SQLiteSearchIndex(model, fields)
+    return _search_indexes[table]
+
+
+class SearchFilter(Filter):
+    """
+    Full-text search over `fields`, defaulting to the filter's field.
+
+    On PostgreSQL the fields are searched with a `SearchVector`, or the
+    `SearchVectorField` named by `vector_field`, which a GIN index can
+    serve. On SQLite they are searched through an FTS5 table kept in sync
+    by signals, see SQLiteSearchIndex. Other databases, and fields SQLite
+    can't index, fall back to matching every term with `icontains`. With `rank`, results are
+    ordered by relevance, annotated as `search_rank`.
+    """
+
+    field_class = forms.CharField
+
+    def __init__(
+        self,
+        field_name=None,
+        fields=None,
+        rank=True,
+        config=None,
+        vector_field=None,
+        **kwargs
+    ):
+        self.search_fields = tuple(fields) if fields else None
+        self.rank = rank
+        self.config = config
+        self.vector_field = vector_field
+        super(SearchFilter, self).__init__(field_name=field_name, **kwargs)
+
+    def get_search_fields(self):
+        return self.search_fields or (self.field_name,)
+
+    def register(self, model):
+        """
+        Keep the full-text index of the model in sync on SQLite, called when
+        a filterset using the filter is created.
+        """
+        fields = self.get_search_fields()
+        if SQLiteSearchIndex.can_index(model, fields):
+            get_sqlite_search_index(model, fields)
+
+    def filter_postgresql(self, queryset, value):
+        from django.contrib.postgres.search import SearchQuery, SearchRank, SearchVector
+
+        query = SearchQuery(value, config=self.config)
+        if self.vector_field:
+            # The stored vector is matched as is, so its index serves it.
+            vector = F(self.vector_field)
+            queryset = queryset.filter(**{self.vector_field: query})
+        else:
+            vector = SearchVector(*self.get_search_fields(), config=self.config)
+            queryset = queryset.annotate(_search_vector=vector).filter(
+                _search_vector=query
+            )
+        if self.rank:
+            queryset = queryset.annotate(**{SEARCH_RANK: SearchRank(vector, query)})
+        return queryset
+
+    def filter_icontains(self, queryset, value):
+        for term in get_search_terms(value):
+            condition = Q()
+            for field in self.get_search_fields():
+                condition |= Q(**{"{}__icontains".format(field): term})
+            queryset = queryset.filter(condition)
+        return queryset
+
+    def filter(self, qs, value):
+        if not value or not value.strip():
+            return qs
+
+        connection = connections[qs.db]
+        fields = self.get_search_fields()
+        index = None
+        if connection.vendor == "sqlite" and SQLiteSearchIndex.can_index(
+            qs.model, fields
+        ):
+            index = get_sqlite_search_index(qs.model, fields)
+
+        if connection.vendor == "postgresql":
+            qs = self.filter_postgresql(qs, value)
+        elif index is not None and index.is_built(connection):
+            qs = index.filter(qs, value, self.rank)
+        else:
+            return self.filter_icontains(qs, value)
+
+        if self.rank:
+            qs = qs.order_by("-" + SEARCH_RANK, "pk")
+        return qs
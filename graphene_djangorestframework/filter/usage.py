@@ -0,0 +1,344 @@
+import hashlib
+import threading
+import time
+
+from django.core.cache import DEFAULT_CACHE_ALIAS, caches
+from django.core.exceptions import EmptyResultSet
+from django.db import connections
+
+from ..relay.connection import DjangoConnection
+from ..relay.edges import ChunkedEdges
+from .ordering import get_local_field, get_model_indexes, has_index
+
+# Lookups comparing a column to one or a few values, which a composite index
+# serves best from its leading columns.
+EQUALITY_LOOKUPS = ("exact", "iexact", "in", "isnull")
+
+# Counters of a combination, each in its own cache key for atomic increments,
+# durations are counted in microseconds.
+USAGE_COUNTERS = ("count", "queries", "duration", "max_duration")
+
+# Usage recorded by the process and not written to the cache yet, by cache
+# alias and key prefix, as recorders may be instantiated per request.
+_pending_usages = {}
+_pending_lock = threading.Lock()
+
+
+class QueryTimer(object):
+    """
+    Database execute wrapper counting and timing the queries it runs.
+    """
+
+    def __init__(self):
+        self.queries = 0
+        self.duration = 0.0
+
+    def __call__(self, execute, sql, params, many, context):
+        start = time.perf_counter()
+        try:
+            return execute(sql, params, many, context)
+        finally:
+            self.duration += time.perf_counter() - start
+            self.queries += 1
+
+    def time(self, using):
+        return connections[using].execute_wrapper(self)
+
+    def time_connection(self, connection, using):
+        """
+        Time the queries a resolved connection runs once its resolver has
+        returned: its total count, when `totalCount` is resolved, and the
+        chunks of its edges. The pages of batched connections are timed by
+        their loader, which runs under the timer active when they're loaded.
+        """
+        if not isinstance(connection, DjangoConnection):
+            return connection
+
+        get_total_count = connection.get_total_count
+
+        def timed_get_total_count():
+            with self.time(using):
+                return get_total_count()
+
+        connection.get_total_count = timed_get_total_count
+        if isinstance(connection.edges, ChunkedEdges):
+            connection.edges = TimedIterable(connection.edges, self, using)
+        return connection
+
+
+class TimedIterable(object):
+    """
+    Iterable timing the queries run to produce each of its items, and not
+    the ones run by the consumer between them.
+    """
+
+    __slots__ = ("iterable", "timer", "using")
+
+    def __init__(self, iterable, timer, using):
+        self.iterable = iterable
+        self.timer = timer
+        self.using = using
+
+    def __iter__(self):
+        iterator = iter(self.iterable)
+        while True:
+            with self.timer.time(self.using):
+                try:
+                    item = next(iterator)
+                except StopIteration:
+                    return
+            yield item
+
+
+def get_filter_lookups(filterset_class, filter_names):
+    """
+    Return the (field name, lookup) pairs the named filters of the filterset
+    compare, skipping filters implemented by a method.
+    """
+    lookups = []
+    for name in filter_names:
+        filter_ = filterset_class.base_filters.get(name)
+        if filter_ is None or filter_.method or not filter_.field_name:
+            continue
+        lookups.append((filter_.field_name, filter_.lookup_expr))
+    return lookups
+
+
+def get_column_field(model, lookup):
+    """
+    Return the model field of a lookup comparing a column of the model's
+    table, or None if it spans or is a relation stored elsewhere.
+    """
+    field = get_local_field(model, lookup)
+    if field is None or not field.concrete or field.many_to_many:
+        return None
+    return field
+
+
+def suggest_index(model, lookups, order_by):
+    """
+    Return the fields of an index serving the filters and ordering of a
+    combination, equality filters first, then the ordering, then the other
+    filters, or None if the model has such an index already.
+    """
+    equality, ordering, ranges = [], [], []
+    for field_name, lookup in lookups:
+        field = get_column_field(model, field_name)
+        if field is not None:
+            (equality if lookup in EQUALITY_LOOKUPS else ranges).append(field.name)
+    for lookup in order_by or ():
+        field = get_column_field(model, lookup.lstrip("-"))
+        if field is not None:
+            ordering.append(field.name)
+
+    fields = []
+    for name in equality + ordering + ranges:
+        if name not in fields:
+            fields.append(name)
+    if not fields or has_index(get_model_indexes(model), fields):
+        return None
+    return fields
+
+
+def get_sequential_scans(vendor, plan):
+    """
+    Return the tables an EXPLAIN plan reads in full, from the rows of the
+    plan, on SQLite and PostgreSQL.
+    """
+    tables = []
+    for row in plan:
+        detail = row[-1] if isinstance(row, (list, tuple)) else row
+        words = str(detail).split()
+        if vendor == "sqlite" and words[:1] == ["SCAN"] and "USING" not in words:
+            # "SCAN TABLE <table>" before SQLite 3.36, "SCAN <table>" since.
+            table = words[2] if words[1:2] == ["TABLE"] else words[1]
+        elif vendor == "postgresql" and "Seq Scan on" in detail:
+            table = detail.split("Seq Scan on", 1)[1].split()[0]
+        else:
+            continue
+        if table not in tables:
+            tables.append(table)
+    return tables
+
+
+def to_microseconds(duration):
+    return int(round(duration * 1000000))
+
+
+class FilterUsageRecorder(object):
+    """
+    Records the combinations of filtering arguments filter connections are
+    queried with, how often and the time their SQL queries take, in the
+    Django cache shared by every process. The SQL of each combination is
+    kept without its parameters, for the `graphql_filter_usage` command to
+    explain.
+
+    Combinations are keyed by the model, the names of the filters and the
+    ordering, never the values filtered by. Each process adds up its calls
+    and writes them, incrementing counters of the cache, from the first
+    call made once `batch_size` calls were recorded or `flush_interval`
+    seconds passed. The timers of the calls are read then, so the queries
+    of a connection run after its resolver returned are included. Calls not
+    written when the process exits are lost. The maximum duration is
+    replaced without a lock, of two concurrent writes the lower may be kept.
+    """
+
+    def __init__(
+        self,
+        cache_alias=DEFAULT_CACHE_ALIAS,
+        key_prefix="graphene:filter_usage",
+        timeout=None,
+        batch_size=100,
+        flush_interval=10,
+    ):
+        self.cache_alias = cache_alias
+        self.key_prefix = key_prefix
+        self.timeout = timeout
+        self.batch_size = batch_size
+        self.flush_interval = flush_interval
+
+    @property
+    def cache(self):
+        return caches[self.cache_alias]
+
+    @property
+    def index_key(self):
+        return "{}:index".format(self.key_prefix)
+
+    def get_index_keys(self):
+        return [
+            "{}:{}".format(self.index_key, slot)
+            for slot in range(1, (self.cache.get(self.index_key) or 0) + 1)
+        ]
+
+    def get_cache_key(self, combination):
+        digest = hashlib.md5(repr(combination).encode("utf-8")).hexdigest()
+        return "{}:{}".format(self.key_prefix, digest)
+
+    def record(self, queryset, filterset_class, filter_kwargs, order_by, timer):
+        filters = tuple(
+            sorted(name for name, value in filter_kwargs.items() if value is not None)
+        )
+        order_by = tuple(order_by or ())
+        model = queryset.model._meta.label
+        key = self.get_cache_key((model, filters, order_by))
+
+        try:
+            sql, params = queryset.query.sql_with_params()
+        except EmptyResultSet:
+            sql, params = None, ()
+
+        written = None
+        with _pending_lock:
+            pending = _pending_usages.get((self.cache_alias, self.key_prefix))
+            if pending is not None and (
+                pending["calls"] >= self.batch_size
+                or time.monotonic() - pending["since"] >= self.flush_interval
+            ):
+                written = _pending_usages.pop((self.cache_alias, self.key_prefix))
+
+            pending = _pending_usages.setdefault(
+                (self.cache_alias, self.key_prefix),
+                {"calls": 0, "since": time.monotonic(), "usages": {}},
+            )
+            usage = pending["usages"].setdefault(
+                key,
+                {
+                    "model": model,
+                    "filters": filters,
+                    "lookups": get_filter_lookups(filterset_class, filters),
+                    "order_by": order_by,
+                    "timers": [],
+                },
+            )
+            usage["timers"].append(timer)
+            if sql is not None:
+                # The parameters are the values filtered by, only their number
+                # is kept to explain the query.
+                usage.update(database=queryset.db, sql=sql, param_count=len(params))
+            pending["calls"] += 1
+
+        if written is not None:
+            self.write(written["usages"])
+
+    def flush(self):
+        """
+        Write the usage the process recorded and didn't write yet.
+        """
+        with _pending_lock:
+            pending = _pending_usages.pop((self.cache_alias, self.key_prefix), None)
+        if pending is not None:
+            self.write(pending["usages"])
+
+    def incr(self, key, delta):
+        try:
+            return self.cache.incr(key, delta)
+        except ValueError:
+            if self.cache.add(key, delta, self.timeout):
+                return delta
+            # Added by another process meanwhile.
+            return self.cache.incr(key, delta)
+
+    def write(self, usages):
+        for key, usage in usages.items():
+            description = {
+                name: value for name, value in usage.items() if name != "timers"
+            }
+            durations = [to_microseconds(timer.duration) for timer in usage["timers"]]
+            counters = {
+                "count": len(durations),
+                "queries": sum(timer.queries for timer in usage["timers"]),
+                "duration": sum(durations),
+                "max_duration": max(durations),
+            }
+            if self.cache.add(key, description, self.timeout):
+                # Combinations are listed in numbered keys, the first process
+                # describing one lists it.
+                slot = self.incr(self.index_key, 1)
+                self.cache.set("{}:{}".format(self.index_key, slot), key, self.timeout)
+            elif "sql" in description:
+                self.cache.set(key, description, self.timeout)
+
+            for name in ("count", "queries", "duration"):
+                self.incr("{}:{}".format(key, name), counters[name])
+            max_key = "{}:max_duration".format(key)
+            if counters["max_duration"] > (self.cache.get(max_key) or 0):
+                self.cache.set(max_key, counters["max_duration"], self.timeout)
+
+    def get_usages(self):
+        """
+        Return the recorded combinations, the ones spending the most time in
+        SQL first, with their durations in seconds.
+        """
+        self.flush()
+        keys = list(self.cache.get_many(self.get_index_keys()).values())
+        values = self.cache.get_many(
+            keys
+            + ["{}:{}".format(key, name) for key in keys for name in USAGE_COUNTERS]
+        )
+
+        usages = []
+        for key in keys:
+            counters = {
+                name: values.get("{}:{}".format(key, name), 0)
+                for name in USAGE_COUNTERS
+            }
+            if key not in values or not counters["count"]:
+                continue
+            usage = dict(values[key], **counters)
+            usage["duration"] /= 1000000.0
+            usage["max_duration"] /= 1000000.0
+            usages.append(usage)
+        return sorted(usages, key=lambda usage: usage["duration"], reverse=True)
+
+    def clear(self):
+        with _pending_lock:
+            _pending_usages.pop((self.cache_alias, self.key_prefix), None)
+        index_keys = self.get_index_keys()
+        keys = list(self.cache.get_many(index_keys).values())
+        self.cache.delete_many(
+            keys
+            + ["{}:{}".format(key, name) for key in keys for name in USAGE_COUNTERS]
+            + index_keys
+            + [self.index_key]
+        )
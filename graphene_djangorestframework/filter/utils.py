@@ -3,6 +3,21 @@ import six
 from .filterset import custom_filterset_factory, setup_filterset
 
 
+def freeze(value):
+    """
+    Return a hashable version of filterset meta options, raises TypeError
+    for values that can't be hashed.
+    """
+    if isinstance(value, dict):
+        return tuple(sorted((key, freeze(item)) for key, item in value.items()))
+    if isinstance(value, (list, tuple)):
+        return tuple(freeze(item) for item in value)
+    if isinstance(value, (set, frozenset)):
+        return frozenset(freeze(item) for item in value)
+    hash(value)
+    return value
+
+
 def get_filtering_args_from_filterset(filterset_class, type):
     """ Inspect a FilterSet and produce the arguments to pass to
         a Graphene Field. These arguments will be available to
@@ -10,19 +25,49 @@ def get_filtering_args_from_filterset(filterset_class, type):
     """
     from .converter import convert_form_field
 
+    # The arguments are shared by the filter fields of the type's registry.
+    registry = type._meta.registry
+    key = (filterset_class, type)
+    args = registry.get_filtering_args(key)
+    if args is not None:
+        return dict(args)
+
     args = {}
     for name, filter_field in six.iteritems(filterset_class.base_filters):
         field_type = convert_form_field(filter_field.field).Argument()
         field_type.description = filter_field.label
         args[name] = field_type
 
-    return args
+    registry.register_filtering_args(key, args)
+    return dict(args)
 
 
-def get_filterset_class(filterset_class, **meta):
-    """Get the class to be used as the FilterSet"""
+def get_filterset_class(filterset_class, registry=None, **meta):
+    """Get the class to be used as the FilterSet, shared by the filter
+    fields of the registry filtering the same way.
+    """
+    key = None
+    if registry is not None:
+        try:
+            # The meta is only used to build a filterset if none was given.
+            key = (filterset_class, None if filterset_class else freeze(meta))
+        except TypeError:
+            pass
+
+    if key is not None:
+        filterset = registry.get_filterset_class(key)
+        if filterset is not None:
+            return filterset
+
     if filterset_class:
         # If were given a FilterSet class, then set it up and
         # return it
-        return setup_filterset(filterset_class)
-    return custom_filterset_factory(**meta)
+        filterset = setup_filterset(filterset_class)
+    else:
+        filterset = custom_filterset_factory(**meta)
+
+    if registry is not None:
+        filterset.registry = registry
+    if key is not None:
+        registry.register_filterset_class(key, filterset)
+    return filterset
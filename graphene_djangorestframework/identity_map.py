@@ -0,0 +1,112 @@
+from django.core.exceptions import ValidationError
+
+from .settings import graphene_settings
+
+
+def get_loaded_fields(queryset):
+    """
+    Return the attnames of the columns the rows of the queryset are loaded
+    with, after only() or defer().
+    """
+    field_names, defer = queryset.query.deferred_loading
+    pk = queryset.model._meta.pk
+    return set(
+        field.attname
+        for field in queryset.model._meta.concrete_fields
+        if (field.name not in field_names) == defer or field is pk
+    )
+
+
+class IdentityMap(object):
+    """
+    Request scoped map of model instances, keyed by (concrete model,
+    primary key), so a row fetched once is not fetched again by later node
+    lookups or foreign key traversals.
+
+    Instances loaded with deferred fields are stored as well, lookups only
+    receive them if they hold the columns the lookup would have loaded.
+    Columns loaded by later fetches of the same row are merged into the
+    stored instance.
+
+    Foreign keys are traversed through the base manager of the related
+    model, which may return rows its default manager hides. Lookups made
+    in place of the default manager only receive instances it loaded.
+    """
+
+    def __init__(self):
+        self._instances = {}
+        # Models and keys of the instances loaded through the default
+        # manager of the model, proxies may have their own.
+        self._default_manager_keys = set()
+
+    @staticmethod
+    def get_key(model, pk):
+        concrete_model = model._meta.concrete_model
+        try:
+            pk = concrete_model._meta.pk.to_python(pk)
+        except ValidationError:
+            return None
+        return concrete_model, pk
+
+    def get(self, model, pk, fields=None, default_manager=False):
+        """
+        Return the instance of the model with the primary key if it holds
+        the columns of `fields`, an iterable of attnames, or every column
+        when `fields` is None, and with `default_manager` if it was loaded
+        through the default manager of the model.
+        """
+        key = self.get_key(model, pk)
+        if key is None:
+            return None
+        if default_manager and (model, key) not in self._default_manager_keys:
+            return None
+
+        instance = self._instances.get(key)
+        if instance is None or not isinstance(instance, model):
+            return None
+
+        deferred = instance.get_deferred_fields()
+        if deferred and (fields is None or deferred.intersection(fields)):
+            return None
+        return instance
+
+    def add(self, instance, default_manager=False):
+        if instance.pk is None:
+            return
+
+        key = self.get_key(type(instance), instance.pk)
+        if key is None:
+            return
+
+        if default_manager:
+            self._default_manager_keys.add((type(instance), key))
+        existing = self._instances.setdefault(key, instance)
+        if existing is not instance:
+            for attname in existing.get_deferred_fields():
+                if attname in instance.__dict__:
+                    existing.__dict__[attname] = instance.__dict__[attname]
+
+    def clear(self):
+        self._instances.clear()
+        self._default_manager_keys.clear()
+
+    def __len__(self):
+        return len(self._instances)
+
+
+def get_identity_map(info):
+    """
+    Return the identity map of the request being resolved, stored on the
+    GraphQL context, or None when there is no context to store it on.
+    """
+    if not graphene_settings.REQUEST_IDENTITY_MAP:
+        return None
+
+    context = getattr(info, "context", None)
+    if not isinstance(context, dict):
+        return None
+
+    identity_map = context.get("identity_map")
+    if identity_map is None:
+        identity_map = context["identity_map"] = IdentityMap()
+    return identity_map
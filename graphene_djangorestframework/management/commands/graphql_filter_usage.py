@@ -0,0 +1,107 @@
+from django.apps import apps
+from django.core.management.base import BaseCommand, CommandError
+from django.db import DatabaseError, connections
+
+from graphene_djangorestframework.filter.usage import (
+    get_sequential_scans,
+    suggest_index,
+)
+from graphene_djangorestframework.settings import graphene_settings
+from graphene_djangorestframework.utils import get_instance
+
+
+class Command(BaseCommand):
+    help = (
+        "Report the filtering argument combinations of filter connections "
+        "spending the most time in SQL, explaining their queries to find "
+        "sequential scans and suggesting indexes for them"
+    )
+    can_import_settings = True
+
+    def add_arguments(self, parser):
+        parser.add_argument(
+            "--limit",
+            type=int,
+            dest="limit",
+            default=10,
+            help="Number of combinations to report (default: 10)",
+        )
+
+        parser.add_argument(
+            "--database",
+            type=str,
+            dest="database",
+            default=None,
+            help="Database to explain the queries on (default: the one recorded)",
+        )
+
+        parser.add_argument(
+            "--clear",
+            action="store_true",
+            dest="clear",
+            help="Clear the recorded usage after reporting it",
+        )
+
+    def explain(self, connection, sql, param_count):
+        # The values queried with aren't recorded. PostgreSQL, from 16, plans
+        # the query for any value, other databases for NULL ones.
+        prefix = connection.ops.explain_query_prefix()
+        if connection.vendor == "postgresql":
+            prefix += " (GENERIC_PLAN)"
+            values = tuple("${}".format(i) for i in range(1, param_count + 1))
+        else:
+            values = ("NULL",) * param_count
+        with connection.cursor() as cursor:
+            cursor.execute("{} {}".format(prefix, sql % values))
+            return cursor.fetchall()
+
+    def describe(self, usage):
+        filters = ", ".join(usage["filters"]) or "no filters"
+        if usage["order_by"]:
+            filters += ", ordered by {}".format(", ".join(usage["order_by"]))
+        return "{}: {} ({} calls, {:.2f} ms SQL on average, {:.2f} ms at most)".format(
+            usage["model"],
+            filters,
+            usage["count"],
+            usage["duration"] * 1000 / usage["count"],
+            usage["max_duration"] * 1000,
+        )
+
+    def handle(self, *args, **options):
+        recorder = get_instance(graphene_settings.FILTER_USAGE_RECORDER)
+        if recorder is None:
+            raise CommandError(
+                "Record filter usage with the GRAPHENE.FILTER_USAGE_RECORDER setting"
+            )
+
+        usages = recorder.get_usages()[: options.get("limit")]
+        if not usages:
+            self.stdout.write("No filter usage recorded")
+
+        for position, usage in enumerate(usages, 1):
+            self.stdout.write("{}. {}".format(position, self.describe(usage)))
+            if not usage.get("sql"):
+                continue
+
+            connection = connections[options.get("database") or usage["database"]]
+            try:
+                plan = self.explain(connection, usage["sql"], usage["param_count"])
+            except DatabaseError as e:
+                self.stdout.write("   Could not explain the query: {}".format(e))
+                continue
+
+            tables = get_sequential_scans(connection.vendor, plan)
+            for table in tables:
+                self.stdout.write("   Sequential scan on {}".format(table))
+
+            model = apps.get_model(usage["model"])
+            if model._meta.db_table not in tables:
+                continue
+            fields = suggest_index(model, usage["lookups"], usage["order_by"])
+            if fields:
+                self.stdout.write(
+                    "   Suggested index: models.Index(fields={!r})".format(fields)
+                )
+
+        if options.get("clear"):
+            recorder.clear()
@@ -0,0 +1,51 @@
+from django.core.management.base import BaseCommand, CommandError
+from django.db import DEFAULT_DB_ALIAS, OperationalError, connections
+
+from graphene_djangorestframework.filter.search import _search_indexes
+from graphene_djangorestframework.settings import graphene_settings
+
+
+class Command(BaseCommand):
+    help = (
+        "Build the SQLite full-text indexes of the search filters from the rows "
+        "of their models, replacing the existing ones"
+    )
+    can_import_settings = True
+
+    def add_arguments(self, parser):
+        parser.add_argument(
+            "--database",
+            type=str,
+            dest="database",
+            default=DEFAULT_DB_ALIAS,
+            help="Database to build the indexes on (default: default)",
+        )
+
+    def handle(self, *args, **options):
+        # Building the schema creates the filtersets of its filter fields,
+        # which register the indexes of their search filters.
+        graphene_settings.SCHEMA
+
+        connection = connections[options.get("database")]
+        if connection.vendor != "sqlite":
+            raise CommandError(
+                "Search indexes are only built on SQLite, {} searches without "
+                "them".format(connection.vendor)
+            )
+
+        indexes = sorted(_search_indexes.values(), key=lambda index: index.table)
+        if not indexes:
+            self.stdout.write("No search index to build")
+
+        for index in indexes:
+            try:
+                index.build(connection)
+            except OperationalError as e:
+                raise CommandError(
+                    "Could not build the search index {}: {}".format(index.table, e)
+                )
+            self.stdout.write(
+                "Built the search index {} of {}".format(
+                    index.table, index.model._meta.label
+                )
+            )
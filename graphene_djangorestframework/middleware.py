@@ -0,0 +1,42 @@
+import logging
+
+from django.db.models import Model
+
+
+logger = logging.getLogger(__name__)
+
+
+class DeferredFieldsMiddleware(object):
+    """
+    Logs every resolver that loads deferred model fields, which costs an
+    extra query per instance. Typically a field with a custom resolver that
+    doesn't declare the columns it needs with `only`.
+
+    GRAPHENE = {
+        "MIDDLEWARE": (
+            "graphene_djangorestframework.middleware.DeferredFieldsMiddleware",
+        )
+    }
+    """
+
+    def resolve(self, next, root, info, **args):
+        if not isinstance(root, Model):
+            return next(root, info, **args)
+
+        deferred_fields = root.get_deferred_fields()
+        if not deferred_fields:
+            return next(root, info, **args)
+
+        result = next(root, info, **args)
+
+        loaded_fields = deferred_fields - root.get_deferred_fields()
+        if loaded_fields:
+            logger.warning(
+                "Resolving %s.%s loaded the deferred fields %s of %s with extra queries.",
+                info.parent_type.name,
+                info.field_name,
+                ", ".join(sorted(loaded_fields)),
+                root._meta.label,
+            )
+
+        return result
@@ -0,0 +1,497 @@
+import copy
+
+from collections import OrderedDict
+
+from django.core.exceptions import FieldDoesNotExist
+from django.db.models import Model, Prefetch
+from django.db.models.constants import LOOKUP_SEP
+from django.db.models.query import ModelIterable, QuerySet
+
+from graphene.types import Dynamic
+from graphene.utils.str_converters import to_camel_case
+from graphql.language.ast import (
+    Field as FieldNode,
+    FragmentSpread,
+    InlineFragment,
+    Variable,
+)
+from graphql.type.definition import get_named_type
+
+from .rows import to_lean_rows
+from .settings import graphene_settings
+from .utils import get_model_fields
+
+# Marks querysets prefetched for a connection field, their rows already went
+# through the queryset of the field and can be paginated in memory.
+CONNECTION_PREFETCH_HINT = "graphene_connection_prefetch"
+
+
+def join_lookup(prefix, name):
+    return LOOKUP_SEP.join((prefix, name)) if prefix else name
+
+
+def should_include_selection(info, selection):
+    """
+    Evaluate the `@skip` and `@include` directives of a selection.
+    """
+    for directive in selection.directives or ():
+        directive_name = directive.name.value
+        if directive_name not in ("skip", "include"):
+            continue
+
+        value = None
+        for argument in directive.arguments or ():
+            if argument.name.value == "if":
+                value = argument.value
+
+        if isinstance(value, Variable):
+            value = (info.variable_values or {}).get(value.name.value)
+        else:
+            value = getattr(value, "value", None)
+
+        if directive_name == "skip" and value:
+            return False
+        if directive_name == "include" and not value:
+            return False
+
+    return True
+
+
+def collect_selections(info, field_nodes):
+    """
+    Merge the sub selections of the given field nodes, expanding fragments
+    and inline fragments, into a mapping of field name -> field nodes.
+    """
+    selections = OrderedDict()
+
+    def collect(selection_set, visited_fragments):
+        if selection_set is None:
+            return
+
+        for selection in selection_set.selections:
+            if not should_include_selection(info, selection):
+                continue
+
+            if isinstance(selection, FieldNode):
+                selections.setdefault(selection.name.value, []).append(selection)
+            elif isinstance(selection, InlineFragment):
+                collect(selection.selection_set, visited_fragments)
+            elif isinstance(selection, FragmentSpread):
+                fragment_name = selection.name.value
+                if fragment_name in visited_fragments:
+                    continue
+                visited_fragments.add(fragment_name)
+
+                fragment = (info.fragments or {}).get(fragment_name)
+                if fragment is not None:
+                    collect(fragment.selection_set, visited_fragments)
+
+    for field_node in field_nodes or ():
+        collect(field_node.selection_set, set())
+
+    return selections
+
+
+def get_node_field_nodes(info, field_nodes):
+    """
+    Return the field nodes selecting `edges { node { ... } }` on a connection.
+    """
+    edges = collect_selections(info, field_nodes).get("edges", [])
+    return collect_selections(info, edges).get("node", [])
+
+
+def get_field_names(info, object_type):
+    """
+    Map the GraphQL field names of an object type to its attribute names.
+    """
+    auto_camelcase = getattr(info.schema, "auto_camelcase", True)
+
+    field_names = {}
+    for attname, field in object_type._meta.fields.items():
+        name = getattr(field, "name", None)
+        if not name:
+            name = to_camel_case(attname) if auto_camelcase else attname
+        field_names[name] = attname
+
+    return field_names
+
+
+def is_optimizable_type(object_type):
+    return getattr(getattr(object_type, "_meta", None), "model", None) is not None
+
+
+def returns_object_type(info, object_type):
+    """
+    Check whether the field being resolved returns the given object type,
+    directly or through one of its interfaces.
+    """
+    graphene_type = getattr(get_named_type(info.return_type), "graphene_type", None)
+    if graphene_type is None:
+        return False
+
+    return graphene_type is object_type or graphene_type in getattr(
+        object_type._meta, "interfaces", ()
+    )
+
+
+def can_defer_fields(model):
+    # Models overriding __init__ commonly read field values there, which
+    # would load every deferred field with an extra query per row.
+    return model.__init__ is Model.__init__
+
+
+def can_prune_queryset(queryset):
+    # Leave querysets alone that already defer fields or don't return
+    # model instances.
+    return queryset.query.deferred_loading == (frozenset(), True) and issubclass(
+        queryset._iterable_class, ModelIterable
+    )
+
+
+def is_column(model_field):
+    return model_field.concrete and not model_field.many_to_many
+
+
+def has_custom_resolver(object_type, attname, field):
+    from .types import DjangoObjectType
+
+    if getattr(field, "resolver", None):
+        return True
+
+    resolver_name = "resolve_{}".format(attname)
+    resolver = getattr(object_type, resolver_name, None)
+    return resolver is not None and resolver is not getattr(
+        DjangoObjectType, resolver_name, None
+    )
+
+
+class QueryOptimization(object):
+    """
+    Collects the `select_related`, `prefetch_related` and `only` lookups
+    needed to resolve a selection set.
+    """
+
+    def __init__(self):
+        self.select_related = []
+        self.prefetch_related = OrderedDict()
+        # Lookup prefix -> (model, set of columns or None to load them all)
+        self.only = OrderedDict()
+        self.annotations = OrderedDict()
+        # Whether a selected field is resolved from the model instance
+        # rather than from one of its columns.
+        self.needs_instances = False
+
+    def add_select_related(self, lookup):
+        if lookup not in self.select_related:
+            self.select_related.append(lookup)
+
+    def add_prefetch_related(self, lookup, prefix=""):
+        if isinstance(lookup, Prefetch):
+            if prefix:
+                lookup = copy.copy(lookup)
+                lookup.add_prefix(prefix)
+            key = lookup.prefetch_to
+        else:
+            lookup = join_lookup(prefix, lookup)
+            key = lookup
+
+        # The first lookup for a path wins, Django refuses to prefetch the
+        # same path twice with different querysets.
+        self.prefetch_related.setdefault(key, lookup)
+
+    def add_only(self, model, prefix="", columns=None):
+        if prefix in self.only:
+            existing = self.only[prefix][1]
+            if existing is None or columns is None:
+                self.only[prefix] = (model, None)
+            else:
+                existing.update(columns)
+        else:
+            self.only[prefix] = (model, None if columns is None else set(columns))
+
+    def add_lookup_columns(self, model, lookup, prefix="", load_all=False):
+        """
+        Keep the columns a related lookup traverses, loading every column of
+        the related models when `load_all` is set.
+        """
+        for part in lookup.split(LOOKUP_SEP):
+            try:
+                model_field = model._meta.get_field(part)
+            except FieldDoesNotExist:
+                return
+
+            if is_column(model_field):
+                self.add_only(model, prefix, [model_field.name])
+            if not (model_field.many_to_one or model_field.one_to_one):
+                return
+
+            model = model_field.related_model
+            prefix = join_lookup(prefix, part)
+            self.add_only(model, prefix, None if load_all else ())
+
+    def add_hints(self, model, field, prefix=""):
+        for lookup in getattr(field, "select_related", None) or ():
+            self.add_select_related(join_lookup(prefix, lookup))
+            self.add_lookup_columns(model, lookup, prefix, load_all=True)
+
+        for lookup in getattr(field, "prefetch_related", None) or ():
+            self.add_prefetch_related(lookup, prefix)
+            self.add_lookup_columns(
+                model, getattr(lookup, "prefetch_through", lookup), prefix
+            )
+
+        # Rows joined by select_related can't be annotated, their fields
+        # fall back to resolving without the annotation.
+        if not prefix:
+            for name, expression in (getattr(field, "annotate", None) or {}).items():
+                self.annotations.setdefault(name, expression)
+
+    def get_only_fields(self):
+        # Only the base model and joined models can be restricted,
+        # everything else is loaded by separate queries.
+        for prefix, (model, columns) in self.only.items():
+            if prefix and prefix not in self.select_related:
+                continue
+
+            if columns is None or not can_defer_fields(model):
+                columns = [f.name for f in model._meta.concrete_fields]
+            else:
+                columns = [model._meta.pk.name] + sorted(columns)
+
+            for column in columns:
+                yield join_lookup(prefix, column)
+
+    def get_row_fields(self):
+        """
+        Return the columns to fetch the rows with, or None if the selected
+        fields need model instances.
+        """
+        if (
+            self.needs_instances
+            or self.select_related
+            or self.prefetch_related
+            or self.annotations
+            or self.only.get("", (None, None))[1] is None
+        ):
+            return None
+
+        model, columns = self.only[""]
+        return [model._meta.pk.name] + sorted(columns - {model._meta.pk.name})
+
+    def apply(self, queryset):
+        if self.select_related:
+            queryset = queryset.select_related(*self.select_related)
+        # Prefetches of the queryset itself take precedence.
+        existing = set(
+            getattr(lookup, "prefetch_to", lookup)
+            for lookup in queryset._prefetch_related_lookups
+        )
+        prefetch_related = [
+            lookup
+            for key, lookup in self.prefetch_related.items()
+            if key not in existing
+        ]
+        if prefetch_related:
+            queryset = queryset.prefetch_related(*prefetch_related)
+        annotations = OrderedDict(
+            (name, expression)
+            for name, expression in self.annotations.items()
+            if name not in queryset.query.annotations
+        )
+        if annotations:
+            queryset = queryset.annotate(**annotations)
+        if (
+            graphene_settings.OPTIMIZE_QUERIES_ONLY
+            and self.only
+            and can_prune_queryset(queryset)
+        ):
+            queryset = queryset.only(*OrderedDict.fromkeys(self.get_only_fields()))
+        return queryset
+
+
+class QueryOptimizer(object):
+    """
+    Walks the selection set of a field and maps the selected fields to model
+    relations through the registry of the selected DjangoObjectType.
+
+    To-one relations are joined with `select_related`, to-many relations are
+    prefetched with nested `Prefetch` querysets that are optimized in turn.
+    Connections are prefetched through their field's queryset, unless they
+    are filtered or paginated per parent.
+    Every queryset is restricted with `only` to the columns of the selected
+    fields, primary keys and the foreign keys relations need.
+
+    With `lean_rows`, rows whose selected fields are all plain columns are
+    fetched with `values_list` as LeanRow objects instead of model instances.
+
+    Fields with custom resolvers can declare `select_related`,
+    `prefetch_related`, `only` and `annotate` hints on DjangoField and
+    DjangoListField.
+    A selected field that isn't backed by a model field and declares no
+    `only` hint keeps every column of its model loaded.
+    """
+
+    optimization_class = QueryOptimization
+
+    def __init__(self, info):
+        self.info = info
+
+    def optimize(
+        self, queryset, object_type, field_nodes, columns=(), lean_rows=False
+    ):
+        optimization = self.optimization_class()
+        self.collect(optimization, object_type, field_nodes, columns=columns)
+        if lean_rows and can_prune_queryset(queryset):
+            fields = optimization.get_row_fields()
+            if fields is not None:
+                return to_lean_rows(queryset, fields)
+        return optimization.apply(queryset)
+
+    def prepare(
+        self, queryset, object_type, field_nodes, columns=(), lean_rows=False
+    ):
+        """
+        Apply what the type and the field ask for without OPTIMIZE_QUERIES:
+        fetch the rows as LeanRow objects with `lean_rows`, or annotate the
+        counts of the selected count fields.
+        """
+        if lean_rows and can_prune_queryset(queryset):
+            optimization = self.optimization_class()
+            self.collect(optimization, object_type, field_nodes, columns=columns)
+            fields = optimization.get_row_fields()
+            if fields is not None:
+                return to_lean_rows(queryset, fields)
+
+        count_fields = getattr(object_type._meta, "count_fields", ())
+        if not count_fields:
+            return queryset
+
+        field_names = get_field_names(self.info, object_type)
+        annotations = OrderedDict()
+        for name in collect_selections(self.info, field_nodes):
+            attname = field_names.get(name)
+            if attname in count_fields:
+                annotations.update(object_type._meta.fields[attname].annotate)
+        annotations = OrderedDict(
+            (name, expression)
+            for name, expression in annotations.items()
+            if name not in queryset.query.annotations
+        )
+        if annotations:
+            queryset = queryset.annotate(**annotations)
+        return queryset
+
+    def collect(self, optimization, object_type, field_nodes, prefix="", columns=()):
+        from .relay.fields import DjangoConnectionField
+
+        model = object_type._meta.model
+        model_fields = dict(get_model_fields(model))
+        field_names = get_field_names(self.info, object_type)
+        registry = object_type._meta.registry
+
+        columns = set(columns)
+        load_all = False
+
+        for name, nodes in collect_selections(self.info, field_nodes).items():
+            attname = field_names.get(name)
+            if attname is None:
+                continue
+
+            field = object_type._meta.fields[attname]
+            if isinstance(field, Dynamic):
+                field = field.get_type()
+            optimization.add_hints(model, field, prefix)
+
+            model_field = model_fields.get(attname)
+            custom_resolver = has_custom_resolver(object_type, attname, field)
+            only = getattr(field, "only", None)
+            if only is not None:
+                columns.update(only)
+            elif attname == "id" and not custom_resolver:
+                id_field = object_type._meta.id_field
+                columns.add(model._meta.pk.name if id_field == "pk" else id_field)
+            elif model_field is None or custom_resolver:
+                load_all = True
+
+            if (
+                custom_resolver
+                or only is not None
+                or (model_field is None and attname != "id")
+                or (model_field is not None and model_field.is_relation)
+            ):
+                optimization.needs_instances = True
+
+            if model_field is None:
+                continue
+
+            if is_column(model_field):
+                columns.add(model_field.name)
+
+            if not model_field.is_relation:
+                continue
+
+            related_type = registry.get_type_for_model(model_field.related_model)
+            if not is_optimizable_type(related_type):
+                continue
+
+            lookup = join_lookup(prefix, attname)
+            if model_field.many_to_one or model_field.one_to_one:
+                optimization.add_select_related(lookup)
+                self.collect(optimization, related_type, nodes, lookup)
+            else:
+                if custom_resolver:
+                    # The resolver returns its own rows, a prefetch of the
+                    # whole related set would be thrown away.
+                    continue
+                related_queryset = model_field.related_model._default_manager.all()
+                connection = isinstance(field, DjangoConnectionField)
+                if connection:
+                    # Connections resolve the prefetched rows only if they
+                    # were loaded through the queryset of the field.
+                    related_queryset = field.get_prefetch_queryset(
+                        self.info, model_field
+                    )
+                    if related_queryset is None:
+                        continue
+                    nodes = get_node_field_nodes(self.info, nodes)
+
+                related_columns = ()
+                if model_field.one_to_many:
+                    # Prefetched rows are matched to their parent by the
+                    # foreign key.
+                    related_columns = (model_field.field.name,)
+
+                queryset = self.optimize(
+                    related_queryset, related_type, nodes, related_columns
+                )
+                if connection:
+                    queryset._add_hints(**{CONNECTION_PREFETCH_HINT: True})
+                optimization.add_prefetch_related(Prefetch(lookup, queryset=queryset))
+
+        optimization.add_only(model, prefix, None if load_all else columns)
+
+
+def optimize_queryset(
+    queryset, info, object_type, field_nodes=None, columns=(), lean_rows=False
+):
+    """
+    Apply `select_related`, `prefetch_related` and `only` to an unevaluated
+    queryset based on the fields selected on `object_type`, or fetch its
+    rows as LeanRow objects with `lean_rows` when they are enough.
+
+    Without OPTIMIZE_QUERIES, lean rows and the counts of count fields are
+    still applied, they're asked for by the field and the type.
+    """
+    if not isinstance(queryset, QuerySet) or queryset._result_cache is not None:
+        return queryset
+
+    if not is_optimizable_type(object_type):
+        return queryset
+
+    if field_nodes is None:
+        field_nodes = info.field_asts
+
+    optimizer = QueryOptimizer(info)
+    if not graphene_settings.OPTIMIZE_QUERIES:
+        return optimizer.prepare(queryset, object_type, field_nodes, columns, lean_rows)
+    return optimizer.optimize(queryset, object_type, field_nodes, columns, lean_rows)
@@ -3,6 +3,8 @@ class Registry(object):
         self._registry = {}
         self._field_registry = {}
         self._serializer_registry = {}
+        self._filterset_registry = {}
+        self._filtering_args_registry = {}
 
     def register(self, cls):
         from .types import DjangoObjectType
@@ -34,6 +36,18 @@ class Registry(object):
     def get_converted_serializer(self, serializer):
         return self._serializer_registry.get(serializer)
 
+    def register_filterset_class(self, key, filterset_class):
+        self._filterset_registry[key] = filterset_class
+
+    def get_filterset_class(self, key):
+        return self._filterset_registry.get(key)
+
+    def register_filtering_args(self, key, args):
+        self._filtering_args_registry[key] = args
+
+    def get_filtering_args(self, key):
+        return self._filtering_args_registry.get(key)
+
 
 registry = None
 
@@ -0,0 +1,159 @@
+from collections import OrderedDict
+
+from django.db import models
+from django.db.models import Avg, Count, Max, Min, Sum
+from django.db.models.query import QuerySet
+
+from graphene import Field, Float, Int, NonNull, ObjectType
+from graphene.utils.str_converters import to_camel_case
+
+from ..optimizer import collect_selections
+
+AGGREGATE_FUNCTIONS = OrderedDict(
+    [("sum", Sum), ("avg", Avg), ("min", Min), ("max", Max)]
+)
+
+NUMERIC_FIELDS = (models.IntegerField, models.FloatField, models.DecimalField)
+
+_aggregate_types = {}
+
+
+class Aggregate(object):
+    """
+    An aggregate function over a model field, exposed as `<field><Function>`
+    by the aggregate type of a connection, or the row count when `field` is
+    None.
+    """
+
+    def __init__(self, field=None, function="count"):
+        self.field = field
+        self.function = function
+        if field is None:
+            self.key = "count"
+        else:
+            self.key = "{}_{}".format(field.name, function)
+        self.name = to_camel_case(self.key)
+
+    def get_expression(self):
+        if self.field is None:
+            return Count("pk")
+        return AGGREGATE_FUNCTIONS[self.function](self.field.name)
+
+    def get_graphene_type(self):
+        from ..converter import convert_django_field
+
+        if self.field is None:
+            return NonNull(Int)
+        if self.function == "avg":
+            return Float
+
+        converted = convert_django_field(self.field)
+        graphene_type = converted.get_type()
+        if isinstance(graphene_type, NonNull):
+            graphene_type = graphene_type.of_type
+        return graphene_type
+
+    def compute(self, rows):
+        """
+        Compute the aggregate over rows already loaded, like the database
+        would, ignoring null values.
+        """
+        if self.field is None:
+            return len(rows)
+
+        values = [getattr(row, self.field.attname) for row in rows]
+        values = [value for value in values if value is not None]
+        if not values:
+            return None
+        if self.function == "sum":
+            return sum(values)
+        if self.function == "avg":
+            return float(sum(values)) / len(values)
+        return min(values) if self.function == "min" else max(values)
+
+
+def get_aggregates(model, aggregate_fields):
+    """
+    Return the aggregates declared by `aggregate_fields`, either a list of
+    model field names, aggregated with every function the field supports,
+    or a mapping of field names to the functions to aggregate them with.
+    The row count always comes first.
+    """
+    if not isinstance(aggregate_fields, dict):
+        aggregate_fields = OrderedDict((name, None) for name in aggregate_fields)
+
+    aggregates = [Aggregate()]
+    for name, functions in aggregate_fields.items():
+        field = model._meta.get_field(name)
+        assert field.concrete and not field.is_relation, (
+            "Can't aggregate {}.{}, only columns holding values can be "
+            "aggregated."
+        ).format(model.__name__, name)
+
+        numeric = isinstance(field, NUMERIC_FIELDS)
+        if functions is None:
+            functions = list(AGGREGATE_FUNCTIONS) if numeric else ["min", "max"]
+        for function in functions:
+            assert function in AGGREGATE_FUNCTIONS, (
+                'Unknown aggregate "{}" for {}.{}, expected one of {}.'
+            ).format(function, model.__name__, name, ", ".join(AGGREGATE_FUNCTIONS))
+            assert numeric or function in ("min", "max"), (
+                "Can only compute the {} of numeric fields, {}.{} isn't."
+            ).format(function, model.__name__, name)
+            aggregates.append(Aggregate(field, function))
+    return aggregates
+
+
+def get_aggregate_type(connection):
+    """
+    Return the object type holding the aggregates of the connection.
+    """
+    if connection not in _aggregate_types:
+        node = connection._meta.node
+        aggregates = get_aggregates(node._meta.model, connection.aggregate_fields)
+        fields = OrderedDict(
+            (
+                aggregate.key,
+                Field(aggregate.get_graphene_type(), name=aggregate.name),
+            )
+            for aggregate in aggregates
+        )
+        aggregate_type = type(
+            str("{}Aggregate".format(node._meta.name)), (ObjectType,), fields
+        )
+        aggregate_type.aggregates = aggregates
+        _aggregate_types[connection] = aggregate_type
+    return _aggregate_types[connection]
+
+
+def is_aggregate_selected(info):
+    return "aggregate" in collect_selections(info, info.field_asts)
+
+
+def resolve_aggregates(aggregate_type, iterable, info):
+    """
+    Compute the selected aggregates of the rows of a connection, in a single
+    query when they're a queryset.
+    """
+    selected = collect_selections(info, info.field_asts)
+    aggregates = [
+        aggregate
+        for aggregate in aggregate_type.aggregates
+        if aggregate.name in selected
+    ]
+    if not aggregates:
+        return {}
+
+    if isinstance(iterable, QuerySet):
+        if iterable.query.can_filter():
+            # The ordering doesn't change the aggregates, those of a sliced
+            # queryset are computed over the rows of its ordered slice.
+            iterable = iterable.order_by()
+        return iterable.aggregate(
+            **{aggregate.key: aggregate.get_expression() for aggregate in aggregates}
+        )
+
+    assert isinstance(iterable, (list, tuple)), (
+        "Can only aggregate querysets and lists, received {}."
+    ).format(type(iterable).__name__)
+    return {aggregate.key: aggregate.compute(iterable) for aggregate in aggregates}
@@ -0,0 +1,182 @@
+import hashlib
+import uuid
+
+from django.apps import apps
+from django.core.cache import DEFAULT_CACHE_ALIAS, caches
+from django.core.exceptions import EmptyResultSet
+from django.db.models.signals import m2m_changed, post_delete, post_save
+from django.db.models.sql.datastructures import Join
+
+from .edges import LazyPageInfo, OffsetEdge
+
+# Cache aliases and key prefixes of the result caches in use, whose model
+# versions are changed when rows are saved or deleted.
+_result_cache_keys = set()
+# Concrete models whose rows invalidate the pages when saved or deleted.
+_watched_models = set()
+
+
+def get_model_label(model):
+    return model._meta.concrete_model._meta.label_lower
+
+
+def get_queryset_models(queryset):
+    """
+    Return the models of the tables the queryset selects from or joins.
+    """
+    models = [queryset.model]
+    for join in queryset.query.alias_map.values():
+        if not isinstance(join, Join):
+            continue
+        # The model of the joined table, across forward and reverse relations.
+        model = join.join_field.related_model
+        if model not in models:
+            models.append(model)
+    return models
+
+
+def watch_model(model):
+    """
+    Connect the receivers invalidating the pages selecting from the table of
+    the model, for the model and its proxies, the first time it's seen.
+    """
+    concrete_model = model._meta.concrete_model
+    if concrete_model in _watched_models:
+        return
+    _watched_models.add(concrete_model)
+    for sender in apps.get_models(include_auto_created=True):
+        if sender._meta.concrete_model is not concrete_model:
+            continue
+        post_save.connect(
+            invalidate_model_results, sender=sender, dispatch_uid="graphene_results"
+        )
+        post_delete.connect(
+            invalidate_model_results, sender=sender, dispatch_uid="graphene_results"
+        )
+        # Sent with the through model as sender.
+        m2m_changed.connect(
+            invalidate_m2m_results, sender=sender, dispatch_uid="graphene_results"
+        )
+
+
+def invalidate_model_results(sender, **kwargs):
+    label = get_model_label(sender)
+    for cache_alias, key_prefix in list(_result_cache_keys):
+        caches[cache_alias].set(
+            "{}:version:{}".format(key_prefix, label), uuid.uuid4().hex, None
+        )
+
+
+def invalidate_m2m_results(sender, instance, action, model, **kwargs):
+    if not action.startswith("post_"):
+        return
+    invalidate_model_results(sender)
+    invalidate_model_results(type(instance))
+    invalidate_model_results(model)
+
+
+class ResultCache(object):
+    """
+    Caches the primary keys of connection pages, with their page info and
+    total count, so serving a cached page fetches its rows by primary key
+    instead of filtering, ordering and counting the queryset again.
+
+    Pages are keyed by the SQL of the queryset, which normalizes the
+    filtering arguments, and its pagination arguments. Saving or deleting a
+    row of a model the queryset selects from or joins invalidates its
+    pages, other changes, like to the models of subqueries, only show once
+    the pages expire after `timeout` seconds.
+    """
+
+    def __init__(
+        self, timeout=60, cache_alias=DEFAULT_CACHE_ALIAS, key_prefix="graphene:results"
+    ):
+        self.timeout = timeout
+        self.cache_alias = cache_alias
+        self.key_prefix = key_prefix
+
+        _result_cache_keys.add((cache_alias, key_prefix))
+
+    @property
+    def cache(self):
+        return caches[self.cache_alias]
+
+    def get_versions(self, queryset):
+        models = get_queryset_models(queryset)
+        for model in models:
+            watch_model(model)
+        keys = [
+            "{}:version:{}".format(self.key_prefix, get_model_label(model))
+            for model in models
+        ]
+        versions = self.cache.get_many(keys)
+        for key in keys:
+            if key not in versions:
+                self.cache.add(key, uuid.uuid4().hex, None)
+                versions[key] = self.cache.get(key)
+        return [versions[key] for key in keys]
+
+    def get_cache_key(self, queryset, args):
+        """
+        Return the key of the page, or None if the queryset isn't worth
+        caching: it can't match any row, or it is sliced and its pages can't
+        be refetched by primary key.
+        """
+        if not queryset.query.can_filter():
+            return None
+        try:
+            sql, params = queryset.query.sql_with_params()
+        except EmptyResultSet:
+            return None
+        pagination = [args.get(name) for name in ("first", "last", "after", "before")]
+        digest = hashlib.md5(
+            "{}\n{}\n{!r}\n{!r}\n{!r}".format(
+                queryset.db, sql, params, pagination, self.get_versions(queryset)
+            ).encode("utf-8")
+        ).hexdigest()
+        return "{}:{}".format(self.key_prefix, digest)
+
+    def get_page(self, key, queryset, connection_type):
+        """
+        Return the connection of the cached page, or None if it isn't cached.
+        """
+        page = self.cache.get(key)
+        if page is None:
+            return None
+
+        pks = page["pks"]
+        rows = {row.pk: row for row in queryset.order_by().filter(pk__in=pks)}
+        edges = [
+            OffsetEdge(rows[pk], offset)
+            for offset, pk in enumerate(pks, page["start_offset"])
+            if pk in rows
+        ]
+        connection = connection_type(
+            edges=edges,
+            page_info=LazyPageInfo(
+                start_edge=edges[0] if edges else None,
+                end_edge=edges[-1] if edges else None,
+                has_previous_page=page["has_previous_page"],
+                has_next_page=page["has_next_page"],
+            ),
+        )
+        connection.total_count = page["total_count"]
+        connection.total_count_is_approximate = page["total_count_is_approximate"]
+        return connection
+
+    def set_page(self, key, connection):
+        edges = connection.edges
+        self.cache.set(
+            key,
+            {
+                "pks": [edge.node.pk for edge in edges],
+                "start_offset": edges[0].offset if edges else 0,
+                "has_previous_page": connection.page_info.has_previous_page,
+                "has_next_page": connection.page_info.has_next_page,
+                "total_count": connection.total_count,
+                "total_count_is_approximate": bool(
+                    connection.total_count_is_approximate
+                ),
+            },
+            self.timeout,
+        )
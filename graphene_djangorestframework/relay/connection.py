@@ -1,27 +1,83 @@
-from graphene import Field, Int
+from django.db.models.query import QuerySet
+
+from graphene import Boolean, Field, Int, NonNull
 from graphene.relay import Connection
 
+from .aggregates import get_aggregate_type, resolve_aggregates
+from .sequences import LazySequence
+
 
 class DjangoConnection(Connection):
     """
-    Since Django anyways always gets the total count of a queryset when
-    paginating a response, this field can be safely added to a relay
-    query response.
+    Adds the total count of the paginated queryset to a relay query
+    response. The count is computed when `totalCount` is resolved, through
+    the count strategy of the connection field, unless paginating already
+    required an exact count.
+
+    With `aggregate_fields`, the connection also has an `aggregate` field,
+    computing the count and aggregates of the declared fields over every
+    row of the connection in a single query.
     """
     class Meta:
         abstract = True
 
+    aggregate_fields = ()
+
     @classmethod
-    def __init_subclass_with_meta__(cls, node=None, name=None, **options):
+    def __init_subclass_with_meta__(
+        cls, node=None, name=None, aggregate_fields=None, **options
+    ):
         parent = super(DjangoConnection, cls).__init_subclass_with_meta__(
             node, name, **options
         )
 
+        if aggregate_fields:
+            cls.aggregate_fields = aggregate_fields
+            cls._meta.fields["aggregate"] = Field(
+                lambda: NonNull(get_aggregate_type(cls)),
+                description="Aggregates over every row of the connection",
+            )
+
         cls._meta.fields["total_count"] = Field(
             Int,
             name="totalCount",
             required=True,
             description="Total count for use in pagination",
         )
+        cls._meta.fields["total_count_is_approximate"] = Field(
+            Boolean,
+            name="totalCountIsApproximate",
+            required=True,
+            description="Whether the total count is an estimate or cached count",
+        )
 
         return parent
+
+    def get_total_count(self):
+        iterable = getattr(self, "iterable", None)
+        if self.total_count is None and iterable is not None:
+            count_strategy = getattr(self, "count_strategy", None)
+            if count_strategy is not None and isinstance(iterable, QuerySet):
+                count, approximate = count_strategy.count(iterable)
+            elif isinstance(iterable, QuerySet):
+                count, approximate = iterable.count(), False
+            elif isinstance(iterable, LazySequence):
+                count, approximate = iterable.count(), False
+            else:
+                count, approximate = len(iterable), False
+
+            self.total_count = count
+            self.total_count_is_approximate = approximate
+        return self.total_count
+
+    def resolve_total_count(self, info):
+        return self.get_total_count()
+
+    def resolve_total_count_is_approximate(self, info):
+        self.get_total_count()
+        return bool(self.total_count_is_approximate)
+
+    def resolve_aggregate(self, info):
+        return resolve_aggregates(
+            get_aggregate_type(type(self)), getattr(self, "iterable", None), info
+        )
@@ -0,0 +1,126 @@
+import hashlib
+import json
+
+from django.core.cache import DEFAULT_CACHE_ALIAS, caches
+from django.db import connections
+from django.db.models import Count, Window
+
+from ..utils import supports_window_functions
+
+WINDOW_COUNT = "_window_count"
+
+
+def get_count_sql(queryset):
+    """
+    Return the SQL and params of the queryset without its ordering and with
+    only the primary key selected, which don't change the number of rows.
+    """
+    if queryset.query.can_filter():
+        queryset = queryset.order_by()
+    return queryset.values("pk").query.sql_with_params()
+
+
+def can_count_in_window(queryset):
+    """
+    Check whether `COUNT(*) OVER ()` on the queryset counts its rows: the
+    window is computed before DISTINCT, and before the LIMIT of a sliced
+    queryset.
+    """
+    query = queryset.query
+    return (
+        not query.distinct
+        and not query.combinator
+        and query.can_filter()
+        and supports_window_functions(connections[queryset.db])
+    )
+
+
+def annotate_window_count(queryset):
+    """
+    Annotate every row with the number of rows of the queryset, so the
+    total count is fetched with the page.
+    """
+    return queryset.annotate(**{WINDOW_COUNT: Window(Count("*"))})
+
+
+class BaseCountStrategy(object):
+    """
+    Counts the rows of a connection's queryset for `totalCount`.
+
+    `count` returns a `(count, approximate)` tuple, `approximate` is exposed
+    on the connection as `totalCountIsApproximate`.
+    """
+
+    def count(self, queryset):
+        raise NotImplementedError(".count() must be implemented.")
+
+
+class ExactCount(BaseCountStrategy):
+    def count(self, queryset):
+        return queryset.count(), False
+
+
+class CachedCount(BaseCountStrategy):
+    """
+    Cache counts for `timeout` seconds, keyed by the SQL of the queryset
+    with its ordering and selected columns stripped, so querysets that only
+    differ in how they're fetched share a count. Cached counts may be stale
+    and are reported as approximate.
+    """
+
+    def __init__(
+        self, timeout=60, cache_alias=DEFAULT_CACHE_ALIAS, key_prefix="graphene:count"
+    ):
+        self.timeout = timeout
+        self.cache_alias = cache_alias
+        self.key_prefix = key_prefix
+
+    def get_cache_key(self, queryset):
+        sql, params = get_count_sql(queryset)
+        digest = hashlib.md5(
+            "{}\n{}\n{!r}".format(queryset.db, sql, params).encode("utf-8")
+        ).hexdigest()
+        return "{}:{}".format(self.key_prefix, digest)
+
+    def count(self, queryset):
+        cache = caches[self.cache_alias]
+        key = self.get_cache_key(queryset)
+
+        count = cache.get(key)
+        if count is not None:
+            return count, True
+
+        count = queryset.count()
+        cache.set(key, count, self.timeout)
+        return count, False
+
+
+class EstimatedCount(BaseCountStrategy):
+    """
+    Use the query planner's row estimate for querysets estimated to hold
+    at least `threshold` rows, counting smaller ones exactly. Backends
+    without a usable estimate always count exactly.
+    """
+
+    def __init__(self, threshold=100000):
+        self.threshold = threshold
+
+    def estimate(self, queryset):
+        connection = connections[queryset.db]
+        if connection.vendor != "postgresql":
+            return None
+
+        sql, params = get_count_sql(queryset)
+        with connection.cursor() as cursor:
+            cursor.execute("EXPLAIN (FORMAT JSON) " + sql, params)
+            plan = cursor.fetchone()[0]
+
+        if isinstance(plan, str):
+            plan = json.loads(plan)
+        return int(plan[0]["Plan"]["Plan Rows"])
+
+    def count(self, queryset):
+        estimate = self.estimate(queryset)
+        if estimate is None or estimate < self.threshold:
+            return queryset.count(), False
+        return estimate, True
@@ -0,0 +1,133 @@
+from django.db.models.query import QuerySet
+
+from graphql_relay.connection.arrayconnection import (
+    get_offset_with_default,
+    offset_to_cursor,
+)
+
+from ..utils import iterate_queryset
+
+
+class OffsetEdge(object):
+    """
+    Edge of an offset paginated connection, the cursor is only encoded when
+    it is resolved.
+    """
+
+    __slots__ = ("node", "offset")
+
+    def __init__(self, node, offset):
+        self.node = node
+        self.offset = offset
+
+    @property
+    def cursor(self):
+        return offset_to_cursor(self.offset)
+
+
+class ChunkedEdges(object):
+    """
+    Edges of a page iterated from its queryset `chunk_size` rows at a time,
+    so the nodes are released once they have been serialized. Every
+    iteration runs the query again.
+    """
+
+    __slots__ = ("queryset", "start_offset", "chunk_size")
+
+    def __init__(self, queryset, start_offset, chunk_size):
+        self.queryset = queryset
+        self.start_offset = start_offset
+        self.chunk_size = chunk_size
+
+    def __iter__(self):
+        rows = iterate_queryset(self.queryset, self.chunk_size)
+        for offset, node in enumerate(rows, self.start_offset):
+            yield OffsetEdge(node, offset)
+
+
+class LazyPageInfo(object):
+    """
+    Page info taking its cursors from the first and last edge of the page.
+    """
+
+    __slots__ = ("start_edge", "end_edge", "has_previous_page", "has_next_page")
+
+    def __init__(self, start_edge, end_edge, has_previous_page, has_next_page):
+        self.start_edge = start_edge
+        self.end_edge = end_edge
+        self.has_previous_page = has_previous_page
+        self.has_next_page = has_next_page
+
+    @property
+    def start_cursor(self):
+        return self.start_edge.cursor if self.start_edge is not None else None
+
+    @property
+    def end_cursor(self):
+        return self.end_edge.cursor if self.end_edge is not None else None
+
+
+def connection_from_slice(
+    list_slice,
+    args,
+    connection_type,
+    slice_start=0,
+    list_length=0,
+    list_slice_length=None,
+    chunk_size=None,
+):
+    """
+    Same as `connection_from_list_slice`, building `OffsetEdge` edges and a
+    `LazyPageInfo` so no cursor is encoded unless it is selected.
+
+    With a `chunk_size`, a queryset slice isn't evaluated, its edges are
+    iterated when they're resolved. `list_length` must then be exact.
+    """
+    before = args.get("before")
+    after = args.get("after")
+    first = args.get("first")
+    last = args.get("last")
+    if list_slice_length is None:
+        list_slice_length = len(list_slice)
+    slice_end = slice_start + list_slice_length
+    before_offset = get_offset_with_default(before, list_length)
+    after_offset = get_offset_with_default(after, -1)
+
+    start_offset = max(slice_start - 1, after_offset, -1) + 1
+    end_offset = min(slice_end, before_offset, list_length)
+    if isinstance(first, int):
+        end_offset = min(end_offset, start_offset + first)
+    if isinstance(last, int):
+        start_offset = max(start_offset, end_offset - last)
+
+    # If supplied slice is too large, trim it down before mapping over it.
+    _slice = list_slice[
+        max(start_offset - slice_start, 0) : list_slice_length
+        - (slice_end - end_offset)
+    ]
+    if chunk_size and isinstance(_slice, QuerySet):
+        edges = ChunkedEdges(_slice, start_offset, chunk_size)
+        # The boundary edges only provide the cursors of the page.
+        has_edges = end_offset > start_offset
+        start_edge = OffsetEdge(None, start_offset) if has_edges else None
+        end_edge = OffsetEdge(None, end_offset - 1) if has_edges else None
+    else:
+        edges = [
+            OffsetEdge(node, offset)
+            for offset, node in enumerate(_slice, start_offset)
+        ]
+        start_edge = edges[0] if edges else None
+        end_edge = edges[-1] if edges else None
+
+    lower_bound = after_offset + 1 if after else 0
+    upper_bound = before_offset if before else list_length
+
+    return connection_type(
+        edges=edges,
+        page_info=LazyPageInfo(
+            start_edge=start_edge,
+            end_edge=end_edge,
+            has_previous_page=isinstance(last, int) and start_offset > lower_bound,
+            has_next_page=isinstance(first, int) and end_offset < upper_bound,
+        ),
+    )
@@ -1,16 +1,116 @@
 from functools import partial
 from promise import Promise
 
+from django.db.models import Manager
 from django.db.models.query import QuerySet
+from django.db.models.sql.datastructures import Join
 
-from graphene.relay import ConnectionField, PageInfo, Connection
-from graphql_relay.connection.arrayconnection import connection_from_list_slice
+from graphene.relay import ConnectionField, Connection
+from graphql_relay.connection.arrayconnection import get_offset_with_default
 
-from ..utils import maybe_queryset
+from ..export import get_export_state
+from ..utils import get_instance, maybe_queryset
+from ..optimizer import (
+    CONNECTION_PREFETCH_HINT,
+    collect_selections,
+    get_node_field_nodes,
+    optimize_queryset,
+)
+from .aggregates import is_aggregate_selected
+from .counts import WINDOW_COUNT, annotate_window_count, can_count_in_window
+from .edges import connection_from_slice
+from .keyset import connection_from_keyset, get_keyset_ordering
+from .loaders import get_related_connection_loader
+from .sequences import LazySequence, is_unsized_iterable, slice_iterable
 from ..settings import graphene_settings
 from ..fields import check_permission_classes, check_throttle_classes
 
 
+def get_prefetched_queryset(iterable):
+    """
+    Return the evaluated queryset of a related manager whose rows were
+    prefetched, or of an evaluated queryset, None otherwise.
+    """
+    if isinstance(iterable, Manager):
+        iterable = iterable.get_queryset()
+    if isinstance(iterable, QuerySet) and iterable._result_cache is not None:
+        return iterable
+    return None
+
+
+def is_total_count_selected(info):
+    return "totalCount" in collect_selections(info, info.field_asts)
+
+
+def get_uncounted_bounds(args):
+    """
+    Return the offsets of the rows of a page without knowing the length of
+    the queryset, one row past `first` is included to tell whether another
+    page follows.
+    """
+    start_offset = max(get_offset_with_default(args.get("after"), -1), -1) + 1
+    end_offset = get_offset_with_default(args.get("before"), None)
+
+    first = args.get("first")
+    if isinstance(first, int):
+        limit = start_offset + first + 1
+        end_offset = limit if end_offset is None else min(end_offset, limit)
+
+    if end_offset is not None:
+        end_offset = max(end_offset, start_offset)
+
+    return start_offset, end_offset
+
+
+def get_uncounted_slice(iterable, args):
+    """
+    Fetch the rows of a page without knowing the length of the queryset,
+    lazy sequence or generator. Returns the rows and the offset of the
+    first one.
+    """
+    start_offset, end_offset = get_uncounted_bounds(args)
+    return slice_iterable(iterable, start_offset, end_offset), start_offset
+
+
+def has_joins(query):
+    return any(isinstance(join, Join) for join in query.alias_map.values())
+
+
+def has_multivalued_joins(query):
+    for join in query.alias_map.values():
+        join_field = getattr(join, "join_field", None)
+        if getattr(join_field, "one_to_many", False) or getattr(
+            join_field, "many_to_many", False
+        ):
+            return True
+    return False
+
+
+def combine_querysets(default_queryset, queryset):
+    if default_queryset.query.distinct and not queryset.query.distinct:
+        queryset = queryset.distinct()
+    elif queryset.query.distinct and not default_queryset.query.distinct:
+        default_queryset = default_queryset.distinct()
+    return queryset & default_queryset
+
+
+def copy_ordering(default_queryset, queryset):
+    """
+    Order the queryset by the ordering of the default queryset, if it has
+    one, the same way `&` does.
+    """
+    default_query = default_queryset.query
+    if not default_query.order_by and not default_query.extra_order_by:
+        return queryset
+
+    queryset = queryset.all()
+    queryset.query.order_by = default_query.order_by or queryset.query.order_by
+    queryset.query.extra_order_by = (
+        default_query.extra_order_by or queryset.query.extra_order_by
+    )
+    return queryset
+
+
 class DjangoConnectionField(ConnectionField):
     def __init__(self, *args, **kwargs):
         self.on = kwargs.pop("on", False)
@@ -21,6 +121,25 @@ class DjangoConnectionField(ConnectionField):
             "enforce_first_or_last",
             graphene_settings.RELAY_CONNECTION_ENFORCE_FIRST_OR_LAST,
         )
+        self.keyset_pagination = kwargs.pop(
+            "keyset_pagination", graphene_settings.RELAY_CONNECTION_KEYSET_PAGINATION
+        )
+        self.window_count = kwargs.pop(
+            "window_count", graphene_settings.RELAY_CONNECTION_WINDOW_COUNT
+        )
+        self.chunk_size = kwargs.pop(
+            "chunk_size", graphene_settings.QUERYSET_ITERATOR_CHUNK_SIZE
+        )
+        self.result_cache = get_instance(
+            kwargs.pop("result_cache", graphene_settings.RELAY_CONNECTION_RESULT_CACHE)
+        )
+        self.count_strategy = get_instance(
+            kwargs.pop(
+                "count_strategy", graphene_settings.RELAY_CONNECTION_COUNT_STRATEGY
+            )
+        )
+        # Defaults to the lean_rows option of the node type.
+        self.lean_rows = kwargs.pop("lean_rows", None)
         self.permission_classes = kwargs.pop("permission_classes", None)
         self.throttle_classes = kwargs.pop("throttle_classes", None)
         super(DjangoConnectionField, self).__init__(*args, **kwargs)
@@ -51,6 +170,11 @@ class DjangoConnectionField(ConnectionField):
     def model(self):
         return getattr(self.node_type._meta, 'model', None)
 
+    def get_lean_rows(self):
+        if self.lean_rows is None:
+            return getattr(self.node_type._meta, "lean_rows", False)
+        return self.lean_rows
+
     def get_manager_or_queryset(self):
         if self.model is None:
             return None
@@ -63,39 +187,234 @@ class DjangoConnectionField(ConnectionField):
         else:
             return self.model._default_manager
 
+    def get_prefetch_queryset(self, info, model_field):
+        """
+        Return the queryset to prefetch the connection of every parent with,
+        or None if the connection is resolved per parent.
+        """
+        if self.keyset_pagination:
+            return None
+        if model_field.one_to_many and graphene_settings.RELAY_CONNECTION_BATCH_RELATED:
+            # Paginated per parent by the batched related loader instead.
+            return None
+
+        queryset = maybe_queryset(self.get_manager_or_queryset(), info)
+        if not isinstance(queryset, QuerySet) or not queryset.query.can_filter():
+            return None
+        return queryset
+
+    @classmethod
+    def can_use_prefetched(cls, connection, default_manager, prefetched):
+        """
+        Prefetched rows can stand in for the connection's queryset if they
+        were prefetched through it, or if the connection doesn't restrict
+        the rows of the related manager.
+        """
+        if CONNECTION_PREFETCH_HINT in prefetched._hints:
+            return True
+        return default_manager is connection._meta.node._meta.model._default_manager
+
     @classmethod
     def merge_querysets(cls, default_queryset, queryset):
-        if default_queryset.query.distinct and not queryset.query.distinct:
+        """
+        Restrict the resolved queryset to the rows of the default queryset.
+
+        Default querysets joining other tables are applied as a
+        `pk IN (subquery)` filter: combining querysets with `&` duplicates
+        every join, and multi-valued joins would need a DISTINCT over the
+        whole result, and its count, to drop the duplicated rows.
+        """
+        default_query = default_queryset.query
+        if default_query.distinct_fields or queryset.query.distinct_fields:
+            return combine_querysets(default_queryset, queryset)
+
+        if not default_query.distinct and not has_joins(default_query):
+            if not default_query.where:
+                # Nothing to restrict, keep the resolved queryset as is.
+                return copy_ordering(default_queryset, queryset)
+            return combine_querysets(default_queryset, queryset)
+
+        if (
+            default_query.distinct
+            and not queryset.query.distinct
+            and has_multivalued_joins(queryset.query)
+        ):
+            # Combining would have made the result distinct as well.
             queryset = queryset.distinct()
-        elif queryset.query.distinct and not default_queryset.query.distinct:
-            default_queryset = default_queryset.distinct()
-        return queryset & default_queryset
+
+        subquery = default_queryset.order_by().values("pk")
+        subquery.query.distinct = False
+        subquery.query.clear_limits()
+        return copy_ordering(default_queryset, queryset.filter(pk__in=subquery))
 
     @classmethod
-    def resolve_connection(cls, connection, default_manager, args, info, iterable):
+    def resolve_connection(
+        cls,
+        connection,
+        default_manager,
+        args,
+        info,
+        iterable,
+        keyset_pagination=False,
+        count_strategy=None,
+        window_count=False,
+        chunk_size=None,
+        result_cache=None,
+        lean_rows=False,
+    ):
         if iterable is None:
             iterable = default_manager
+
+        prefetched = get_prefetched_queryset(iterable)
+        if (
+            prefetched is not None
+            and not keyset_pagination
+            and cls.can_use_prefetched(connection, default_manager, prefetched)
+        ):
+            # Paginate the prefetched rows in memory.
+            iterable = list(prefetched)
+
+        if not keyset_pagination and not is_aggregate_selected(info):
+            # Batched connections only load the rows of their pages.
+            loader = get_related_connection_loader(
+                cls, connection, default_manager, args, info, iterable
+            )
+            if loader is not None:
+                return loader.load(
+                    getattr(iterable.instance, iterable.field.target_field.attname)
+                )
+
+        ordering = None
+        cache_key = cached = None
+        _total_count = None
         iterable = maybe_queryset(iterable, info)
-        if isinstance(iterable, QuerySet):
+        if is_unsized_iterable(iterable):
+            _len = None
+            if isinstance(args.get("last"), int) or is_total_count_selected(info):
+                # Offsets counted from the end and totalCount need every row.
+                iterable = list(iterable)
+                _len = _total_count = len(iterable)
+        elif isinstance(iterable, LazySequence):
+            _len = None
+            if isinstance(args.get("last"), int):
+                _len = _total_count = iterable.count()
+        elif not isinstance(iterable, QuerySet):
+            _len = _total_count = len(iterable)
+        else:
             if iterable is not default_manager:
                 default_queryset = maybe_queryset(default_manager, info)
                 iterable = cls.merge_querysets(default_queryset, iterable)
-            _len = iterable.count()
+            iterable = optimize_queryset(
+                iterable,
+                info,
+                connection._meta.node,
+                get_node_field_nodes(info, info.field_asts),
+                lean_rows=lean_rows and not is_aggregate_selected(info),
+            )
+            if keyset_pagination:
+                ordering = get_keyset_ordering(iterable)
+
+            if result_cache is not None and ordering is None and not chunk_size:
+                cache_key = result_cache.get_cache_key(iterable, args)
+                if cache_key is not None:
+                    cached = result_cache.get_page(cache_key, iterable, connection)
+
+            _len = None
+            # Offsets counted from the end need the exact length, totalCount
+            # is otherwise counted by the count strategy when it's resolved.
+            if (
+                cached is None
+                and ordering is None
+                and isinstance(args.get("last"), int)
+            ):
+                _len = iterable.count()
+                _total_count = _len
+
+        if cached is not None:
+            connection = cached
+        elif ordering is not None:
+            connection = connection_from_keyset(
+                iterable,
+                ordering,
+                args,
+                connection_type=connection,
+            )
+        elif chunk_size and isinstance(iterable, QuerySet):
+            if _len is None:
+                # Count the rows of the page, which are then iterated in
+                # chunks when the edges are resolved.
+                slice_start, slice_end = get_uncounted_bounds(args)
+                list_slice = iterable[slice_start:slice_end]
+                list_length = slice_start + list_slice.count()
+            else:
+                list_slice, slice_start, list_length = iterable, 0, _len
+
+            connection = connection_from_slice(
+                list_slice,
+                args,
+                slice_start=slice_start,
+                list_length=list_length,
+                list_slice_length=list_length - slice_start,
+                connection_type=connection,
+                chunk_size=chunk_size,
+            )
         else:
-            _len = len(iterable)
-        connection = connection_from_list_slice(
-            iterable,
-            args,
-            slice_start=0,
-            list_length=_len,
-            list_slice_length=_len,
-            connection_type=connection,
-            edge_type=connection.Edge,
-            pageinfo_type=PageInfo,
-        )
+            if _len is None:
+                page_queryset = iterable
+                if (
+                    window_count
+                    and isinstance(iterable, QuerySet)
+                    and is_total_count_selected(info)
+                    and can_count_in_window(iterable)
+                ):
+                    page_queryset = annotate_window_count(iterable)
+                list_slice, slice_start = get_uncounted_slice(page_queryset, args)
+                list_length = slice_start + len(list_slice)
+
+                # An empty page carries no count, totalCount falls back to
+                # the count strategy.
+                if page_queryset is not iterable and list_slice:
+                    _total_count = getattr(list_slice[0], WINDOW_COUNT)
+            else:
+                list_slice, slice_start, list_length = iterable, 0, _len
+
+            connection = connection_from_slice(
+                list_slice,
+                args,
+                slice_start=slice_start,
+                list_length=list_length,
+                list_slice_length=list_length - slice_start,
+                connection_type=connection,
+            )
+
         connection.iterable = iterable
         connection.length = _len
-        connection.total_count = _len
+        connection.count_strategy = count_strategy
+        if cached is None:
+            connection.total_count = _total_count
+            connection.total_count_is_approximate = False
+
+        if cache_key is not None and cached is None:
+            if is_total_count_selected(info):
+                # Cached with the page so hits don't count the rows.
+                connection.get_total_count()
+            result_cache.set_page(cache_key, connection)
+        return connection
+
+    @classmethod
+    def check_permissions(cls, info, permission_classes, throttle_classes):
+        export = get_export_state(info)
+        if export is not None and export.page:
+            # Checked once for the whole export.
+            return
+
+        check_permission_classes(info, cls, permission_classes)
+        check_throttle_classes(info, cls, throttle_classes)
+
+    @classmethod
+    def resolve_export_page(cls, export, resolve, iterable):
+        connection = resolve(iterable)
+        export.page_info = connection.page_info
         return connection
 
     @classmethod
@@ -108,12 +427,31 @@ class DjangoConnectionField(ConnectionField):
         enforce_first_or_last,
         permission_classes,
         throttle_classes,
+        keyset_pagination,
+        count_strategy,
+        window_count,
+        chunk_size,
+        result_cache,
+        lean_rows,
         root,
         info,
         **args
     ):
-        check_permission_classes(info, cls, permission_classes)
-        check_throttle_classes(info, cls, throttle_classes)
+        cls.check_permissions(info, permission_classes, throttle_classes)
+
+        export = get_export_state(info)
+        if export is not None:
+            # Exported connections are read page by page, with keyset
+            # cursors where the ordering of the queryset allows it.
+            args.pop("last", None)
+            args.pop("before", None)
+            args.pop("after", None)
+            args["first"] = export.first
+            if export.after is not None:
+                args["after"] = export.after
+            max_limit = None
+            enforce_first_or_last = False
+            keyset_pagination = True
 
         first = args.get("first")
         last = args.get("last")
@@ -138,8 +476,20 @@ class DjangoConnectionField(ConnectionField):
 
         iterable = resolver(root, info, **args)
         on_resolve = partial(
-            cls.resolve_connection, connection, default_manager, args, info
+            cls.resolve_connection,
+            connection,
+            default_manager,
+            args,
+            info,
+            keyset_pagination=keyset_pagination,
+            count_strategy=count_strategy,
+            window_count=window_count,
+            chunk_size=chunk_size,
+            result_cache=result_cache,
+            lean_rows=lean_rows,
         )
+        if export is not None:
+            on_resolve = partial(cls.resolve_export_page, export, on_resolve)
 
         if Promise.is_thenable(iterable):
             return Promise.resolve(iterable).then(on_resolve)
@@ -156,4 +506,10 @@ class DjangoConnectionField(ConnectionField):
             self.enforce_first_or_last,
             self.permission_classes,
             self.throttle_classes,
+            self.keyset_pagination,
+            self.count_strategy,
+            self.window_count,
+            self.chunk_size,
+            self.result_cache,
+            self.get_lean_rows(),
         )
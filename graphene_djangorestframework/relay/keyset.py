@@ -0,0 +1,221 @@
+import datetime
+import decimal
+import json
+import uuid
+
+from django.core.exceptions import FieldDoesNotExist
+from django.db.models import F, Q
+from django.db.models.constants import LOOKUP_SEP
+
+from graphql_relay.utils import base64, unbase64, is_str
+
+from .edges import LazyPageInfo
+
+PREFIX = "keyset:"
+
+
+def get_ordering_field(model, lookup):
+    """
+    Resolve an ordering lookup to the model field it orders by, or None if
+    the lookup can't be used as a keyset column: it spans a to-many
+    relation, ends on a relation, or may be NULL.
+    """
+    parts = lookup.split(LOOKUP_SEP)
+    for i, part in enumerate(parts):
+        try:
+            field = model._meta.get_field(part)
+        except FieldDoesNotExist:
+            return None
+
+        if field.null or field.many_to_many or field.one_to_many:
+            return None
+
+        if field.is_relation:
+            if i == len(parts) - 1:
+                # Ordering by a relation orders by the related model's
+                # ordering, only the foreign key column can be compared.
+                return field if part == field.attname else None
+            model = field.related_model
+        elif i != len(parts) - 1:
+            return None
+
+    return field
+
+
+def get_keyset_ordering(queryset):
+    """
+    Return the ordering of the queryset as `(lookup, descending)` pairs
+    ending with the primary key as a unique tiebreaker, or None if the
+    queryset can't be paginated with a keyset.
+    """
+    query = queryset.query
+    if query.extra_order_by or query.distinct_fields:
+        return None
+
+    ordering = list(query.order_by)
+    if not ordering and query.default_ordering:
+        ordering = list(query.get_meta().ordering)
+
+    model = queryset.model
+    keyset = []
+    for field in ordering:
+        if not isinstance(field, str) or field == "?" or "." in field:
+            return None
+
+        descending = field.startswith("-")
+        lookup = field.lstrip("-")
+        if lookup == "pk":
+            lookup = model._meta.pk.name
+        if lookup != model._meta.pk.name and get_ordering_field(model, lookup) is None:
+            return None
+
+        if lookup not in [name for name, _ in keyset]:
+            keyset.append((lookup, descending))
+
+    pk_name = model._meta.pk.name
+    if pk_name not in [name for name, _ in keyset]:
+        keyset.append((pk_name, False))
+
+    return keyset
+
+
+def encode_keyset_value(value):
+    if isinstance(value, (datetime.date, datetime.time)):
+        return value.isoformat()
+    if isinstance(value, (decimal.Decimal, uuid.UUID)):
+        return str(value)
+    return value
+
+
+def keyset_to_cursor(values):
+    """
+    Creates the cursor string from the ordering values of a row.
+    """
+    return base64(PREFIX + json.dumps([encode_keyset_value(v) for v in values]))
+
+
+def cursor_to_keyset(cursor, length):
+    """
+    Rederives the ordering values from the cursor string, or None if the
+    cursor isn't a keyset cursor of the given length.
+    """
+    if not is_str(cursor):
+        return None
+
+    try:
+        cursor = unbase64(cursor)
+        if not cursor.startswith(PREFIX):
+            return None
+        values = json.loads(cursor[len(PREFIX) :])
+    except Exception:
+        return None
+
+    if not isinstance(values, list) or len(values) != length:
+        return None
+    return values
+
+
+def get_keyset_filter(ordering, values, after=True):
+    """
+    Build the condition selecting the rows after (or before) the row with
+    the given ordering values:
+
+        a > x OR (a = x AND b > y) OR (a = x AND b = y AND c > z)
+
+    The leading `a >= x` is implied but spelled out, so the database can
+    use it as the bound of an index range scan.
+    """
+    condition = Q()
+    equal = Q()
+    for (lookup, descending), value in zip(ordering, values):
+        operator = "gt" if after != descending else "lt"
+        condition |= equal & Q(**{"{}__{}".format(lookup, operator): value})
+        equal &= Q(**{lookup: value})
+
+    lookup, descending = ordering[0]
+    operator = "gte" if after != descending else "lte"
+    return Q(**{"{}__{}".format(lookup, operator): values[0]}) & condition
+
+
+class KeysetEdge(object):
+    """
+    Edge of a keyset paginated connection, the cursor is encoded from the
+    ordering values annotated on the node when it is resolved.
+    """
+
+    __slots__ = ("node", "annotations")
+
+    def __init__(self, node, annotations):
+        self.node = node
+        self.annotations = annotations
+
+    @property
+    def cursor(self):
+        return keyset_to_cursor(
+            [getattr(self.node, name) for name in self.annotations]
+        )
+
+
+def connection_from_keyset(
+    queryset,
+    ordering,
+    args,
+    connection_type,
+):
+    """
+    Build a connection selecting the page with `WHERE` conditions on the
+    ordering columns instead of an `OFFSET`. Cursors encode the ordering
+    values of their row, `first`/`last` fetch one extra row to tell whether
+    another page follows.
+    """
+    annotations = ["_keyset_{}".format(i) for i in range(len(ordering))]
+    page_queryset = queryset.annotate(
+        **{name: F(lookup) for name, (lookup, _) in zip(annotations, ordering)}
+    ).order_by(
+        *[
+            "-" + lookup if descending else lookup
+            for lookup, descending in ordering
+        ]
+    )
+
+    after = cursor_to_keyset(args.get("after"), len(ordering))
+    before = cursor_to_keyset(args.get("before"), len(ordering))
+    if after is not None:
+        page_queryset = page_queryset.filter(get_keyset_filter(ordering, after))
+    if before is not None:
+        page_queryset = page_queryset.filter(
+            get_keyset_filter(ordering, before, after=False)
+        )
+
+    first = args.get("first")
+    last = args.get("last")
+    has_previous_page = has_next_page = False
+
+    if isinstance(last, int) and not isinstance(first, int):
+        # Read the rows backwards from `before` (or the end).
+        rows = list(page_queryset.reverse()[: last + 1])
+        has_previous_page = len(rows) > last
+        rows = rows[:last][::-1]
+    else:
+        if isinstance(first, int):
+            rows = list(page_queryset[: first + 1])
+            has_next_page = len(rows) > first
+            rows = rows[:first]
+        else:
+            rows = list(page_queryset)
+
+        if isinstance(last, int):
+            has_previous_page = len(rows) > last
+            rows = rows[max(len(rows) - last, 0) :] if last else []
+
+    edges = [KeysetEdge(row, annotations) for row in rows]
+
+    return connection_type(
+        edges=edges,
+        page_info=LazyPageInfo(
+            start_edge=edges[0] if edges else None,
+            end_edge=edges[-1] if edges else None,
+            has_previous_page=has_previous_page,
+            has_next_page=has_next_page,
+        ),
+    )
@@ -0,0 +1,269 @@
+from collections import OrderedDict
+from contextlib import ExitStack
+
+from django.db import connections
+from django.db.models import Count, F, ForeignKey, Manager, Window
+from django.db.models.expressions import OrderBy
+from django.db.models.functions import RowNumber
+from django.db.models.query import QuerySet
+
+from promise import Promise
+from promise.dataloader import DataLoader
+
+from graphql_relay.connection.arrayconnection import get_offset_with_default
+
+from .edges import connection_from_slice
+from ..optimizer import get_node_field_nodes, optimize_queryset
+from ..settings import graphene_settings
+from ..utils import maybe_queryset, supports_window_functions
+
+
+def get_slice_offsets(args, list_length):
+    """
+    Compute the `[start, end)` offsets `connection_from_slice` selects
+    for the given pagination arguments.
+    """
+    before_offset = get_offset_with_default(args.get("before"), list_length)
+    after_offset = get_offset_with_default(args.get("after"), -1)
+
+    start_offset = max(after_offset, -1) + 1
+    end_offset = min(before_offset, list_length)
+
+    first = args.get("first")
+    last = args.get("last")
+    if isinstance(first, int):
+        end_offset = min(end_offset, start_offset + first)
+    if isinstance(last, int):
+        start_offset = max(start_offset, end_offset - last)
+
+    return start_offset, end_offset
+
+
+def get_window_ordering(queryset):
+    """
+    Return the ordering of the queryset as expressions, ending with the
+    primary key so rows are numbered deterministically. Returns None if the
+    ordering can't be expressed in a window.
+    """
+    query = queryset.query
+    if query.extra_order_by:
+        return None
+
+    ordering = list(query.order_by)
+    if not ordering and query.default_ordering:
+        ordering = list(query.get_meta().ordering)
+
+    expressions = []
+    for field in ordering:
+        if isinstance(field, str):
+            if field == "?" or "." in field:
+                return None
+            if field.startswith("-"):
+                expressions.append(OrderBy(F(field[1:]), descending=True))
+            else:
+                expressions.append(OrderBy(F(field)))
+        elif isinstance(field, OrderBy):
+            expressions.append(field)
+        elif hasattr(field, "resolve_expression"):
+            expressions.append(OrderBy(field))
+        else:
+            return None
+
+    pk_name = query.get_meta().pk.name
+    if not any(field in ("pk", "-pk", pk_name, "-" + pk_name) for field in ordering):
+        expressions.append(OrderBy(F("pk")))
+
+    return expressions
+
+
+class RelatedConnectionLoader(DataLoader):
+    """
+    Resolves a connection over a reverse foreign key for many parents at once:
+    one grouped COUNT for the totals and one query selecting each parent's
+    page with `ROW_NUMBER() OVER (PARTITION BY <foreign key>)`.
+
+    The queries of a batch run under the database execute wrappers active
+    when its first connection was loaded, such as the query timer of a
+    recorded filter connection, which would otherwise have exited.
+    """
+
+    def __init__(self, field_class, connection, queryset, field, args, info, **kwargs):
+        super(RelatedConnectionLoader, self).__init__(**kwargs)
+        self.field_class = field_class
+        self.connection = connection
+        self.queryset = queryset
+        self.field = field
+        self.args = args
+        self.info = info
+        self.ordering = get_window_ordering(queryset)
+        self.execute_wrappers = []
+
+    def get_counts(self, keys):
+        queryset = self.queryset.filter(**{"{}__in".format(self.field.name): keys})
+        return dict(
+            queryset.order_by()
+            .values_list(self.field.name)
+            .annotate(count=Count("pk"))
+            .values_list(self.field.name, "count")
+        )
+
+    def get_rows(self, offsets):
+        """
+        Fetch the rows in the `(start, end]` row number range of each parent,
+        `offsets` maps `(start, end)` to the keys of the parents.
+        """
+        field = self.field
+        queryset = self.queryset
+        connection = connections[queryset.db]
+        quote_name = connection.ops.quote_name
+
+        keys = [key for parent_keys in offsets.values() for key in parent_keys]
+        windowed = (
+            queryset.filter(**{"{}__in".format(field.name): keys})
+            .annotate(
+                _connection_parent=F(field.name),
+                _connection_row=Window(
+                    RowNumber(), partition_by=[F(field.name)], order_by=self.ordering
+                ),
+            )
+            .order_by()
+            .values_list("pk", "_connection_parent", "_connection_row")
+        )
+        windowed_sql, params = windowed.query.sql_with_params()
+        params = list(params)
+
+        conditions = []
+        for (start, end), parent_keys in offsets.items():
+            conditions.append(
+                "(w.{parent} IN ({keys}) AND w.{row} > %s AND w.{row} <= %s)".format(
+                    parent=quote_name("_connection_parent"),
+                    row=quote_name("_connection_row"),
+                    keys=", ".join(["%s"] * len(parent_keys)),
+                )
+            )
+            params.extend(parent_keys)
+            params.extend((start, end))
+
+        pk_column = quote_name(queryset.model._meta.pk.column)
+        where = "{table}.{pk} IN (SELECT w.{pk} FROM ({windowed}) w WHERE {conditions})".format(
+            table=quote_name(queryset.model._meta.db_table),
+            pk=pk_column,
+            windowed=windowed_sql,
+            conditions=" OR ".join(conditions),
+        )
+
+        rows = queryset.extra(where=[where], params=params).order_by(
+            field.attname, *self.ordering
+        )
+        rows = optimize_queryset(
+            rows,
+            self.info,
+            self.connection._meta.node,
+            get_node_field_nodes(self.info, self.info.field_asts),
+            columns=(field.name,),
+        )
+
+        grouped = {}
+        for row in rows:
+            grouped.setdefault(getattr(row, field.attname), []).append(row)
+        return grouped
+
+    def build_connection(self, rows, start_offset, list_length):
+        connection = connection_from_slice(
+            rows,
+            self.args,
+            connection_type=self.connection,
+            slice_start=start_offset,
+            list_length=list_length,
+            list_slice_length=len(rows),
+        )
+        connection.iterable = rows
+        connection.length = list_length
+        connection.total_count = list_length
+        return connection
+
+    def do_resolve_reject(self, key, resolve, reject):
+        if not self._queue:
+            self.execute_wrappers = list(connections[self.queryset.db].execute_wrappers)
+        super(RelatedConnectionLoader, self).do_resolve_reject(key, resolve, reject)
+
+    def batch_load_fn(self, keys):
+        connection = connections[self.queryset.db]
+        with ExitStack() as stack:
+            for wrapper in self.execute_wrappers:
+                if wrapper not in connection.execute_wrappers:
+                    stack.enter_context(connection.execute_wrapper(wrapper))
+            return self.load_batch(keys)
+
+    def load_batch(self, keys):
+        counts = self.get_counts(keys)
+
+        slices = {}
+        offsets = OrderedDict()
+        for key in keys:
+            start_offset, end_offset = get_slice_offsets(self.args, counts.get(key, 0))
+            slices[key] = (start_offset, end_offset)
+            if end_offset > start_offset:
+                offsets.setdefault((start_offset, end_offset), []).append(key)
+
+        grouped = self.get_rows(offsets) if offsets else {}
+
+        return Promise.resolve(
+            [
+                self.build_connection(
+                    grouped.get(key, []), slices[key][0], counts.get(key, 0)
+                )
+                for key in keys
+            ]
+        )
+
+
+def get_related_connection_loader(field_class, connection, default_manager, args, info, manager):
+    """
+    Return the request scoped RelatedConnectionLoader resolving `manager`,
+    the reverse foreign key manager of a parent, or None if the connection
+    has to be resolved on its own.
+    """
+    if not graphene_settings.RELAY_CONNECTION_BATCH_RELATED:
+        return None
+
+    context = getattr(info, "context", None)
+    if not isinstance(context, dict):
+        return None
+
+    field = getattr(manager, "field", None)
+    instance = getattr(manager, "instance", None)
+    if not isinstance(manager, Manager) or not isinstance(field, ForeignKey):
+        return None
+    if instance is None or getattr(instance, field.target_field.attname) is None:
+        return None
+
+    loaders = context.setdefault("related_connection_loaders", {})
+    key = (
+        tuple(id(field_ast) for field_ast in info.field_asts),
+        repr(sorted(args.items())),
+    )
+    if key in loaders:
+        return loaders[key]
+
+    queryset = field.model._default_manager.get_queryset()
+    default_queryset = maybe_queryset(default_manager, info)
+    if isinstance(default_queryset, QuerySet):
+        queryset = field_class.merge_querysets(default_queryset, queryset)
+
+    query = queryset.query
+    loader = None
+    if (
+        not query.distinct
+        and not query.combinator
+        and query.low_mark == 0
+        and query.high_mark is None
+        and supports_window_functions(connections[queryset.db])
+        and get_window_ordering(queryset) is not None
+    ):
+        loader = RelatedConnectionLoader(
+            field_class, connection, queryset, field, args, info
+        )
+
+    loaders[key] = loader
+    return loader
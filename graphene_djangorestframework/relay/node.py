@@ -1,5 +1,7 @@
+from collections import OrderedDict
 from functools import partial
 
+from graphene import Field, ID, List, NonNull
 from graphene.types.utils import get_type
 from graphene.relay import node as graphene_node
 
@@ -22,11 +24,40 @@ class DjangoNodeField(graphene_node.NodeField):
         )
 
 
+class DjangoNodesField(Field):
+    def __init__(self, node, type=False, **kwargs):
+        assert issubclass(
+            node, DjangoNode
+        ), "DjangoNodesField can only operate in DjangoNodes"
+        self.node_type = node
+        self.field_type = type
+        self.permission_classes = kwargs.pop("permission_classes", None)
+        self.throttle_classes = kwargs.pop("throttle_classes", None)
+
+        super(DjangoNodesField, self).__init__(
+            NonNull(List(type or node)),
+            ids=List(NonNull(ID), required=True, description="The IDs of the objects."),
+            **kwargs
+        )
+
+    def get_resolver(self, parent_resolver):
+        return partial(
+            self.node_type.nodes_resolver,
+            get_type(self.field_type),
+            self.permission_classes,
+            self.throttle_classes,
+        )
+
+
 class DjangoNode(graphene_node.Node):
     @classmethod
     def Field(cls, *args, **kwargs):  # noqa: N802
         return DjangoNodeField(cls, *args, **kwargs)
 
+    @classmethod
+    def NodesField(cls, *args, **kwargs):  # noqa: N802
+        return DjangoNodesField(cls, *args, **kwargs)
+
     @classmethod
     def node_resolver(
         cls, only_type, permission_classes, throttle_classes, root, info, id
@@ -35,3 +66,47 @@ class DjangoNode(graphene_node.Node):
         check_throttle_classes(info, cls, throttle_classes)
 
         return super(DjangoNode, cls).node_resolver(only_type, root, info, id)
+
+    @classmethod
+    def nodes_resolver(
+        cls, only_type, permission_classes, throttle_classes, root, info, ids
+    ):
+        check_permission_classes(info, cls, permission_classes)
+        check_throttle_classes(info, cls, throttle_classes)
+
+        # Group the ids by type, keeping their position in the input.
+        groups = OrderedDict()
+        for index, global_id in enumerate(ids):
+            try:
+                _type, _id = cls.from_global_id(global_id)
+                graphene_type = info.schema.get_type(_type).graphene_type
+            except Exception:
+                continue
+
+            if only_type:
+                assert graphene_type == only_type, ("Must receive a {} id.").format(
+                    only_type._meta.name
+                )
+
+            # We make sure the ObjectType implements the "Node" interface
+            if cls not in graphene_type._meta.interfaces:
+                continue
+
+            groups.setdefault(graphene_type, []).append((index, _id))
+
+        results = [None] * len(ids)
+        for graphene_type, positions in groups.items():
+            type_ids = [_id for index, _id in positions]
+            get_nodes = getattr(graphene_type, "get_nodes", None)
+            if get_nodes:
+                nodes = get_nodes(info, type_ids)
+            else:
+                get_node = getattr(graphene_type, "get_node", None)
+                nodes = [
+                    get_node(info, _id) if get_node else None for _id in type_ids
+                ]
+
+            for (index, _id), node in zip(positions, nodes):
+                results[index] = node
+
+        return results
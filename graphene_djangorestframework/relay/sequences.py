@@ -0,0 +1,43 @@
+from itertools import islice
+
+
+class LazySequence(object):
+    """
+    Base class for result sources connections paginate without loading
+    every result, like the hits of a search engine.
+
+    `slice(start, stop)` returns the results from `start` up to `stop`, or
+    to the end when `stop` is None, and is only called for the rows of the
+    requested page. `count()` returns the number of results, it is needed
+    for `totalCount` and pages selected with `last`, and by default counts
+    the results of the whole sequence.
+    """
+
+    def slice(self, start, stop):
+        raise NotImplementedError(".slice() must be implemented.")
+
+    def count(self):
+        return len(list(self.slice(0, None)))
+
+    def __getitem__(self, key):
+        if not isinstance(key, slice) or key.step is not None:
+            raise TypeError("LazySequence only supports slices without a step.")
+        return list(self.slice(key.start or 0, key.stop))
+
+
+def is_unsized_iterable(iterable):
+    """
+    Check whether the iterable, like a generator, can only be iterated
+    once and has no length.
+    """
+    return not hasattr(iterable, "__len__") and not isinstance(iterable, LazySequence)
+
+
+def slice_iterable(iterable, start, stop):
+    """
+    Return the rows of the iterable from `start` up to `stop`, skipping the
+    rows before `start` of iterables that can't be sliced.
+    """
+    if is_unsized_iterable(iterable):
+        return list(islice(iterable, start, stop))
+    return list(iterable[start:stop])
@@ -0,0 +1,73 @@
+from operator import itemgetter
+
+from django.db.models.query import ValuesListIterable
+
+_row_classes = {}
+
+
+class LeanRow(tuple):
+    """
+    Read-only row of a model fetched with `values_list()`, exposing its
+    columns, and annotations, as attributes without instantiating the model.
+    """
+
+    __slots__ = ()
+
+    _meta = None
+    _fields = ()
+
+    def __repr__(self):
+        return "<{} row: {}>".format(
+            self._meta.object_name,
+            ", ".join(
+                "{}={!r}".format(name, value) for name, value in zip(self._fields, self)
+            ),
+        )
+
+
+def get_row_class(model, fields):
+    """
+    Return the row class of the model holding the given columns, in order.
+    """
+    key = (model, fields)
+    if key not in _row_classes:
+        attrs = {"__slots__": (), "_meta": model._meta, "_fields": fields}
+        for index, name in enumerate(fields):
+            attrs[name] = property(itemgetter(index))
+        pk_name = model._meta.pk.name
+        if "pk" not in fields and pk_name in fields:
+            attrs["pk"] = attrs[pk_name]
+        _row_classes[key] = type(
+            str("{}Row".format(model.__name__)), (LeanRow,), attrs
+        )
+    return _row_classes[key]
+
+
+class LeanRowIterable(ValuesListIterable):
+    """
+    Iterable returning a LeanRow for each row of a `values_list()` queryset.
+    Annotations added after the columns were selected, like keyset cursors
+    or window counts, are exposed by the rows as well.
+    """
+
+    def __iter__(self):
+        queryset = self.queryset
+        annotation_names = [
+            name
+            for name in queryset.query.annotation_select
+            if name not in queryset._fields
+        ]
+        row_class = get_row_class(
+            queryset.model, tuple(queryset._fields) + tuple(annotation_names)
+        )
+        for row in super(LeanRowIterable, self).__iter__():
+            yield row_class(row)
+
+
+def to_lean_rows(queryset, fields):
+    """
+    Fetch the given columns of the rows of the queryset as LeanRow objects.
+    """
+    queryset = queryset.values_list(*fields)
+    queryset._iterable_class = LeanRowIterable
+    return queryset
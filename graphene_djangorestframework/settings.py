@@ -35,10 +35,65 @@ DEFAULTS = {
     "RELAY_CONNECTION_ENFORCE_FIRST_OR_LAST": False,
     # Max items returned in ConnectionFields / FilterConnectionFields
     "RELAY_CONNECTION_MAX_LIMIT": 100,
+    # Set to True to paginate connections with keyset cursors, comparing
+    # the ordering columns of the boundary row instead of using OFFSET
+    "RELAY_CONNECTION_KEYSET_PAGINATION": False,
+    # Strategy counting the rows of a connection for totalCount, either
+    # ExactCount, CachedCount or EstimatedCount from
+    # graphene_djangorestframework.relay.counts, or a subclass
+    "RELAY_CONNECTION_COUNT_STRATEGY": "graphene_djangorestframework.relay.counts.ExactCount",
+    # Cache of the primary keys of connection pages, an instance or class
+    # like graphene_djangorestframework.relay.cache.ResultCache, None to
+    # query every page
+    "RELAY_CONNECTION_RESULT_CACHE": None,
+    # Set to True to fetch totalCount with the page using COUNT(*) OVER ()
+    # instead of a separate count query
+    "RELAY_CONNECTION_WINDOW_COUNT": False,
+    # Number of rows fetched at a time by DjangoListField and connection
+    # fields iterating their querysets with a server-side cursor instead of
+    # loading every row at once, None to load every row at once
+    "QUERYSET_ITERATOR_CHUNK_SIZE": None,
+    # Set to False to filter filter connections through a FilterSet and its
+    # form on every request, even when their filters can be applied directly
+    "COMPILE_FILTERSETS": True,
+    # Set to True to warn, when filter connection fields are built, about
+    # orderings of their orderBy argument no index of the model can serve
+    "CHECK_ORDERING_INDEXES": False,
+    # Recorder of the filtering arguments filter connections are queried
+    # with and the time their queries take, an instance or class like
+    # graphene_djangorestframework.filter.usage.FilterUsageRecorder, reported
+    # on by the graphql_filter_usage command
+    "FILTER_USAGE_RECORDER": None,
+    # Number of distinct global IDs a filter accepts, None for no limit.
+    # SQLite before 3.32 allows 999 parameters per query, set it below that
+    # to reject longer lists there instead of failing to run the query
+    "FILTER_MAX_GLOBAL_IDS": None,
+    # Rows read per query by GraphQLExportView, and the number of rows an
+    # export stops at, None for no limit
+    "EXPORT_CHUNK_SIZE": 500,
+    "EXPORT_MAX_ROWS": 100000,
+    # Set to False to resolve connections over reverse foreign keys one
+    # parent at a time instead of batching them with a window function
+    "RELAY_CONNECTION_BATCH_RELATED": True,
+    # Set to True to derive select_related / prefetch_related from the
+    # selection set of connection, list and node fields
+    "OPTIMIZE_QUERIES": False,
+    # Set to False to load every column instead of restricting querysets
+    # with only() to the columns of the selected fields
+    "OPTIMIZE_QUERIES_ONLY": True,
+    # Set to False to stop sharing model instances looked up by node and
+    # foreign key fields for the duration of a request
+    "REQUEST_IDENTITY_MAP": True,
 }
 
 # List of settings that may be in string import notation.
-IMPORT_STRINGS = ("MIDDLEWARE", "SCHEMA")
+IMPORT_STRINGS = (
+    "MIDDLEWARE",
+    "SCHEMA",
+    "RELAY_CONNECTION_COUNT_STRATEGY",
+    "RELAY_CONNECTION_RESULT_CACHE",
+    "FILTER_USAGE_RECORDER",
+)
 
 
 def perform_import(val, setting_name):
@@ -0,0 +1,26 @@
+from contextlib import contextmanager
+
+from django.db import DEFAULT_DB_ALIAS, connections
+from django.test.utils import CaptureQueriesContext
+
+
+@contextmanager
+def assert_num_queries(num, using=DEFAULT_DB_ALIAS):
+    """
+    Assert that exactly `num` queries are executed on the `using` database
+    inside the block.
+
+        with assert_num_queries(2):
+            schema.execute(query, context=context)
+    """
+    with CaptureQueriesContext(connections[using]) as context:
+        yield context
+
+    executed = len(context)
+    captured = "\n".join(
+        "{}. {}".format(i, query["sql"])
+        for i, query in enumerate(context.captured_queries, start=1)
+    )
+    assert executed == num, "{} queries executed, {} expected.\n{}".format(
+        executed, num, captured
+    )
@@ -1,6 +1,7 @@
 from textwrap import dedent
 from collections import OrderedDict
 
+from django.core.exceptions import ValidationError
 from django.utils.functional import SimpleLazyObject
 
 import graphene
@@ -15,9 +16,15 @@ from graphene.types.unmountedtype import UnmountedType
 from .relay.connection import DjangoConnection
 from .converter import convert_django_field_with_choices
 from .registry import Registry, get_global_registry
+from .optimizer import optimize_queryset, returns_object_type
+from .identity_map import get_identity_map, get_loaded_fields
+from .rows import LeanRow
+from .fields import DjangoField
 from .utils import (
     DJANGO_FILTER_INSTALLED,
     get_model_fields,
+    get_relation_count,
+    is_to_many_field,
     is_valid_django_model,
     maybe_queryset,
 )
@@ -44,6 +51,48 @@ def construct_fields(model, registry, only_fields, exclude_fields):
     return fields
 
 
+def get_relation_count_resolver(attname, name):
+    def resolve_relation_count(root, info, **args):
+        if attname in root.__dict__:
+            return root.__dict__[attname]
+        # Not annotated, like rows joined by select_related.
+        return getattr(root, name).count()
+
+    return resolve_relation_count
+
+
+def construct_count_fields(model, count_fields):
+    """
+    Create a `<relation>_count` field for to-many relations of the model,
+    every one of them if `count_fields` is True. The counts of the selected
+    fields are annotated onto the queryset of the type, with or without
+    OPTIMIZE_QUERIES.
+    """
+    relations = OrderedDict(
+        (name, field)
+        for name, field in get_model_fields(model)
+        if is_to_many_field(field) and not str(name).endswith("+")
+    )
+    if count_fields is not True:
+        for name in count_fields:
+            assert name in relations, (
+                '{} has no to-many relation "{}" to count.'
+            ).format(model.__name__, name)
+        relations = OrderedDict((name, relations[name]) for name in count_fields)
+
+    fields = OrderedDict()
+    for name, model_field in relations.items():
+        attname = "{}_count".format(name)
+        fields[attname] = DjangoField(
+            graphene.NonNull(graphene.Int),
+            description="Number of {}".format(name.replace("_", " ")),
+            resolver=get_relation_count_resolver(attname, name),
+            annotate={attname: get_relation_count(model_field)},
+            only=(),
+        )
+    return fields
+
+
 class DjangoObjectTypeOptions(ObjectTypeOptions):
     model = None
     id_field = None
@@ -51,6 +100,10 @@ class DjangoObjectTypeOptions(ObjectTypeOptions):
     connection = None
 
     filter_fields = ()
+    order_by_fields = ()
+    aggregate_fields = ()
+    count_fields = ()
+    lean_rows = False
 
 
 class DjangoObjectType(ObjectType):
@@ -64,6 +117,10 @@ class DjangoObjectType(ObjectType):
         only_fields=(),
         exclude_fields=(),
         filter_fields=None,
+        order_by_fields=None,
+        aggregate_fields=None,
+        count_fields=None,
+        lean_rows=False,
         connection=None,
         connection_class=None,
         use_connection=None,
@@ -86,9 +143,13 @@ class DjangoObjectType(ObjectType):
         if not DJANGO_FILTER_INSTALLED and filter_fields:
             raise Exception("Can only set filter_fields if Django-Filter is installed")
 
-        django_fields = yank_fields_from_attrs(
-            construct_fields(model, registry, only_fields, exclude_fields), _as=Field
-        )
+        django_fields = construct_fields(model, registry, only_fields, exclude_fields)
+        count_field_names = ()
+        if count_fields:
+            relation_counts = construct_count_fields(model, count_fields)
+            django_fields.update(relation_counts)
+            count_field_names = tuple(relation_counts)
+        django_fields = yank_fields_from_attrs(django_fields, _as=Field)
 
         if use_connection is None and interfaces:
             use_connection = any(
@@ -101,7 +162,9 @@ class DjangoObjectType(ObjectType):
                 connection_class = DjangoConnection
 
             connection = connection_class.create_type(
-                "{}Connection".format(cls.__name__), node=cls
+                "{}Connection".format(cls.__name__),
+                node=cls,
+                aggregate_fields=aggregate_fields,
             )
 
         if connection is not None:
@@ -119,6 +182,10 @@ class DjangoObjectType(ObjectType):
         _meta.id_field = id_field
         _meta.registry = registry
         _meta.filter_fields = filter_fields
+        _meta.order_by_fields = order_by_fields or ()
+        _meta.aggregate_fields = aggregate_fields or ()
+        _meta.count_fields = count_field_names
+        _meta.lean_rows = lean_rows
         _meta.fields = django_fields
         _meta.connection = connection
 
@@ -139,25 +206,98 @@ class DjangoObjectType(ObjectType):
             root = root._wrapped
         if isinstance(root, cls):
             return True
-        if not is_valid_django_model(type(root)):
+        if not isinstance(root, LeanRow) and not is_valid_django_model(type(root)):
             raise Exception(('Received incompatible instance "{}".').format(root))
 
         model = root._meta.model._meta.concrete_model
         return model == cls._meta.model
 
     @classmethod
-    def get_node(cls, info, id):
+    def get_node_queryset(cls, info):
+        """
+        Return the queryset nodes are looked up in and whether the identity
+        map may answer lookups in its place, the queryset being the default
+        manager of the model.
+        """
+        model = cls._meta.model
         get_queryset_attr = getattr(cls, "get_queryset", None)
         if callable(get_queryset_attr):
-            queryset_or_manager = get_queryset_attr
+            # Instances in the identity map weren't necessarily loaded
+            # through get_queryset, only use it to share the result.
+            queryset = maybe_queryset(get_queryset_attr, info)
+            use_identity_map = False
         else:
-            queryset_or_manager = cls._meta.model._default_manager
+            queryset = maybe_queryset(model._default_manager, info)
+            use_identity_map = cls._meta.id_field in ("pk", model._meta.pk.name)
+
+        if returns_object_type(info, cls):
+            queryset = optimize_queryset(queryset, info, cls)
+
+        return queryset, use_identity_map
+
+    @classmethod
+    def get_node(cls, info, id):
+        model = cls._meta.model
+        identity_map = get_identity_map(info)
+        queryset, use_identity_map = cls.get_node_queryset(info)
+
+        if identity_map is not None and use_identity_map:
+            instance = identity_map.get(
+                model, id, get_loaded_fields(queryset), default_manager=True
+            )
+            if instance is not None:
+                return instance
 
         try:
-            return maybe_queryset(queryset_or_manager, info).get(**{cls._meta.id_field: id})
-        except cls._meta.model.DoesNotExist:
+            instance = queryset.get(**{cls._meta.id_field: id})
+        except model.DoesNotExist:
             return None
 
+        if identity_map is not None:
+            identity_map.add(instance, default_manager=use_identity_map)
+        return instance
+
+    @classmethod
+    def get_nodes(cls, info, ids):
+        """
+        Fetch the nodes for a list of ids with a single query, returns a list
+        of instances in the order of `ids` with None for missing ids.
+        """
+        model = cls._meta.model
+        id_field = cls._meta.id_field
+        model_field = (
+            model._meta.pk if id_field == "pk" else model._meta.get_field(id_field)
+        )
+        identity_map = get_identity_map(info)
+        queryset, use_identity_map = cls.get_node_queryset(info)
+
+        fields = get_loaded_fields(queryset)
+        keys = []
+        instances = {}
+        for id in ids:
+            try:
+                key = model_field.to_python(id)
+            except ValidationError:
+                key = None
+            keys.append(key)
+
+            if key is None or key in instances:
+                continue
+            instances[key] = None
+            if identity_map is not None and use_identity_map:
+                instances[key] = identity_map.get(
+                    model, key, fields, default_manager=True
+                )
+
+        missing = [key for key, instance in instances.items() if instance is None]
+        if missing:
+            for instance in queryset.filter(**{"{}__in".format(id_field): missing}):
+                instances[getattr(instance, model_field.attname)] = instance
+                if identity_map is not None:
+                    identity_map.add(instance, default_manager=use_identity_map)
+
+        return [instances.get(key) if key is not None else None for key in keys]
+
 
 class ErrorType(graphene.ObjectType):
     field = graphene.String(
@@ -1,6 +1,9 @@
 import inspect
 
 from django.db import models
+from django.db.models import Count, IntegerField, OuterRef, Subquery
+from django.db.models import prefetch_related_objects
+from django.db.models.functions import Coalesce
 from django.db.models.manager import Manager
 
 
@@ -58,6 +61,85 @@ def get_model_fields(model):
     return all_fields
 
 
+def is_to_many_field(model_field):
+    return model_field.one_to_many or model_field.many_to_many
+
+
+def get_relation_count(model_field):
+    """
+    Return an expression counting the rows related to each row through a
+    to-many model field. The rows of the related table, or the through
+    table of many to many relations, are counted by a subquery, so counts
+    of several relations don't multiply each other like joins would.
+    """
+    target = "pk"
+    if isinstance(model_field, (models.ManyToOneRel, models.ManyToManyRel)):
+        if model_field.many_to_many:
+            queryset = model_field.through._base_manager.all()
+            column = model_field.field.m2m_reverse_field_name()
+        else:
+            queryset = model_field.related_model._default_manager.all()
+            column = model_field.field.name
+            target = model_field.field.target_field.attname
+    else:
+        queryset = model_field.remote_field.through._base_manager.all()
+        column = model_field.m2m_field_name()
+
+    counts = (
+        queryset.filter(**{column: OuterRef(target)})
+        .order_by()
+        .values(column)
+        .annotate(count=Count("*"))
+        .values("count")
+    )
+    return Coalesce(Subquery(counts, output_field=IntegerField()), 0)
+
+
+def get_instance(value):
+    """
+    Accept a class or an instance of a pluggable strategy, like the count
+    strategy or result cache of connections, returning an instance.
+    """
+    if isinstance(value, type):
+        return value()
+    return value
+
+
+def supports_window_functions(connection):
+    if connection.vendor == "sqlite":
+        # Django only reports window function support on SQLite from 3.0
+        # onwards, SQLite itself has them since 3.25.
+        return connection.Database.sqlite_version_info >= (3, 25, 0)
+    return connection.features.supports_over_clause
+
+
+def iterate_queryset(queryset, chunk_size):
+    """
+    Iterate the rows of the queryset `chunk_size` at a time, through a
+    server-side cursor where the backend supports them, so only one chunk
+    of model instances is held in memory. `iterator()` ignores
+    prefetch_related lookups, they are prefetched for every chunk instead.
+    """
+    lookups = queryset._prefetch_related_lookups
+    if not lookups:
+        for instance in queryset.iterator(chunk_size=chunk_size):
+            yield instance
+        return
+
+    chunk = []
+    for instance in queryset.iterator(chunk_size=chunk_size):
+        chunk.append(instance)
+        if len(chunk) == chunk_size:
+            prefetch_related_objects(chunk, *lookups)
+            for instance in chunk:
+                yield instance
+            chunk = []
+
+    prefetch_related_objects(chunk, *lookups)
+    for instance in chunk:
+        yield instance
+
+
 def is_valid_django_model(model):
     return inspect.isclass(model) and issubclass(model, models.Model)
 
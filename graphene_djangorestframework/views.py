@@ -2,6 +2,7 @@ import inspect
 import json
 import copy
 
+from django.http import StreamingHttpResponse
 from django.utils import six
 
 from graphql import get_default_backend
@@ -19,6 +20,7 @@ from rest_framework.parsers import FormParser, MultiPartParser
 from rest_framework.renderers import JSONRenderer, TemplateHTMLRenderer
 
 from .exceptions import InvalidDocument
+from .export import ExportState
 from .settings import graphene_settings
 from .parsers import GraphQLJSONParser, GraphQLParser, GraphQLPlainParser
 
@@ -207,6 +209,9 @@ class GraphQLAPIView(APIView):
         # Check validation
         self.check_document_validators(document)
 
+        return self.execute_document(request, document, variables, operation_name)
+
+    def execute_document(self, request, document, variables, operation_name):
         try:
             extra_options = {}
             if self.graphene_executor:
@@ -320,3 +325,146 @@ class GraphQLAPIView(APIView):
                 self.document_invalid(
                     document, message=getattr(document_validator, "message", None)
                 )
+
+
+class GraphQLExportView(GraphQLAPIView):
+    """
+    Streams every node of a connection as newline-delimited JSON.
+
+    The query selects `edges { node { ... } }` on a single connection
+    field, which is read `graphene_export_chunk_size` rows at a time by
+    executing the query once per page. Resolver permission and throttle
+    classes of the connection are checked on the first page only. Exports
+    stop after `graphene_export_max_rows` rows, with an error as last line
+    if more rows follow.
+    """
+
+    graphene_export_chunk_size = None
+    graphene_export_max_rows = None
+
+    renderer_classes = (JSONRenderer,)
+    export_content_type = "application/x-ndjson"
+
+    def get_export_chunk_size(self):
+        if self.graphene_export_chunk_size is not None:
+            return self.graphene_export_chunk_size
+        return graphene_settings.EXPORT_CHUNK_SIZE
+
+    def get_export_max_rows(self):
+        if self.graphene_export_max_rows is not None:
+            return self.graphene_export_max_rows
+        return graphene_settings.EXPORT_MAX_ROWS
+
+    def get_graphene_context(self, request):
+        context = super(GraphQLExportView, self).get_graphene_context(request)
+        context["export"] = self.export_state
+        return context
+
+    def get_export_document(self, request, query, operation_name):
+        if not query:
+            raise exceptions.ValidationError({"message": "Must provide query string."})
+
+        backend = self.get_graphene_backend(request)
+        document = backend.document_from_string(self.graphene_schema, query)
+
+        # Every page executes the operation again.
+        if document.get_operation_type(operation_name) != "query":
+            raise exceptions.ValidationError(
+                {"message": "Only query operations can be exported."}
+            )
+
+        self.check_document_validators(document)
+        return document
+
+    def get_export_nodes(self, execution_result):
+        data = execution_result.data
+        if not isinstance(data, dict) or len(data) != 1:
+            raise exceptions.ValidationError(
+                {"message": "Export queries must select a single connection field."}
+            )
+
+        connection = next(iter(data.values())) or {}
+        edges = connection.get("edges")
+        if edges is None or any("node" not in edge for edge in edges):
+            raise exceptions.ValidationError(
+                {"message": "Export queries must select the nodes of the edges."}
+            )
+        return [edge["node"] for edge in edges]
+
+    def format_execution_errors(self, execution_result, request):
+        return {
+            "errors": [
+                self.format_graphene_error(e, request) for e in execution_result.errors
+            ]
+        }
+
+    def process_request(self, request, format=None):
+        query, variables, operation_name, id = self.get_graphql_params(
+            request, request.data
+        )
+
+        try:
+            document = self.get_export_document(request, query, operation_name)
+        except exceptions.APIException:
+            raise
+        except Exception as e:
+            return Response(
+                {"errors": [self.format_graphene_error(e, request)]}, status=400
+            )
+
+        max_rows = self.get_export_max_rows()
+        chunk_size = self.get_export_chunk_size()
+        if max_rows:
+            chunk_size = min(chunk_size, max_rows)
+        self.export_state = ExportState(chunk_size)
+
+        # The first page is executed before streaming, so errors are reported
+        # with an error status.
+        execution_result = self.execute_document(
+            request, document, variables, operation_name
+        )
+        if execution_result.errors:
+            return Response(
+                self.format_execution_errors(execution_result, request), status=400
+            )
+        nodes = self.get_export_nodes(execution_result)
+
+        return StreamingHttpResponse(
+            self.stream_export(
+                request, document, variables, operation_name, nodes, max_rows
+            ),
+            content_type=self.export_content_type,
+        )
+
+    def stream_export(
+        self, request, document, variables, operation_name, nodes, max_rows
+    ):
+        state = self.export_state
+        rows = 0
+        while True:
+            for node in nodes:
+                yield json.dumps(node) + "\n"
+            rows += len(nodes)
+
+            if not state.has_next_page:
+                return
+
+            if max_rows and rows >= max_rows:
+                message = "Export stopped after the limit of {} rows.".format(max_rows)
+                yield json.dumps({"errors": [{"message": message}]}) + "\n"
+                return
+
+            first = state.first
+            if max_rows:
+                first = min(first, max_rows - rows)
+            state.next_page(first)
+
+            execution_result = self.execute_document(
+                request, document, variables, operation_name
+            )
+            if execution_result.errors:
+                yield json.dumps(
+                    self.format_execution_errors(execution_result, request)
+                ) + "\n"
+                return
+            nodes = self.get_export_nodes(execution_result)
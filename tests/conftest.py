@@ -2,6 +2,7 @@ import pytest
 from rest_framework.test import APIClient
 
 from graphene_djangorestframework.registry import reset_global_registry, Registry
+from graphene_djangorestframework.settings import graphene_settings
 
 
 @pytest.fixture
@@ -20,6 +21,11 @@ def registry():
     return Registry()
 
 
+@pytest.fixture
+def optimize_queries(monkeypatch):
+    monkeypatch.setattr(graphene_settings, "OPTIMIZE_QUERIES", True)
+
+
 class _user(object):
     is_authenticated = True
 
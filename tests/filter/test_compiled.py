@@ -0,0 +1,133 @@
+from datetime import date, datetime
+
+import pytest
+import pytz
+
+from django import forms
+
+from graphql_relay.node.node import to_global_id
+
+from graphene_djangorestframework.utils import DJANGO_FILTER_INSTALLED
+
+from ..app.models import Article, Reporter
+from ..schema import create_article, create_reporters
+
+pytestmark = []
+
+if DJANGO_FILTER_INSTALLED:
+    import django_filters
+    from django_filters import FilterSet, OrderingFilter
+
+    from graphene_djangorestframework.filter.compiled import get_compiled_filterset
+    from graphene_djangorestframework.filter.utils import get_filterset_class
+
+    class ArticleFilter(FilterSet):
+        class Meta:
+            model = Article
+            fields = {
+                "id": ["in"],
+                "headline": ["exact", "in", "icontains"],
+                "pub_date": ["gt", "lte", "range"],
+                "reporter": ["exact"],
+                "lang": ["exact"],
+            }
+
+        order_by = OrderingFilter(fields=("pub_date", "headline"))
+
+else:
+    pytestmark.append(
+        pytest.mark.skipif(
+            True, reason="django_filters not installed or not compatible"
+        )
+    )
+
+pytestmark.append(pytest.mark.django_db)
+
+
+@pytest.fixture
+def reporters():
+    reporters = create_reporters(count=2)
+    for i in range(4):
+        create_article(
+            reporters[i % 2],
+            headline="a{}".format(i),
+            pub_date=date(2020, 1, i + 1),
+            pub_date_time=datetime(2020, 1, i + 1, tzinfo=pytz.UTC),
+            editor=reporters[0],
+            lang="es" if i % 2 else "en",
+        )
+    return reporters
+
+
+@pytest.mark.parametrize(
+    "data",
+    [
+        {},
+        {"headline": "a1"},
+        {"headline": "  a1 "},
+        {"headline": ""},
+        {"headline": None},
+        {"headline__icontains": "A"},
+        {"headline__in": "a0,a2"},
+        {"id__in": "1,2,x"},
+        {"pub_date__gt": date(2020, 1, 2)},
+        {"pub_date__lte": date(2020, 1, 2), "lang": "en"},
+        {"pub_date__range": "2020-01-02,2020-01-03"},
+        {"reporter": "reporter"},
+        {"reporter": "invalid"},
+        {"lang": "xx"},
+        {"order_by": "-headline"},
+        {"order_by": "-pub_date,unknown"},
+    ],
+)
+def test_compiled_filterset_matches_filterset(registry, reporters, data):
+    if data.get("reporter") == "reporter":
+        data = {"reporter": to_global_id("ReporterNode", reporters[1].pk)}
+
+    # The registry has no types, the IDs aren't checked against them.
+    filterset_class = get_filterset_class(ArticleFilter, registry=registry)
+    compiled = get_compiled_filterset(filterset_class)
+    assert compiled is not None
+
+    queryset = Article.objects.order_by("pk")
+    expected = filterset_class(data=data, queryset=queryset).qs
+    filtered = compiled.filter(queryset, data)
+    assert str(filtered.query) == str(expected.query)
+    assert list(filtered) == list(expected)
+
+
+def test_compiled_filterset_fallbacks():
+    class MethodFilter(FilterSet):
+        first_name = django_filters.CharFilter(method="filter_first_name")
+
+        class Meta:
+            model = Reporter
+            fields = ["last_name"]
+
+        def filter_first_name(self, queryset, name, value):
+            return queryset.filter(first_name=value)
+
+    class RequestFilter(FilterSet):
+        class Meta:
+            model = Reporter
+            fields = ["last_name"]
+
+        @property
+        def qs(self):
+            return super(RequestFilter, self).qs.none()
+
+    class ModelChoiceFilter(FilterSet):
+        reporter = django_filters.ModelChoiceFilter(queryset=Reporter.objects.all())
+
+        class Meta:
+            model = Article
+            fields = ["headline"]
+
+    class FormFilter(FilterSet):
+        class Meta:
+            model = Reporter
+            fields = ["last_name"]
+            form = type("ReporterFilterForm", (forms.Form,), {})
+
+    for filterset_class in (MethodFilter, RequestFilter, ModelChoiceFilter, FormFilter):
+        assert get_compiled_filterset(get_filterset_class(filterset_class)) is None
@@ -146,6 +146,52 @@ def test_filter_shortcut_filterset_extra_meta():
     assert "headline" not in field.filterset_class.get_fields()
 
 
+def test_filter_filterset_classes_are_shared(article_filter, monkeypatch):
+    from graphene_djangorestframework.filter import converter
+
+    converted = []
+    convert_form_field = converter.convert_form_field
+
+    def counting_convert_form_field(field):
+        converted.append(field)
+        return convert_form_field(field)
+
+    monkeypatch.setattr(converter, "convert_form_field", counting_convert_form_field)
+
+    fields = {"headline": ["exact", "icontains"], "pub_date": ["gt"]}
+    field = DjangoFilterConnectionField(ArticleNode, fields=fields)
+    other = DjangoFilterConnectionField(ArticleNode, fields=dict(fields))
+    assert field.filterset_class is other.filterset_class
+    assert field.args is field.args
+    assert_arguments(other, "headline", "headline__icontains", "pub_date__gt")
+    assert len(converted) == 3
+
+    explicit = DjangoFilterConnectionField(ArticleNode, filterset_class=article_filter)
+    other = DjangoFilterConnectionField(
+        ArticleNode, filterset_class=article_filter, fields=["headline"]
+    )
+    assert explicit.filterset_class is other.filterset_class
+
+    # Different meta options build different filtersets.
+    excluded = DjangoFilterConnectionField(
+        ArticleNode, fields=fields, extra_filter_meta={"exclude": ("headline",)}
+    )
+    assert excluded.filterset_class is not field.filterset_class
+    other = DjangoFilterConnectionField(ArticleNode, fields=["headline"])
+    assert other.filterset_class is not field.filterset_class
+
+    # Fields of another registry, like the types of another schema, don't
+    # share them.
+    class OtherArticleNode(DjangoObjectType, registry=Registry()):
+        class Meta:
+            model = Article
+            interfaces = (Node,)
+
+    other = DjangoFilterConnectionField(OtherArticleNode, fields=fields)
+    assert other.filterset_class is not field.filterset_class
+    assert other.filtering_args["headline"] is not field.filtering_args["headline"]
+
+
 def test_filter_shortcut_filterset_context(info_with_context):
     class ArticleContextFilter(django_filters.FilterSet):
         class Meta:
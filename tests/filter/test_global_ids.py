@@ -0,0 +1,188 @@
+import pytest
+
+import graphene
+
+from graphene.relay import Node
+from graphql_relay.node.node import to_global_id
+
+from graphene_djangorestframework.registry import Registry
+from graphene_djangorestframework.settings import graphene_settings
+from graphene_djangorestframework.testing import assert_num_queries
+from graphene_djangorestframework.types import DjangoObjectType
+from graphene_djangorestframework.utils import DJANGO_FILTER_INSTALLED
+
+from ..app.models import Article, CNNReporter, Reporter
+from ..schema import create_reporters
+
+pytestmark = []
+
+if DJANGO_FILTER_INSTALLED:
+    from graphql import GraphQLError
+
+    from graphene_djangorestframework.filter import DjangoFilterConnectionField
+    from graphene_djangorestframework.filter.filterset import (
+        decode_global_ids,
+        get_model_types,
+        get_related_model,
+    )
+else:
+    pytestmark.append(
+        pytest.mark.skipif(
+            True, reason="django_filters not installed or not compatible"
+        )
+    )
+
+
+def get_schema(registry):
+    class ReporterNode(DjangoObjectType, registry=registry):
+        class Meta:
+            model = Reporter
+            interfaces = (Node,)
+            only_fields = ("first_name", "pets")
+            filter_fields = {"id": ["exact", "in"], "pets": ["exact"]}
+
+    class ArticleNode(DjangoObjectType, registry=registry):
+        class Meta:
+            model = Article
+            interfaces = (Node,)
+            only_fields = ("headline",)
+
+    class Query(graphene.ObjectType):
+        reporters = DjangoFilterConnectionField(ReporterNode)
+
+    return graphene.Schema(query=Query, types=[ArticleNode])
+
+
+def test_get_related_model():
+    assert get_related_model(Reporter, "id") is Reporter
+    assert get_related_model(Reporter, "pk") is Reporter
+    assert get_related_model(Reporter, "pets") is Reporter
+    assert get_related_model(Reporter, "articles") is Article
+    assert get_related_model(Article, "reporter__pets") is Reporter
+    assert get_related_model(Article, "unknown") is None
+
+
+def test_get_model_types(registry):
+    get_schema(registry)
+    assert list(get_model_types(Reporter, registry)) == ["ReporterNode"]
+    # IDs of the concrete model are IDs of its proxies.
+    assert list(get_model_types(CNNReporter, registry)) == ["ReporterNode"]
+    assert get_model_types(Reporter, Registry()) == {}
+
+
+def test_decode_global_ids(registry):
+    get_schema(registry)
+    types = get_model_types(Reporter, registry)
+    global_ids = [
+        to_global_id("ReporterNode", 2),
+        to_global_id("ReporterNode", "1"),
+        to_global_id("ReporterNode", "02"),
+        to_global_id("ReporterNode", 1),
+    ]
+    assert decode_global_ids(global_ids, Reporter, types) == [2, 1]
+    # Without types the IDs can't be checked.
+    assert decode_global_ids(global_ids, None) == ["2", "1", "02"]
+
+    with pytest.raises(GraphQLError) as exc_info:
+        decode_global_ids([to_global_id("ArticleNode", 1)], Reporter, types)
+    assert str(exc_info.value).endswith("IDs, not ArticleNode.")
+
+    with pytest.raises(GraphQLError) as exc_info:
+        decode_global_ids([to_global_id("ReporterNode", "x")], Reporter, types)
+    assert str(exc_info.value) == "Invalid ID specified."
+
+
+def test_decode_global_ids_limit(monkeypatch):
+    monkeypatch.setattr(graphene_settings, "FILTER_MAX_GLOBAL_IDS", 2)
+    global_ids = [to_global_id("ReporterNode", i) for i in (1, 2, 1)]
+    assert decode_global_ids(global_ids, None) == ["1", "2"]
+
+    with pytest.raises(GraphQLError) as exc_info:
+        decode_global_ids(global_ids + [to_global_id("ReporterNode", 3)], None)
+    assert str(exc_info.value) == "At most 2 IDs can be given."
+
+
+@pytest.mark.django_db
+def test_global_id_filters_without_limit(registry, info_with_context):
+    reporters = create_reporters()
+    reporters[0].pets.add(reporters[1])
+
+    schema = get_schema(registry)
+    query = """
+        query Reporters($pets: [ID]) {
+          reporters(pets: $pets) {
+            edges {
+              node {
+                firstName
+              }
+            }
+          }
+        }
+    """
+    # No limit by default, unknown IDs just don't match.
+    pets = [to_global_id("ReporterNode", pk) for pk in range(1, 1001)]
+    result = schema.execute(
+        query, variables={"pets": pets}, context=info_with_context().context
+    )
+    assert not result.errors
+    edges = result.data["reporters"]["edges"]
+    assert sorted(edge["node"]["firstName"] for edge in edges) == ["r0", "r1"]
+
+
+@pytest.mark.django_db
+def test_global_id_filters(registry, info_with_context):
+    reporters = [
+        Reporter.objects.create(first_name=name, last_name="r", email="r@test.com")
+        for name in ("a", "b", "c")
+    ]
+    reporters[0].pets.add(reporters[1], reporters[2])
+    reporters[1].pets.add(reporters[2])
+
+    schema = get_schema(registry)
+    query = """
+        query Reporters($id: ID, $idIn: ID, $pets: [ID]) {
+          reporters(id: $id, id_In: $idIn, pets: $pets) {
+            edges {
+              node {
+                firstName
+              }
+            }
+          }
+        }
+    """
+
+    def execute(**variables):
+        return schema.execute(
+            query, variables=variables, context=info_with_context().context
+        )
+
+    def reporter_id(reporter):
+        return to_global_id("ReporterNode", reporter.pk)
+
+    def first_names(result):
+        assert not result.errors
+        edges = result.data["reporters"]["edges"]
+        return [edge["node"]["firstName"] for edge in edges]
+
+    assert first_names(execute(id=reporter_id(reporters[1]))) == ["b"]
+    assert first_names(
+        execute(idIn=",".join(reporter_id(reporter) for reporter in reporters[1:]))
+    ) == ["b", "c"]
+
+    pets = [reporter_id(reporters[2])] * 500 + [reporter_id(reporters[1])] * 500
+    with assert_num_queries(1) as context:
+        assert sorted(first_names(execute(pets=pets))) == ["a", "b", "c"]
+    # The IDs are compared by a single IN clause of distinct primary keys.
+    sql = context.captured_queries[0]["sql"]
+    assert sql.count("IN ({}, {})".format(reporters[2].pk, reporters[1].pk)) == 1
+    assert " OR " not in sql
+
+    # IDs of other types are rejected before any query runs.
+    with assert_num_queries(0):
+        result = execute(pets=[to_global_id("ArticleNode", reporters[1].pk)])
+    assert result.errors
+    assert "IDs, not ArticleNode." in str(result.errors[0])
+
+    with assert_num_queries(0):
+        result = execute(id=to_global_id("PetType", 1))
+    assert result.errors
@@ -0,0 +1,143 @@
+import warnings
+
+import pytest
+
+import graphene
+
+from graphene.relay import Node
+
+from graphene_djangorestframework.registry import Registry
+from graphene_djangorestframework.settings import graphene_settings
+from graphene_djangorestframework.testing import assert_num_queries
+from graphene_djangorestframework.types import DjangoObjectType
+from graphene_djangorestframework.utils import DJANGO_FILTER_INSTALLED
+
+from ..app.models import Article, Reporter
+
+pytestmark = []
+
+if DJANGO_FILTER_INSTALLED:
+    from graphene_djangorestframework.filter import DjangoFilterConnectionField
+    from graphene_djangorestframework.filter.ordering import get_ordering
+else:
+    pytestmark.append(
+        pytest.mark.skipif(
+            True, reason="django_filters not installed or not compatible"
+        )
+    )
+
+
+def get_schema(**field_kwargs):
+    ordering_registry = Registry()
+
+    class ReporterNode(DjangoObjectType):
+        class Meta:
+            model = Reporter
+            interfaces = (Node,)
+            only_fields = ("first_name", "last_name")
+            filter_fields = ("last_name",)
+            order_by_fields = ("first_name", "last_name")
+            registry = ordering_registry
+
+    class Query(graphene.ObjectType):
+        reporters = DjangoFilterConnectionField(ReporterNode, **field_kwargs)
+
+    return graphene.Schema(query=Query)
+
+
+def test_get_ordering():
+    assert get_ordering(Reporter, []) == []
+    assert get_ordering(Reporter, ["first_name"]) == ["first_name", "pk"]
+    assert get_ordering(Reporter, ["first_name", "-last_name"]) == [
+        "first_name",
+        "-last_name",
+        "-pk",
+    ]
+    assert get_ordering(Reporter, ["-id", "first_name"]) == ["-id", "first_name"]
+    assert get_ordering(Article, ["reporter__first_name"]) == [
+        "reporter__first_name",
+        "pk",
+    ]
+
+
+@pytest.mark.django_db
+def test_order_by_argument(info_with_context):
+    for first_name, last_name in [("b", "x"), ("a", "y"), ("b", "x"), ("c", "x")]:
+        Reporter.objects.create(
+            first_name=first_name, last_name=last_name, email="r@test.com"
+        )
+
+    schema = get_schema()
+    query = """
+        query {
+          reporters(lastName: "x", orderBy: [FIRST_NAME_DESC]) {
+            edges {
+              node {
+                id
+                firstName
+              }
+            }
+          }
+        }
+    """
+    with assert_num_queries(1) as context:
+        result = schema.execute(query, context=info_with_context().context)
+    assert not result.errors
+    nodes = [edge["node"] for edge in result.data["reporters"]["edges"]]
+    assert [node["firstName"] for node in nodes] == ["c", "b", "b"]
+    # Ties are broken by the primary key, in the direction of the ordering.
+    assert nodes[1]["id"] > nodes[2]["id"]
+    assert context.captured_queries[0]["sql"].endswith(
+        'ORDER BY "app_reporter"."first_name" DESC, "app_reporter"."id" DESC'
+    )
+
+
+def test_order_by_argument_enum():
+    schema = get_schema()
+    field = schema.get_query_type().fields["reporters"]
+    assert str(field.args["orderBy"].type) == "[ReporterNodeOrderBy!]"
+    order_by_enum = schema.get_type("ReporterNodeOrderBy")
+    values = {value.name: value.value for value in order_by_enum.values}
+    assert values == {
+        "FIRST_NAME_ASC": "first_name",
+        "FIRST_NAME_DESC": "-first_name",
+        "LAST_NAME_ASC": "last_name",
+        "LAST_NAME_DESC": "-last_name",
+    }
+
+    schema = get_schema(order_by=False)
+    assert "orderBy" not in schema.get_query_type().fields["reporters"].args
+
+
+def test_order_by_kwarg_is_deprecated():
+    with pytest.warns(DeprecationWarning):
+        schema = get_schema(order_by=["last_name"])
+    # The orderings of the type's Meta are still available.
+    field = schema.get_query_type().fields["reporters"]
+    assert str(field.args["orderBy"].type) == "[ReporterNodeOrderBy!]"
+
+
+def test_order_by_index_warnings(monkeypatch):
+    monkeypatch.setattr(graphene_settings, "CHECK_ORDERING_INDEXES", True)
+
+    class ArticleNode(DjangoObjectType):
+        class Meta:
+            model = Article
+            interfaces = (Node,)
+            filter_fields = {"lang": ["exact"], "reporter": ["exact", "in"]}
+            order_by_fields = ("headline", "reporter", "id", "reporter__first_name")
+            registry = Registry()
+
+    with warnings.catch_warnings(record=True) as caught:
+        warnings.simplefilter("always")
+        DjangoFilterConnectionField(ArticleNode).args
+
+    assert sorted(str(warning.message) for warning in caught) == [
+        "Ordering Article by headline filtered by lang has no index on (lang, headline).",
+        "Ordering Article by headline filtered by reporter has no index on (reporter, headline).",
+        "Ordering Article by headline has no supporting index.",
+        "Ordering Article by id filtered by lang has no index on (lang, id).",
+        "Ordering Article by id filtered by reporter has no index on (reporter, id).",
+        "Ordering Article by reporter filtered by lang has no index on (lang, reporter).",
+        "Ordering Article by reporter__first_name spans a relation, no index can serve it.",
+    ]
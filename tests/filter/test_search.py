@@ -0,0 +1,250 @@
+import warnings
+from io import StringIO
+
+import pytest
+
+import graphene
+
+from django.core import management
+from django.db import connection
+
+from graphene_djangorestframework.testing import assert_num_queries
+from graphene_djangorestframework.utils import DJANGO_FILTER_INSTALLED
+
+from ..app.models import Article, Reporter
+from ..schema import create_article, create_reporter, node_type
+
+pytestmark = []
+
+if DJANGO_FILTER_INSTALLED:
+    from django_filters import FilterSet
+
+    from graphene_djangorestframework.filter import (
+        DjangoFilterConnectionField,
+        SearchFilter,
+    )
+    from graphene_djangorestframework.filter.compiled import get_compiled_filterset
+    from graphene_djangorestframework.filter.search import (
+        SQLiteSearchIndex,
+        _search_indexes,
+    )
+    from graphene_djangorestframework.filter.utils import get_filterset_class
+
+    class ReporterSearchFilterSet(FilterSet):
+        search = SearchFilter(fields=("first_name", "last_name"))
+
+        class Meta:
+            model = Reporter
+            fields = ()
+
+    class ArticleSearchFilterSet(FilterSet):
+        search = SearchFilter(fields=("headline", "reporter__last_name"))
+
+        class Meta:
+            model = Article
+            fields = ()
+
+else:
+    pytestmark.append(
+        pytest.mark.skipif(
+            True, reason="django_filters not installed or not compatible"
+        )
+    )
+
+
+def get_schema(registry):
+    ReporterNode = node_type(
+        Reporter, registry, only_fields=("first_name", "last_name")
+    )
+    ArticleNode = node_type(Article, registry, only_fields=("headline",))
+
+    class Query(graphene.ObjectType):
+        reporters = DjangoFilterConnectionField(
+            ReporterNode, filterset_class=ReporterSearchFilterSet
+        )
+        articles = DjangoFilterConnectionField(
+            ArticleNode, filterset_class=ArticleSearchFilterSet
+        )
+
+    return graphene.Schema(query=Query)
+
+
+def search_reporters(schema, context, search):
+    query = """
+        query Search($search: String) {
+          reporters(search: $search) {
+            edges {
+              node {
+                firstName
+                lastName
+              }
+            }
+          }
+        }
+    """
+    result = schema.execute(query, variables={"search": search}, context=context)
+    assert not result.errors
+    return [
+        "{firstName} {lastName}".format(**edge["node"])
+        for edge in result.data["reporters"]["edges"]
+    ]
+
+
+@pytest.fixture(autouse=True)
+def search_indexes():
+    """
+    Forget whether the indexes were built, their tables are dropped with
+    the transaction of each test.
+    """
+    for index in _search_indexes.values():
+        index.built.clear()
+        index.warned.clear()
+    yield
+    for index in _search_indexes.values():
+        index.built.clear()
+        index.warned.clear()
+
+
+@pytest.fixture
+def built_indexes(registry, search_indexes):
+    get_schema(registry)
+    management.call_command("graphql_search_index", stdout=StringIO())
+
+
+def test_search_filter_registers_the_sqlite_index(registry):
+    schema = get_schema(registry)
+    schema.get_query_type().fields["reporters"]
+
+    fields = ("first_name", "last_name")
+    table = SQLiteSearchIndex.get_table_name(Reporter, fields)
+    assert table in _search_indexes
+    assert SQLiteSearchIndex.can_index(Reporter, fields)
+    assert not SQLiteSearchIndex.can_index(Article, ("reporter__last_name",))
+
+
+def test_search_filter_is_compiled(registry):
+    schema = get_schema(registry)
+    field = schema.get_query_type().fields["reporters"]
+    assert str(field.args["search"].type) == "String"
+
+    filterset_class = get_filterset_class(ReporterSearchFilterSet)
+    assert get_compiled_filterset(filterset_class) is not None
+
+
+@pytest.mark.django_db
+def test_search_filter_sqlite(registry, info_with_context):
+    create_reporter(first_name="John", last_name="Doe")
+    create_reporter(first_name="Jane", last_name="Doe")
+    create_reporter(first_name="Doe", last_name="Doe")
+    create_reporter(first_name="John", last_name="Smith")
+
+    schema = get_schema(registry)
+    management.call_command("graphql_search_index", stdout=StringIO())
+    context = info_with_context().context
+
+    # Rows matching more often rank first, ties keep the primary key order.
+    assert search_reporters(schema, context, "doe") == [
+        "Doe Doe",
+        "John Doe",
+        "Jane Doe",
+    ]
+    assert search_reporters(schema, context, "john  doe") == ["John Doe"]
+    assert search_reporters(schema, context, "nobody") == []
+    # Query syntax is searched for literally.
+    assert search_reporters(schema, context, 'doe" OR "smith') == []
+    assert search_reporters(schema, context, "doe OR smith") == []
+    assert len(search_reporters(schema, context, "")) == 4
+
+
+@pytest.mark.django_db
+def test_search_filter_sqlite_index_sync(registry, built_indexes, info_with_context):
+    reporter = create_reporter(first_name="John", last_name="Doe")
+
+    schema = get_schema(registry)
+    context = info_with_context().context
+    assert search_reporters(schema, context, "doe") == ["John Doe"]
+
+    create_reporter(first_name="Jane", last_name="Doe")
+    reporter.last_name = "Smith"
+    reporter.save()
+    assert search_reporters(schema, context, "doe") == ["Jane Doe"]
+    assert search_reporters(schema, context, "smith") == ["John Smith"]
+
+    reporter.delete()
+    assert search_reporters(schema, context, "smith") == []
+
+    # Updates not sending signals are searched once the index is rebuilt.
+    Reporter.objects.update(last_name="Roe")
+    assert search_reporters(schema, context, "roe") == []
+    management.call_command("graphql_search_index", stdout=StringIO())
+    assert search_reporters(schema, context, "roe") == ["Jane Roe"]
+
+
+@pytest.mark.django_db
+def test_search_filter_sqlite_index_not_built(registry, info_with_context):
+    schema = get_schema(registry)
+    context = info_with_context().context
+    with warnings.catch_warnings(record=True) as caught:
+        warnings.simplefilter("always")
+        create_reporter(first_name="John", last_name="Doe")
+        jane = create_reporter(first_name="Jane", last_name="Smith")
+        assert search_reporters(schema, context, "doe") == ["John Doe"]
+        # The missing table is looked up again by each search.
+        with assert_num_queries(2):
+            assert search_reporters(schema, context, "smith") == ["Jane Smith"]
+
+    messages = [str(warning.message) for warning in caught]
+    assert len([message for message in messages if "search index" in message]) == 1
+
+    # A table built by another process is used, and kept in sync.
+    index = _search_indexes[
+        SQLiteSearchIndex.get_table_name(Reporter, ("first_name", "last_name"))
+    ]
+    index.build(connection)
+    index.built.clear()
+    jane.last_name = "Doe"
+    jane.save()
+    with assert_num_queries(1) as captured:
+        assert search_reporters(schema, context, "doe") == ["John Doe", "Jane Doe"]
+    assert "MATCH" in captured.captured_queries[0]["sql"]
+    assert search_reporters(schema, context, "smith") == []
+
+
+def test_search_index_command_requires_sqlite(monkeypatch):
+    monkeypatch.setattr(connection, "vendor", "mysql")
+    with pytest.raises(management.CommandError):
+        management.call_command("graphql_search_index", stdout=StringIO())
+
+
+@pytest.mark.django_db
+def test_search_filter_icontains_fallback(registry, info_with_context):
+    doe = create_reporter(first_name="John", last_name="Doe")
+    smith = create_reporter(first_name="John", last_name="Smith")
+    create_article(doe, headline="Django search")
+    create_article(smith, headline="Django release")
+    create_article(smith, headline="Search engines")
+
+    schema = get_schema(registry)
+    query = """
+        query Search($search: String) {
+          articles(search: $search) {
+            edges {
+              node {
+                headline
+              }
+            }
+          }
+        }
+    """
+
+    def search(value):
+        result = schema.execute(
+            query, variables={"search": value}, context=info_with_context().context
+        )
+        assert not result.errors
+        return sorted(
+            edge["node"]["headline"] for edge in result.data["articles"]["edges"]
+        )
+
+    assert search("search") == ["Django search", "Search engines"]
+    assert search("smith django") == ["Django release"]
@@ -0,0 +1,220 @@
+from io import StringIO
+
+import pytest
+
+import graphene
+
+from django.core import management
+from graphene.relay import Node
+
+from graphene_djangorestframework.registry import Registry
+from graphene_djangorestframework.settings import graphene_settings
+from graphene_djangorestframework.types import DjangoObjectType
+from graphene_djangorestframework.utils import DJANGO_FILTER_INSTALLED
+
+from ..app.models import Article, Reporter
+from ..schema import create_article, create_reporters, node_type
+
+pytestmark = []
+
+if DJANGO_FILTER_INSTALLED:
+    from graphene_djangorestframework.filter import DjangoFilterConnectionField
+    from graphene_djangorestframework.filter.usage import (
+        FilterUsageRecorder,
+        get_sequential_scans,
+        suggest_index,
+    )
+else:
+    pytestmark.append(
+        pytest.mark.skipif(
+            True, reason="django_filters not installed or not compatible"
+        )
+    )
+
+
+@pytest.fixture
+def recorder(monkeypatch):
+    recorder = FilterUsageRecorder(key_prefix="test:filter_usage")
+    monkeypatch.setattr(graphene_settings, "FILTER_USAGE_RECORDER", recorder)
+    yield recorder
+    recorder.clear()
+
+
+def get_schema():
+    usage_registry = Registry()
+
+    class ReporterNode(DjangoObjectType):
+        class Meta:
+            model = Reporter
+            interfaces = (Node,)
+            only_fields = ("first_name", "last_name")
+            filter_fields = ("first_name", "last_name")
+            order_by_fields = ("first_name",)
+            registry = usage_registry
+
+    class Query(graphene.ObjectType):
+        reporters = DjangoFilterConnectionField(ReporterNode)
+
+    return graphene.Schema(query=Query)
+
+
+def test_suggest_index():
+    assert suggest_index(
+        Reporter, [("first_name", "icontains"), ("last_name", "exact")], ["-email"]
+    ) == ["last_name", "email", "first_name"]
+    assert suggest_index(Reporter, [("pets", "in")], ["pets__first_name"]) is None
+    # The foreign key is indexed already.
+    assert suggest_index(Article, [("reporter", "exact")], []) is None
+    assert suggest_index(Article, [("reporter", "exact")], ["headline"]) == [
+        "reporter",
+        "headline",
+    ]
+
+
+def test_get_sequential_scans():
+    assert get_sequential_scans(
+        "sqlite",
+        [
+            (2, 0, 0, "SCAN app_reporter"),
+            (3, 0, 0, "SCAN TABLE app_article"),
+            (4, 0, 0, "SCAN app_film USING INDEX app_film_genre"),
+            (5, 0, 0, "SEARCH app_pet USING INTEGER PRIMARY KEY (rowid=?)"),
+            (6, 0, 0, "USE TEMP B-TREE FOR ORDER BY"),
+        ],
+    ) == ["app_reporter", "app_article"]
+    assert get_sequential_scans(
+        "postgresql",
+        [
+            ("Sort  (cost=1.02..1.03 rows=1 width=8)",),
+            ("  ->  Seq Scan on app_reporter  (cost=0.00..1.01 rows=1 width=8)",),
+            ("        Filter: ((last_name)::text = 'Doe'::text)",),
+        ],
+    ) == ["app_reporter"]
+
+
+@pytest.mark.django_db
+def test_filter_usage_is_recorded(recorder, info_with_context):
+    Reporter.objects.create(first_name="John", last_name="Doe", email="r@test.com")
+
+    schema = get_schema()
+    query = """
+        query Reporters($lastName: String, $orderBy: [ReporterNodeOrderBy!]) {
+          reporters(lastName: $lastName, orderBy: $orderBy) {
+            edges {
+              node {
+                firstName
+              }
+            }
+          }
+        }
+    """
+    for variables in [
+        {"lastName": "Doe", "orderBy": ["FIRST_NAME_DESC"]},
+        {"lastName": "Smith", "orderBy": ["FIRST_NAME_DESC"]},
+        {},
+    ]:
+        result = schema.execute(
+            query, variables=variables, context=info_with_context().context
+        )
+        assert not result.errors
+
+    usages = {
+        (usage["filters"], usage["order_by"]): usage
+        for usage in recorder.get_usages()
+    }
+    assert sorted(usages) == [
+        ((), ()),
+        (("last_name",), ("-first_name",)),
+    ]
+    usage = usages[("last_name",), ("-first_name",)]
+    assert usage["model"] == "app.Reporter"
+    assert usage["lookups"] == [("last_name", "exact")]
+    assert usage["count"] == 2
+    assert usage["queries"] == 2
+    assert 0 < usage["max_duration"] <= usage["duration"]
+    # The values filtered by aren't kept, only the parameterized query.
+    assert "params" not in usage and usage["param_count"] == 1
+    assert "Doe" not in usage["sql"] and "Smith" not in usage["sql"]
+
+    out = StringIO()
+    management.call_command("graphql_filter_usage", stdout=out, clear=True)
+    report = out.getvalue()
+    assert "app.Reporter: last_name, ordered by -first_name (2 calls" in report
+    assert "app.Reporter: no filters (1 calls" in report
+    assert "Sequential scan on app_reporter" in report
+    assert "Suggested index: models.Index(fields=['last_name', 'first_name'])" in report
+    assert recorder.get_usages() == []
+
+
+@pytest.mark.django_db
+def test_filter_usage_is_written_in_batches(recorder, info_with_context):
+    recorder.batch_size = 2
+    key = recorder.get_cache_key(("app.Reporter", ("last_name",), ()))
+
+    schema = get_schema()
+    query = 'query { reporters(lastName: "Doe") { edges { node { firstName } } } }'
+    for i in range(3):
+        result = schema.execute(query, context=info_with_context().context)
+        assert not result.errors
+    # The third call waits for the next batch, or the process reading it.
+    assert recorder.cache.get("{}:count".format(key)) == 2
+    assert [usage["count"] for usage in recorder.get_usages()] == [3]
+    assert recorder.cache.get("{}:count".format(key)) == 3
+
+
+def test_filter_usage_command_requires_a_recorder():
+    with pytest.raises(management.CommandError):
+        management.call_command("graphql_filter_usage", stdout=StringIO())
+
+
+@pytest.mark.django_db
+def test_filter_usage_times_deferred_queries(registry, recorder, info_with_context):
+    for reporter in create_reporters(count=2):
+        create_article(reporter)
+    node_type(Article, registry, only_fields=("headline",), filter_fields=("lang",))
+    ReporterType = node_type(
+        Reporter,
+        registry,
+        only_fields=("first_name", "articles"),
+        filter_fields=("last_name",),
+    )
+
+    class Query(graphene.ObjectType):
+        reporters = DjangoFilterConnectionField(ReporterType)
+        chunked_reporters = DjangoFilterConnectionField(ReporterType, chunk_size=1)
+
+    schema = graphene.Schema(query=Query)
+    query = """
+        query {
+          reporters(first: 1) {
+            totalCount
+            edges {
+              node {
+                firstName
+              }
+            }
+          }
+          chunkedReporters(lastName: "r") {
+            edges {
+              node {
+                articles(lang: "es") {
+                  totalCount
+                }
+              }
+            }
+          }
+        }
+    """
+    result = schema.execute(query, context=info_with_context().context)
+    assert not result.errors
+
+    usages = {
+        (usage["model"], usage["filters"]): usage for usage in recorder.get_usages()
+    }
+    # The page and the count of totalCount, resolved after the connection.
+    assert usages["app.Reporter", ()]["queries"] == 2
+    # The count of the page and its chunked edges.
+    assert usages["app.Reporter", ("last_name",)]["queries"] == 2
+    # The count and the page of the connections batched for both reporters.
+    assert usages["app.Article", ("lang",)]["count"] == 2
+    assert usages["app.Article", ("lang",)]["queries"] == 2
@@ -0,0 +1,208 @@
+from datetime import date, datetime
+
+import pytest
+import pytz
+
+import graphene
+
+from graphene_djangorestframework.relay.aggregates import get_aggregates
+from graphene_djangorestframework.relay.fields import DjangoConnectionField
+from graphene_djangorestframework.testing import assert_num_queries
+
+from ..app.models import Article, Reporter
+from ..schema import create_article, create_reporters, node_type
+
+
+def get_schema(registry, article_resolver=None):
+    ReporterType = node_type(Reporter, registry, only_fields=("first_name", "articles"))
+    ArticleType = node_type(
+        Article,
+        registry,
+        only_fields=("headline",),
+        aggregate_fields={
+            "importance": ["sum", "avg", "min", "max"],
+            "pub_date": ["min", "max"],
+        },
+    )
+
+    class Query(graphene.ObjectType):
+        articles = DjangoConnectionField(ArticleType)
+        reporters = DjangoConnectionField(ReporterType)
+
+        def resolve_articles(self, info, **args):
+            if article_resolver is not None:
+                return article_resolver()
+            return Article.objects.all()
+
+    return graphene.Schema(query=Query)
+
+
+@pytest.fixture
+def articles():
+    reporters = create_reporters(count=2)
+    return [
+        create_article(
+            reporters[i % 2],
+            headline="a{}".format(i),
+            pub_date=date(2020, 1, i + 1),
+            pub_date_time=datetime(2020, 1, i + 1, tzinfo=pytz.UTC),
+            editor=reporters[0],
+            lang="es" if i % 2 else "en",
+            importance=importance,
+        )
+        for i, importance in enumerate([1, 2, None, 5])
+    ]
+
+
+def test_aggregate_type(registry):
+    schema = get_schema(registry)
+    aggregate_type = schema.get_type("ArticleTypeAggregate")
+    assert {name: str(field.type) for name, field in aggregate_type.fields.items()} == {
+        "count": "Int!",
+        "importanceSum": "Int",
+        "importanceAvg": "Float",
+        "importanceMin": "Int",
+        "importanceMax": "Int",
+        "pubDateMin": "Date",
+        "pubDateMax": "Date",
+    }
+    assert "aggregate" not in schema.get_type("ReporterTypeConnection").fields
+
+
+def test_get_aggregates():
+    names = [aggregate.name for aggregate in get_aggregates(Article, ["importance"])]
+    assert names == [
+        "count",
+        "importanceSum",
+        "importanceAvg",
+        "importanceMin",
+        "importanceMax",
+    ]
+    names = [aggregate.name for aggregate in get_aggregates(Article, ["headline"])]
+    assert names == ["count", "headlineMin", "headlineMax"]
+
+    with pytest.raises(AssertionError):
+        get_aggregates(Article, {"headline": ["sum"]})
+    with pytest.raises(AssertionError):
+        get_aggregates(Article, {"importance": ["median"]})
+    with pytest.raises(AssertionError):
+        get_aggregates(Article, ["reporter"])
+
+
+@pytest.mark.django_db
+def test_aggregate_field(registry, articles, info_with_context):
+    schema = get_schema(registry, lambda: Article.objects.filter(lang="en"))
+    query = """
+        query {
+          articles(first: 1) {
+            edges {
+              node {
+                headline
+              }
+            }
+            aggregate {
+              count
+              importanceSum
+              pubDateMax
+            }
+          }
+        }
+    """
+    with assert_num_queries(2) as context:
+        result = schema.execute(query, context=info_with_context().context)
+    assert not result.errors
+    assert result.data["articles"] == {
+        "edges": [{"node": {"headline": "a0"}}],
+        # Only the selected aggregates are computed, over every row.
+        "aggregate": {"count": 2, "importanceSum": 1, "pubDateMax": "2020-01-03"},
+    }
+    sql = context.captured_queries[1]["sql"]
+    assert "COUNT(" in sql and "SUM(" in sql and "MAX(" in sql
+    assert "AVG(" not in sql and "MIN(" not in sql
+    assert "ORDER BY" not in sql
+
+
+@pytest.mark.django_db
+def test_aggregate_field_of_related_connection(registry, articles, info_with_context):
+    schema = get_schema(registry)
+    query = """
+        query {
+          reporters {
+            edges {
+              node {
+                firstName
+                articles(first: 1) {
+                  aggregate {
+                    count
+                    importanceAvg
+                    importanceMin
+                  }
+                }
+              }
+            }
+          }
+        }
+    """
+    result = schema.execute(query, context=info_with_context().context)
+    assert not result.errors
+    aggregates = [
+        edge["node"]["articles"]["aggregate"]
+        for edge in result.data["reporters"]["edges"]
+    ]
+    assert aggregates == [
+        {"count": 2, "importanceAvg": 1.0, "importanceMin": 1},
+        {"count": 2, "importanceAvg": 3.5, "importanceMin": 2},
+    ]
+
+
+@pytest.mark.django_db
+def test_aggregate_field_of_list(registry, articles, info_with_context):
+    schema = get_schema(registry, lambda: list(Article.objects.order_by("pk")))
+    query = """
+        query {
+          articles(first: 1) {
+            aggregate {
+              count
+              importanceSum
+              importanceAvg
+              pubDateMin
+            }
+          }
+        }
+    """
+    with assert_num_queries(1):
+        result = schema.execute(query, context=info_with_context().context)
+    assert not result.errors
+    assert result.data["articles"]["aggregate"] == {
+        "count": 4,
+        "importanceSum": 8,
+        "importanceAvg": 8 / 3.0,
+        "pubDateMin": "2020-01-01",
+    }
+
+
+@pytest.mark.django_db
+def test_aggregate_field_of_sliced_queryset(registry, articles, info_with_context):
+    schema = get_schema(registry, lambda: Article.objects.order_by("-pk")[:2])
+    query = """
+        query {
+          articles(first: 1) {
+            edges {
+              node {
+                headline
+              }
+            }
+            aggregate {
+              count
+              importanceSum
+            }
+          }
+        }
+    """
+    result = schema.execute(query, context=info_with_context().context)
+    assert not result.errors
+    assert result.data["articles"] == {
+        "edges": [{"node": {"headline": "a3"}}],
+        # Computed over the rows of the slice.
+        "aggregate": {"count": 2, "importanceSum": 5},
+    }
@@ -0,0 +1,177 @@
+import pytest
+
+from django.core.cache import cache
+
+import graphene
+
+from graphene_djangorestframework.relay.fields import DjangoConnectionField
+from graphene_djangorestframework.relay.counts import (
+    CachedCount,
+    EstimatedCount,
+    ExactCount,
+)
+from graphene_djangorestframework.testing import assert_num_queries
+
+from ..app.models import Reporter
+from ..schema import create_reporter, create_reporters, node_type
+
+pytestmark = pytest.mark.django_db
+
+QUERY = """
+    query {
+      reporters(first: 1) {
+        totalCount
+        totalCountIsApproximate
+        edges {
+          node {
+            firstName
+          }
+        }
+      }
+    }
+"""
+
+
+@pytest.fixture(autouse=True)
+def clear_cache():
+    cache.clear()
+    yield
+    cache.clear()
+
+
+def get_schema(registry, count_strategy, window_count=False, queryset=None):
+    ReporterType = node_type(Reporter, registry, only_fields=("id", "first_name"))
+
+    class Query(graphene.ObjectType):
+        reporters = DjangoConnectionField(
+            ReporterType, count_strategy=count_strategy, window_count=window_count
+        )
+
+        def resolve_reporters(self, info, **args):
+            return queryset
+
+    return graphene.Schema(query=Query)
+
+
+class FixedEstimateCount(EstimatedCount):
+    def estimate(self, queryset):
+        return 1000
+
+
+def test_exact_count(registry, info_with_context):
+    create_reporters()
+    schema = get_schema(registry, ExactCount)
+
+    with assert_num_queries(2):
+        result = schema.execute(QUERY, context=info_with_context().context)
+    assert not result.errors
+    assert result.data["reporters"]["totalCount"] == 3
+    assert not result.data["reporters"]["totalCountIsApproximate"]
+
+
+def test_cached_count(registry, info_with_context):
+    create_reporters()
+    schema = get_schema(registry, CachedCount(timeout=60))
+
+    with assert_num_queries(2):
+        result = schema.execute(QUERY, context=info_with_context().context)
+    assert not result.errors
+    assert result.data["reporters"]["totalCount"] == 3
+    assert not result.data["reporters"]["totalCountIsApproximate"]
+
+    create_reporter(first_name="r3")
+
+    # The cached count is reused and may be stale.
+    with assert_num_queries(1):
+        result = schema.execute(QUERY, context=info_with_context().context)
+    assert not result.errors
+    assert result.data["reporters"]["totalCount"] == 3
+    assert result.data["reporters"]["totalCountIsApproximate"]
+
+
+def test_cached_count_key():
+    strategy = CachedCount()
+    key = strategy.get_cache_key(Reporter.objects.all())
+
+    # Ordering and selected columns don't change the count.
+    assert strategy.get_cache_key(Reporter.objects.order_by("-first_name")) == key
+    assert strategy.get_cache_key(Reporter.objects.only("first_name")) == key
+    assert strategy.get_cache_key(Reporter.objects.filter(first_name="r0")) != key
+
+
+def test_estimated_count(registry, info_with_context):
+    create_reporters()
+    schema = get_schema(registry, FixedEstimateCount(threshold=100))
+    with assert_num_queries(1):
+        result = schema.execute(QUERY, context=info_with_context().context)
+    assert not result.errors
+    assert result.data["reporters"]["totalCount"] == 1000
+    assert result.data["reporters"]["totalCountIsApproximate"]
+
+    # Estimates below the threshold are counted exactly.
+    schema = get_schema(registry, FixedEstimateCount(threshold=10000))
+    result = schema.execute(QUERY, context=info_with_context().context)
+    assert not result.errors
+    assert result.data["reporters"]["totalCount"] == 3
+    assert not result.data["reporters"]["totalCountIsApproximate"]
+
+
+def test_estimated_count_without_planner_estimate(registry, info_with_context):
+    create_reporters()
+    # SQLite has no row estimates, the count is exact.
+    schema = get_schema(registry, EstimatedCount(threshold=0))
+    result = schema.execute(QUERY, context=info_with_context().context)
+    assert not result.errors
+    assert result.data["reporters"]["totalCount"] == 3
+    assert not result.data["reporters"]["totalCountIsApproximate"]
+
+
+def test_window_count(registry, info_with_context):
+    create_reporters()
+    schema = get_schema(registry, ExactCount, window_count=True)
+
+    # The count comes back with the page.
+    with assert_num_queries(1) as context:
+        result = schema.execute(QUERY, context=info_with_context().context)
+    assert not result.errors
+    assert "OVER ()" in context.captured_queries[0]["sql"]
+    assert result.data["reporters"]["totalCount"] == 3
+    assert not result.data["reporters"]["totalCountIsApproximate"]
+    assert result.data["reporters"]["edges"] == [{"node": {"firstName": "r0"}}]
+
+
+def test_window_count_empty_page(registry, info_with_context):
+    create_reporters()
+    schema = get_schema(registry, ExactCount, window_count=True)
+    query = """
+        query {
+          reporters(first: 1, after: "YXJyYXljb25uZWN0aW9uOjI=") {
+            totalCount
+            edges {
+              node {
+                firstName
+              }
+            }
+          }
+        }
+    """
+
+    # Past the last row, the count is a separate query.
+    with assert_num_queries(2):
+        result = schema.execute(query, context=info_with_context().context)
+    assert not result.errors
+    assert result.data["reporters"] == {"totalCount": 3, "edges": []}
+
+
+def test_window_count_distinct(registry, info_with_context):
+    create_reporters()
+    schema = get_schema(
+        registry, ExactCount, window_count=True, queryset=Reporter.objects.distinct()
+    )
+
+    # The window is computed before DISTINCT, count separately.
+    with assert_num_queries(2) as context:
+        result = schema.execute(QUERY, context=info_with_context().context)
+    assert not result.errors
+    assert "OVER" not in context.captured_queries[0]["sql"]
+    assert result.data["reporters"]["totalCount"] == 3
@@ -1,4 +1,7 @@
+from datetime import datetime
+
 import pytest
+import pytz
 
 from django.utils.functional import SimpleLazyObject
 
@@ -15,9 +18,11 @@ from graphene_djangorestframework.registry import Registry
 from graphene_djangorestframework.types import DjangoObjectType
 from graphene_djangorestframework.relay.node import DjangoNode
 from graphene_djangorestframework.relay.fields import DjangoConnectionField
+from graphene_djangorestframework.settings import graphene_settings
+from graphene_djangorestframework.testing import assert_num_queries
 
 
-from ..app.models import Reporter
+from ..app.models import Article, Reporter
 
 
 def test_django_connection_field(info_with_context):
@@ -226,3 +231,332 @@ def test_django_object_type_get_node_with_queryset(info_with_context):
     )
     assert not result.errors
     assert result.data == {"reporter": None}
+
+
+def get_related_connection_schema():
+    related_registry = Registry()
+
+    class ReporterType(DjangoObjectType):
+        class Meta:
+            model = Reporter
+            only_fields = ("id", "first_name", "articles")
+            interfaces = (DjangoNode,)
+            registry = related_registry
+
+    class ArticleType(DjangoObjectType):
+        class Meta:
+            model = Article
+            only_fields = ("id", "headline")
+            interfaces = (DjangoNode,)
+            registry = related_registry
+
+    class Query(graphene.ObjectType):
+        reporters = DjangoConnectionField(ReporterType)
+
+    return graphene.Schema(query=Query)
+
+
+def create_reporters_with_articles(reporters=3, articles=4):
+    for i in range(reporters):
+        reporter = Reporter.objects.create(
+            first_name="r{}".format(i), last_name="r", email="r@test.com"
+        )
+        for j in range(articles - i):
+            Article.objects.create(
+                headline="r{}a{}".format(i, j),
+                pub_date=datetime.now(),
+                pub_date_time=datetime.now(tz=pytz.UTC),
+                reporter=reporter,
+                editor=reporter,
+            )
+
+
+@pytest.mark.django_db
+def test_django_connection_field_batches_related_connections(info_with_context):
+    create_reporters_with_articles()
+    schema = get_related_connection_schema()
+    query = """
+        query {
+          reporters {
+            edges {
+              node {
+                firstName
+                articles(first: 2) {
+                  totalCount
+                  edges {
+                    node {
+                      headline
+                    }
+                  }
+                  pageInfo {
+                    hasNextPage
+                  }
+                }
+              }
+            }
+          }
+        }
+    """
+
+    # Reporters select, articles count and windowed select. The reporters
+    # connection doesn't select totalCount and isn't counted.
+    with assert_num_queries(3):
+        result = schema.execute(query, context=info_with_context().context)
+    assert not result.errors
+    assert [
+        (
+            edge["node"]["firstName"],
+            edge["node"]["articles"]["totalCount"],
+            [a["node"]["headline"] for a in edge["node"]["articles"]["edges"]],
+            edge["node"]["articles"]["pageInfo"]["hasNextPage"],
+        )
+        for edge in result.data["reporters"]["edges"]
+    ] == [
+        ("r0", 4, ["r0a0", "r0a1"], True),
+        ("r1", 3, ["r1a0", "r1a1"], True),
+        ("r2", 2, ["r2a0", "r2a1"], False),
+    ]
+
+
+@pytest.mark.django_db
+@pytest.mark.parametrize(
+    "arguments",
+    [
+        "",
+        "(first: 2)",
+        '(first: 2, after: "YXJyYXljb25uZWN0aW9uOjA=")',
+        "(last: 1)",
+        '(last: 2, before: "YXJyYXljb25uZWN0aW9uOjI=")',
+        '(first: 1, after: "YXJyYXljb25uZWN0aW9uOjI=")',
+    ],
+)
+def test_django_connection_field_batched_related_connections_match(
+    info_with_context, monkeypatch, arguments
+):
+    create_reporters_with_articles()
+    schema = get_related_connection_schema()
+    query = """
+        query {
+          reporters {
+            edges {
+              node {
+                articles%s {
+                  totalCount
+                  edges {
+                    cursor
+                    node {
+                      id
+                      headline
+                    }
+                  }
+                  pageInfo {
+                    hasNextPage
+                    hasPreviousPage
+                    startCursor
+                    endCursor
+                  }
+                }
+              }
+            }
+          }
+        }
+    """ % arguments
+
+    batched = schema.execute(query, context=info_with_context().context)
+    monkeypatch.setattr(graphene_settings, "RELAY_CONNECTION_BATCH_RELATED", False)
+    unbatched = schema.execute(query, context=info_with_context().context)
+
+    assert not batched.errors
+    assert not unbatched.errors
+    assert batched.data == unbatched.data
+
+
+def get_uncounted_connection_schema(chunk_size=None):
+    uncounted_registry = Registry()
+
+    class ArticleType(DjangoObjectType):
+        class Meta:
+            model = Article
+            only_fields = ("id", "headline")
+            interfaces = (DjangoNode,)
+            registry = uncounted_registry
+
+    class Query(graphene.ObjectType):
+        articles = DjangoConnectionField(ArticleType, chunk_size=chunk_size)
+
+    return graphene.Schema(query=Query)
+
+
+UNCOUNTED_PAGES = [
+    ("(first: 2)", ["r0a0", "r0a1"], True),
+    ('(first: 2, after: "YXJyYXljb25uZWN0aW9uOjE=")', ["r0a2", "r0a3"], False),
+    ('(first: 3, after: "YXJyYXljb25uZWN0aW9uOjE=")', ["r0a2", "r0a3"], False),
+    ('(first: 1, before: "YXJyYXljb25uZWN0aW9uOjE=")', ["r0a0"], False),
+    ('(first: 1, before: "YXJyYXljb25uZWN0aW9uOjI=")', ["r0a0"], True),
+    ('(after: "YXJyYXljb25uZWN0aW9uOjI=")', ["r0a3"], False),
+]
+
+
+@pytest.mark.django_db
+@pytest.mark.parametrize("arguments, headlines, has_next_page", UNCOUNTED_PAGES)
+def test_django_connection_field_skips_count(
+    info_with_context, arguments, headlines, has_next_page
+):
+    create_reporters_with_articles(reporters=1)
+    schema = get_uncounted_connection_schema()
+    query = """
+        query {
+          articles%s {
+            edges {
+              node {
+                headline
+              }
+            }
+            pageInfo {
+              hasNextPage
+            }
+          }
+        }
+    """ % arguments
+
+    # Only the page is selected, one row past it tells if another follows.
+    with assert_num_queries(1) as context:
+        result = schema.execute(query, context=info_with_context().context)
+    assert not result.errors
+    assert "COUNT" not in context.captured_queries[0]["sql"]
+    assert [
+        edge["node"]["headline"] for edge in result.data["articles"]["edges"]
+    ] == headlines
+    assert result.data["articles"]["pageInfo"]["hasNextPage"] == has_next_page
+
+
+@pytest.mark.django_db
+def test_django_connection_field_counts_last(info_with_context):
+    create_reporters_with_articles(reporters=1)
+    schema = get_uncounted_connection_schema()
+    query = """
+        query {
+          articles(last: 1) {
+            edges {
+              node {
+                headline
+              }
+            }
+            pageInfo {
+              hasPreviousPage
+            }
+          }
+        }
+    """
+
+    with assert_num_queries(2):
+        result = schema.execute(query, context=info_with_context().context)
+    assert not result.errors
+    assert result.data["articles"] == {
+        "edges": [{"node": {"headline": "r0a3"}}],
+        "pageInfo": {"hasPreviousPage": True},
+    }
+
+
+@pytest.mark.django_db
+def test_django_connection_field_encodes_selected_cursors(
+    info_with_context, monkeypatch
+):
+    from graphene_djangorestframework.relay import edges
+
+    encoded = []
+
+    def offset_to_cursor(offset):
+        encoded.append(offset)
+        return "cursor:{}".format(offset)
+
+    monkeypatch.setattr(edges, "offset_to_cursor", offset_to_cursor)
+    create_reporters_with_articles(reporters=1)
+    schema = get_uncounted_connection_schema()
+
+    result = schema.execute(
+        "query { articles(first: 3) { edges { node { headline } } } }",
+        context=info_with_context().context,
+    )
+    assert not result.errors
+    assert encoded == []
+
+    result = schema.execute(
+        "query { articles(first: 3) { edges { cursor } pageInfo { endCursor } } }",
+        context=info_with_context().context,
+    )
+    assert not result.errors
+    assert result.data["articles"]["pageInfo"] == {"endCursor": "cursor:2"}
+    assert encoded == [0, 1, 2, 2]
+
+
+@pytest.mark.django_db
+@pytest.mark.parametrize("arguments, headlines, has_next_page", UNCOUNTED_PAGES)
+def test_django_connection_field_chunk_size(
+    info_with_context, arguments, headlines, has_next_page
+):
+    create_reporters_with_articles(reporters=1)
+    schema = get_uncounted_connection_schema(chunk_size=1)
+    query = """
+        query {
+          articles%s {
+            edges {
+              cursor
+              node {
+                headline
+              }
+            }
+            pageInfo {
+              hasNextPage
+              startCursor
+              endCursor
+            }
+          }
+        }
+    """ % arguments
+
+    # The rows of the page are counted, then iterated.
+    with assert_num_queries(2):
+        result = schema.execute(query, context=info_with_context().context)
+    assert not result.errors
+    edges = result.data["articles"]["edges"]
+    assert [edge["node"]["headline"] for edge in edges] == headlines
+    page_info = result.data["articles"]["pageInfo"]
+    assert page_info["hasNextPage"] == has_next_page
+    assert page_info["startCursor"] == edges[0]["cursor"]
+    assert page_info["endCursor"] == edges[-1]["cursor"]
+
+    expected = get_uncounted_connection_schema().execute(
+        query, context=info_with_context().context
+    )
+    assert result.data == expected.data
+
+
+@pytest.mark.django_db
+def test_django_connection_field_chunk_size_last(info_with_context):
+    create_reporters_with_articles(reporters=1)
+    schema = get_uncounted_connection_schema(chunk_size=1)
+    query = """
+        query {
+          articles(last: 3) {
+            edges {
+              cursor
+              node {
+                headline
+              }
+            }
+            pageInfo {
+              hasPreviousPage
+              endCursor
+            }
+          }
+        }
+    """
+
+    result = schema.execute(query, context=info_with_context().context)
+    assert not result.errors
+    expected = get_uncounted_connection_schema().execute(
+        query, context=info_with_context().context
+    )
+    assert result.data == expected.data
+    assert len(result.data["articles"]["edges"]) == 3
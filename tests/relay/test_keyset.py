@@ -0,0 +1,200 @@
+from datetime import datetime
+
+import pytest
+import pytz
+
+from django.db.models import F
+
+from graphql_relay.utils import unbase64
+
+import graphene
+
+from graphene_djangorestframework.relay.fields import DjangoConnectionField
+from graphene_djangorestframework.relay.keyset import (
+    cursor_to_keyset,
+    get_keyset_ordering,
+    keyset_to_cursor,
+)
+from graphene_djangorestframework.testing import assert_num_queries
+
+from ..app.models import Article
+from ..schema import create_article, create_reporter, node_type
+
+pytestmark = pytest.mark.django_db
+
+QUERY = """
+    query Articles($first: Int, $last: Int, $after: String, $before: String) {
+      articles(first: $first, last: $last, after: $after, before: $before) {
+        totalCount
+        edges {
+          cursor
+          node {
+            headline
+          }
+        }
+        pageInfo {
+          hasNextPage
+          hasPreviousPage
+          startCursor
+          endCursor
+        }
+      }
+    }
+"""
+
+
+def get_schema(registry, queryset=None):
+    ArticleType = node_type(Article, registry, only_fields=("id", "headline"))
+
+    class Query(graphene.ObjectType):
+        articles = DjangoConnectionField(ArticleType, keyset_pagination=True)
+
+        def resolve_articles(self, info, **args):
+            return queryset
+
+    return graphene.Schema(query=Query)
+
+
+@pytest.fixture
+def articles():
+    reporter = create_reporter()
+    # Duplicated headlines need the primary key to break ties.
+    for headline in ["c", "a", "b", "a", "b"]:
+        create_article(reporter, headline=headline)
+    return list(Article.objects.order_by("headline", "pk"))
+
+
+def execute(schema, info_with_context, **variables):
+    result = schema.execute(
+        QUERY, context=info_with_context().context, variables=variables
+    )
+    assert not result.errors
+    return result.data["articles"]
+
+
+def test_keyset_ordering():
+    assert get_keyset_ordering(Article.objects.all()) == [
+        ("headline", False),
+        ("id", False),
+    ]
+    assert get_keyset_ordering(Article.objects.order_by("-pub_date", "-pk")) == [
+        ("pub_date", True),
+        ("id", True),
+    ]
+    assert get_keyset_ordering(Article.objects.order_by("reporter__first_name")) == [
+        ("reporter__first_name", False),
+        ("id", False),
+    ]
+    assert get_keyset_ordering(Article.objects.order_by("reporter_id")) == [
+        ("reporter_id", False),
+        ("id", False),
+    ]
+    # Random, nullable, relation and expression orderings can't be compared.
+    assert get_keyset_ordering(Article.objects.order_by("?")) is None
+    assert get_keyset_ordering(Article.objects.order_by("importance")) is None
+    assert get_keyset_ordering(Article.objects.order_by("reporter")) is None
+    assert get_keyset_ordering(Article.objects.order_by(F("headline").desc())) is None
+
+
+def test_keyset_cursor():
+    values = [datetime(2020, 1, 2, 3, 4, 5, 678901, tzinfo=pytz.UTC), "a", 1]
+    cursor = keyset_to_cursor(values)
+    assert cursor_to_keyset(cursor, 3) == [
+        "2020-01-02T03:04:05.678901+00:00",
+        "a",
+        1,
+    ]
+    assert cursor_to_keyset(cursor, 2) is None
+    assert cursor_to_keyset("YXJyYXljb25uZWN0aW9uOjA=", 3) is None
+    assert cursor_to_keyset("invalid", 3) is None
+    assert cursor_to_keyset(None, 3) is None
+
+
+def test_keyset_pagination_forward(registry, articles, info_with_context):
+    schema = get_schema(registry)
+
+    headlines = []
+    after = None
+    pages = 0
+    while True:
+        with assert_num_queries(2) as captured:
+            data = execute(schema, info_with_context, first=2, after=after)
+        assert "OFFSET" not in captured.captured_queries[-1]["sql"]
+        assert data["totalCount"] == 5
+        assert not data["pageInfo"]["hasPreviousPage"]
+        headlines.extend(edge["node"]["headline"] for edge in data["edges"])
+        pages += 1
+        if not data["pageInfo"]["hasNextPage"]:
+            break
+        after = data["pageInfo"]["endCursor"]
+
+    assert pages == 3
+    assert headlines == [article.headline for article in articles]
+    assert unbase64(after).startswith("keyset:")
+
+
+def test_keyset_pagination_backward(registry, articles, info_with_context):
+    schema = get_schema(registry)
+
+    edges = []
+    before = None
+    while True:
+        data = execute(schema, info_with_context, last=2, before=before)
+        assert not data["pageInfo"]["hasNextPage"]
+        edges = data["edges"] + edges
+        if not data["pageInfo"]["hasPreviousPage"]:
+            break
+        before = data["pageInfo"]["startCursor"]
+
+    assert [edge["node"]["headline"] for edge in edges] == [
+        article.headline for article in articles
+    ]
+
+    # Cursors are stable, the same rows follow a cursor going forward.
+    data = execute(schema, info_with_context, first=3, after=edges[0]["cursor"])
+    assert data["edges"] == edges[1:4]
+
+    data = execute(
+        schema,
+        info_with_context,
+        after=edges[0]["cursor"],
+        before=edges[4]["cursor"],
+    )
+    assert data["edges"] == edges[1:4]
+
+
+def test_keyset_pagination_first_and_last(registry, articles, info_with_context):
+    schema = get_schema(registry)
+
+    data = execute(schema, info_with_context, first=4, last=2)
+    assert [edge["node"]["headline"] for edge in data["edges"]] == [
+        article.headline for article in articles[2:4]
+    ]
+    assert data["pageInfo"]["hasNextPage"]
+    assert data["pageInfo"]["hasPreviousPage"]
+
+
+def test_keyset_pagination_descending(registry, articles, info_with_context):
+    articles = articles[::-1]
+    schema = get_schema(registry, Article.objects.order_by("-headline"))
+
+    first_page = execute(schema, info_with_context, first=2)
+    second_page = execute(
+        schema,
+        info_with_context,
+        first=3,
+        after=first_page["pageInfo"]["endCursor"],
+    )
+    edges = first_page["edges"] + second_page["edges"]
+    assert [edge["node"]["headline"] for edge in edges] == [
+        article.headline for article in articles
+    ]
+    assert not second_page["pageInfo"]["hasNextPage"]
+
+
+def test_keyset_pagination_fallback(registry, articles, info_with_context):
+    schema = get_schema(registry, Article.objects.order_by("importance"))
+
+    # Nullable orderings keep offset cursors.
+    data = execute(schema, info_with_context, first=2)
+    assert unbase64(data["pageInfo"]["endCursor"]) == "arrayconnection:1"
@@ -0,0 +1,103 @@
+import re
+
+import pytest
+
+from django.db import connection
+from django.test.utils import CaptureQueriesContext
+
+from graphene_djangorestframework.relay.fields import (
+    DjangoConnectionField,
+    combine_querysets,
+)
+
+from ..app.models import Film, Reporter
+
+pytestmark = pytest.mark.django_db
+
+
+def create_data():
+    documentary = Film.objects.create(genre="do")
+    other = Film.objects.create(genre="ot")
+    for i, last_name in enumerate(["Doe", "Roe", "Doe", "Poe"]):
+        reporter = Reporter.objects.create(
+            first_name="r{}".format(i), last_name=last_name, email="r@test.com"
+        )
+        if i != 3:
+            documentary.reporters.add(reporter)
+        if i % 2:
+            other.reporters.add(reporter)
+
+
+DEFAULT_QUERYSETS = [
+    lambda: Reporter.objects.all(),
+    lambda: Reporter.objects.filter(last_name="Doe"),
+    lambda: Reporter.objects.order_by("-first_name"),
+    lambda: Reporter.objects.filter(films__genre__in=["do", "ot"]).distinct(),
+    lambda: Reporter.objects.filter(films__genre="ot").order_by("-pk").distinct(),
+]
+
+QUERYSETS = [
+    lambda: Reporter.objects.order_by("pk"),
+    lambda: Reporter.objects.filter(first_name__in=["r0", "r1"]).order_by("pk"),
+    lambda: Reporter.objects.filter(films__genre="do").order_by("pk").distinct(),
+    lambda: Reporter.objects.filter(films__genre="do").order_by("pk"),
+]
+
+
+@pytest.mark.parametrize("default_queryset", DEFAULT_QUERYSETS)
+@pytest.mark.parametrize("queryset", QUERYSETS)
+def test_merge_querysets_results(default_queryset, queryset):
+    create_data()
+
+    merged = DjangoConnectionField.merge_querysets(default_queryset(), queryset())
+    combined = combine_querysets(default_queryset(), queryset())
+
+    assert list(merged) == list(combined)
+    assert merged.count() == combined.count()
+
+
+def test_merge_querysets_without_restrictions():
+    queryset = Reporter.objects.filter(first_name="r0")
+    merged = DjangoConnectionField.merge_querysets(Reporter.objects.all(), queryset)
+    assert str(merged.query) == str(queryset.query)
+
+
+def test_merge_querysets_multivalued_plan():
+    create_data()
+    default_queryset = Reporter.objects.filter(films__genre__in=["do", "ot"]).distinct()
+    queryset = Reporter.objects.filter(last_name="Doe")
+
+    combined = combine_querysets(default_queryset, queryset)
+    merged = DjangoConnectionField.merge_querysets(default_queryset, queryset)
+
+    # Combining joins the films and deduplicates the whole result, merging
+    # looks the reporters up by primary key from a subquery.
+    assert "DISTINCT" in str(combined.query)
+    assert "DISTINCT" not in str(merged.query)
+    combined_plan = combined.explain()
+    merged_plan = merged.explain()
+    # SQLite before 3.36 names tables as "SCAN TABLE <table>".
+    assert re.search(r"SCAN (TABLE )?app_reporter\b", combined_plan)
+    assert re.search(
+        r"SEARCH (TABLE )?app_reporter USING INTEGER PRIMARY KEY", merged_plan
+    )
+    assert "LIST SUBQUERY" in merged_plan
+    assert "LEFT-JOIN" not in merged_plan
+
+    with CaptureQueriesContext(connection) as context:
+        assert merged.count() == combined.count() == 2
+    assert "DISTINCT" in context.captured_queries[1]["sql"]
+    assert "DISTINCT" not in context.captured_queries[0]["sql"]
+
+
+def test_merge_querysets_multivalued_default():
+    create_data()
+    default_queryset = Reporter.objects.filter(films__genre__in=["do", "ot"])
+    queryset = Reporter.objects.order_by("pk")
+
+    # Reporters in both films are returned once, and the films are only
+    # joined in the subquery.
+    merged = DjangoConnectionField.merge_querysets(default_queryset, queryset)
+    assert [reporter.first_name for reporter in merged] == ["r0", "r1", "r2", "r3"]
+    assert "DISTINCT" not in str(merged.query)
+    assert "LEFT-JOIN" not in merged.explain()
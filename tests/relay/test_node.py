@@ -0,0 +1,180 @@
+import pytest
+
+from rest_framework.permissions import IsAuthenticated
+from rest_framework.throttling import UserRateThrottle
+
+from graphql_relay.node.node import to_global_id
+
+import graphene
+
+from graphene_djangorestframework.relay.node import DjangoNode
+from graphene_djangorestframework.testing import assert_num_queries
+
+from ..app.models import Article, Pet, Reporter
+from ..schema import create_article, create_reporters, node_type
+
+pytestmark = pytest.mark.django_db
+
+QUERY = """
+    query Nodes($ids: [ID!]!) {
+      nodes(ids: $ids) {
+        id
+        ... on ReporterType {
+          firstName
+        }
+        ... on ArticleType {
+          headline
+        }
+      }
+    }
+"""
+
+
+def get_schema(registry, reporter_queryset=None, **field_kwargs):
+    ReporterType = node_type(Reporter, registry, only_fields=("id", "first_name"))
+    if reporter_queryset is not None:
+        ReporterType.get_queryset = classmethod(lambda cls, info: reporter_queryset)
+
+    ArticleType = node_type(Article, registry, only_fields=("id", "headline"))
+    PetType = node_type(Pet, registry, only_fields=("id", "name"))
+
+    class Query(graphene.ObjectType):
+        node = DjangoNode.Field()
+        nodes = DjangoNode.NodesField(**field_kwargs)
+
+    return graphene.Schema(query=Query, types=[ReporterType, ArticleType, PetType])
+
+
+@pytest.fixture
+def reporters():
+    reporters = create_reporters(count=2)
+    create_article(reporters[0], headline="a0")
+    return reporters
+
+
+def test_nodes_field(registry, reporters, info_with_context):
+    r0_id = to_global_id("ReporterType", reporters[0].pk)
+    r1_id = to_global_id("ReporterType", reporters[1].pk)
+    article_id = to_global_id("ArticleType", Article.objects.get().pk)
+    ids = [
+        r1_id,
+        article_id,
+        to_global_id("ReporterType", 0),
+        "invalid",
+        r0_id,
+        to_global_id("ReporterType", "invalid"),
+        r1_id,
+    ]
+
+    schema = get_schema(registry)
+    # One query per type.
+    with assert_num_queries(2):
+        result = schema.execute(
+            QUERY, context=info_with_context().context, variables={"ids": ids}
+        )
+    assert not result.errors
+    assert result.data == {
+        "nodes": [
+            {"id": r1_id, "firstName": "r1"},
+            {"id": article_id, "headline": "a0"},
+            None,
+            None,
+            {"id": r0_id, "firstName": "r0"},
+            None,
+            {"id": r1_id, "firstName": "r1"},
+        ]
+    }
+
+
+def test_nodes_field_with_queryset(registry, reporters, info_with_context):
+    r0_id = to_global_id("ReporterType", reporters[0].pk)
+    r1_id = to_global_id("ReporterType", reporters[1].pk)
+
+    schema = get_schema(
+        registry, reporter_queryset=Reporter.objects.filter(pk=reporters[0].pk)
+    )
+    result = schema.execute(
+        QUERY, context=info_with_context().context, variables={"ids": [r0_id, r1_id]}
+    )
+    assert not result.errors
+    assert result.data == {"nodes": [{"id": r0_id, "firstName": "r0"}, None]}
+
+
+def test_nodes_field_identity_map(registry, reporters, info_with_context):
+    r0_id = to_global_id("ReporterType", reporters[0].pk)
+    r1_id = to_global_id("ReporterType", reporters[1].pk)
+    query = """
+        query Nodes($id: ID!, $ids: [ID!]!) {
+          reporter: node(id: $id) {
+            id
+          }
+          nodes(ids: $ids) {
+            id
+          }
+        }
+    """
+
+    schema = get_schema(registry)
+    context = info_with_context().context
+    # Only the reporter that wasn't loaded by `node` is queried.
+    with assert_num_queries(2) as captured:
+        result = schema.execute(
+            query, context=context, variables={"id": r0_id, "ids": [r0_id, r1_id]}
+        )
+    assert not result.errors
+    assert result.data == {
+        "reporter": {"id": r0_id},
+        "nodes": [{"id": r0_id}, {"id": r1_id}],
+    }
+    assert captured.captured_queries[1]["sql"].endswith(
+        "IN ({})".format(reporters[1].pk)
+    )
+
+
+@pytest.mark.parametrize("ids", [[], ["UmVwb3J0ZXJUeXBlOjE="]])
+def test_nodes_field_with_permission_classes(registry, info_with_context, ids):
+    schema = get_schema(registry, permission_classes=[IsAuthenticated])
+    result = schema.execute(
+        QUERY, context=info_with_context().context, variables={"ids": ids}
+    )
+    assert len(result.errors) == 1
+    assert str(result.errors[0]) == "You do not have permission to perform this action."
+    assert result.data is None
+
+
+def test_nodes_field_with_throttle_classes(
+    registry, reporters, info_with_context, info_with_context_anon
+):
+    class TestThrottle(UserRateThrottle):
+        scope = "test_nodes_field_with_throttle_classes"
+
+        def get_rate(self):
+            return "2/minute"
+
+    pet = Pet.objects.create(name="p", age=1)
+    ids = [
+        to_global_id("ReporterType", reporters[0].pk),
+        to_global_id("ReporterType", reporters[1].pk),
+        to_global_id("ArticleType", Article.objects.get().pk),
+        to_global_id("PetType", pet.pk),
+    ]
+
+    schema = get_schema(registry, throttle_classes=[TestThrottle])
+
+    def execute():
+        return schema.execute(
+            QUERY,
+            context=info_with_context(user=info_with_context_anon()).context,
+            variables={"ids": ids},
+        )
+
+    # Checked once per call, whatever the number of ids and types.
+    assert execute().errors is None
+    assert execute().errors is None
+
+    result = execute()
+    assert len(result.errors) == 1
+    assert (
+        str(result.errors[0])
+        == "Request was throttled. Expected available in 60 seconds."
+    )
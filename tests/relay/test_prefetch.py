@@ -0,0 +1,174 @@
+import pytest
+
+import graphene
+
+from graphene_djangorestframework.fields import DjangoListField
+from graphene_djangorestframework.relay.fields import DjangoConnectionField
+from graphene_djangorestframework.relay.node import DjangoNode
+from graphene_djangorestframework.testing import assert_num_queries
+from graphene_djangorestframework.types import DjangoObjectType
+
+from ..app.models import Article, Film, Reporter
+from ..schema import create_article, create_reporter, node_type
+
+# Connections are prefetched by the optimizer.
+pytestmark = [pytest.mark.django_db, pytest.mark.usefixtures("optimize_queries")]
+
+
+@pytest.fixture
+def films():
+    films = [Film.objects.create(), Film.objects.create()]
+    for i, last_name in enumerate(["Doe", "Roe", "Doe"]):
+        reporter = create_reporter(first_name="r{}".format(i), last_name=last_name)
+        for j in range(2):
+            create_article(reporter, headline="r{}a{}".format(i, j))
+        for film in films:
+            film.reporters.add(reporter)
+    return films
+
+
+def get_schema(registry, reporter_queryset=None, films_on=None, films_queryset=None):
+    ReporterType = node_type(
+        Reporter, registry, only_fields=("id", "first_name", "articles")
+    )
+    if reporter_queryset is not None:
+        ReporterType.get_queryset = classmethod(lambda cls, info: reporter_queryset)
+
+    node_type(Article, registry, only_fields=("id", "headline"))
+
+    class FilmType(DjangoObjectType, registry=registry):
+        reporters = DjangoConnectionField(ReporterType, on=films_on)
+
+        class Meta:
+            model = Film
+            only_fields = ("id", "reporters")
+            interfaces = (DjangoNode,)
+
+    class Query(graphene.ObjectType):
+        films = DjangoListField(FilmType)
+        reporters = DjangoListField(ReporterType)
+
+        def resolve_films(self, info):
+            if films_queryset is not None:
+                return films_queryset
+            return Film.objects.order_by("pk")
+
+        def resolve_reporters(self, info):
+            return Reporter.objects.order_by("pk").prefetch_related("articles")
+
+    return graphene.Schema(query=Query)
+
+
+FILMS_QUERY = """
+    query {
+      films {
+        reporters(first: 2) {
+          totalCount
+          edges {
+            node {
+              firstName
+            }
+          }
+          pageInfo {
+            hasNextPage
+          }
+        }
+      }
+    }
+"""
+
+
+def test_prefetched_connection(registry, films, info_with_context):
+    schema = get_schema(registry)
+
+    # Films and their reporters, paginated from the prefetched rows.
+    with assert_num_queries(2):
+        result = schema.execute(FILMS_QUERY, context=info_with_context().context)
+    assert not result.errors
+    assert result.data["films"] == [
+        {
+            "reporters": {
+                "totalCount": 3,
+                "edges": [
+                    {"node": {"firstName": "r0"}},
+                    {"node": {"firstName": "r1"}},
+                ],
+                "pageInfo": {"hasNextPage": True},
+            }
+        }
+    ] * 2
+
+
+def test_prefetched_connection_on_manager(registry, films, info_with_context):
+    schema = get_schema(registry, films_on="doe_objects")
+
+    # The prefetch goes through the `on` manager.
+    with assert_num_queries(2):
+        result = schema.execute(FILMS_QUERY, context=info_with_context().context)
+    assert not result.errors
+    assert result.data["films"][0]["reporters"] == {
+        "totalCount": 2,
+        "edges": [{"node": {"firstName": "r0"}}, {"node": {"firstName": "r2"}}],
+        "pageInfo": {"hasNextPage": False},
+    }
+
+
+def test_prefetched_connection_with_queryset(registry, films, info_with_context):
+    schema = get_schema(
+        registry, reporter_queryset=Reporter.objects.filter(last_name="Roe")
+    )
+
+    with assert_num_queries(2):
+        result = schema.execute(FILMS_QUERY, context=info_with_context().context)
+    assert not result.errors
+    assert result.data["films"][0]["reporters"]["edges"] == [
+        {"node": {"firstName": "r1"}}
+    ]
+
+
+def test_manually_prefetched_connection(registry, films, info_with_context):
+    schema = get_schema(registry)
+    query = """
+        query {
+          reporters {
+            articles(first: 1) {
+              edges {
+                node {
+                  headline
+                }
+              }
+            }
+          }
+        }
+    """
+
+    # Reporters and the articles prefetched by the resolver.
+    with assert_num_queries(2):
+        result = schema.execute(query, context=info_with_context().context)
+    assert not result.errors
+    assert [
+        reporter["articles"]["edges"] for reporter in result.data["reporters"]
+    ] == [
+        [{"node": {"headline": "r0a0"}}],
+        [{"node": {"headline": "r1a0"}}],
+        [{"node": {"headline": "r2a0"}}],
+    ]
+
+
+def test_manually_prefetched_connection_with_queryset(
+    registry, films, info_with_context
+):
+    schema = get_schema(
+        registry,
+        reporter_queryset=Reporter.objects.filter(last_name="Roe"),
+        films_queryset=Film.objects.order_by("pk").prefetch_related("reporters"),
+    )
+
+    # Rows prefetched without the type's get_queryset aren't used, every
+    # film queries its page and count.
+    with assert_num_queries(6):
+        result = schema.execute(FILMS_QUERY, context=info_with_context().context)
+    assert not result.errors
+    assert result.data["films"][0]["reporters"]["edges"] == [
+        {"node": {"firstName": "r1"}}
+    ]
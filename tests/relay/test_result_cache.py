@@ -0,0 +1,175 @@
+import pytest
+
+from django.core.cache import cache
+
+from graphql_relay.node.node import to_global_id
+
+import graphene
+
+from graphene_djangorestframework.relay.cache import ResultCache
+from graphene_djangorestframework.relay.fields import DjangoConnectionField
+from graphene_djangorestframework.testing import assert_num_queries
+from graphene_djangorestframework.utils import DJANGO_FILTER_INSTALLED
+
+from ..app.models import CNNReporter, Film, Reporter
+from ..schema import create_reporter, node_type
+
+pytestmark = pytest.mark.django_db
+
+if DJANGO_FILTER_INSTALLED:
+    from graphene_djangorestframework.filter import DjangoFilterConnectionField
+
+
+@pytest.fixture(autouse=True)
+def clear_cache():
+    cache.clear()
+    yield
+    cache.clear()
+
+
+def get_schema(registry, field_class=DjangoConnectionField):
+    ReporterType = node_type(
+        Reporter,
+        registry,
+        only_fields=("id", "first_name", "last_name"),
+        filter_fields=("first_name", "last_name", "films"),
+    )
+
+    class Query(graphene.ObjectType):
+        reporters = field_class(ReporterType, result_cache=ResultCache)
+
+    return graphene.Schema(query=Query)
+
+
+@pytest.fixture
+def reporters():
+    return [
+        create_reporter(first_name="r{}".format(i), last_name="x" if i % 2 else "y")
+        for i in range(5)
+    ]
+
+
+QUERY = """
+    query {
+      reporters(first: 2, after: "YXJyYXljb25uZWN0aW9uOjA=") {
+        totalCount
+        pageInfo {
+          hasNextPage
+          hasPreviousPage
+          endCursor
+        }
+        edges {
+          cursor
+          node {
+            firstName
+          }
+        }
+      }
+    }
+"""
+
+
+def test_result_cache_hit(registry, reporters, info_with_context):
+    schema = get_schema(registry)
+
+    # The page and its count.
+    with assert_num_queries(2):
+        result = schema.execute(QUERY, context=info_with_context().context)
+    assert not result.errors
+
+    with assert_num_queries(1) as context:
+        cached = schema.execute(QUERY, context=info_with_context().context)
+    assert not cached.errors
+    assert cached.data == result.data
+    assert result.data["reporters"]["totalCount"] == 5
+    assert [
+        edge["node"]["firstName"] for edge in result.data["reporters"]["edges"]
+    ] == ["r1", "r2"]
+    sql = context.captured_queries[0]["sql"]
+    assert " IN (" in sql and "LIMIT" not in sql
+
+    # Other pages are cached separately.
+    with assert_num_queries(1):
+        result = schema.execute(
+            "query { reporters(first: 1) { edges { node { firstName } } } }",
+            context=info_with_context().context,
+        )
+    assert result.data["reporters"]["edges"] == [{"node": {"firstName": "r0"}}]
+
+
+def test_result_cache_invalidation(registry, reporters, info_with_context):
+    schema = get_schema(registry)
+    schema.execute(QUERY, context=info_with_context().context)
+
+    Reporter.objects.filter(first_name="r1").get().delete()
+    with assert_num_queries(2):
+        result = schema.execute(QUERY, context=info_with_context().context)
+    assert result.data["reporters"]["totalCount"] == 4
+
+    create_reporter(first_name="r5", last_name="x")
+    with assert_num_queries(2):
+        result = schema.execute(QUERY, context=info_with_context().context)
+    assert result.data["reporters"]["totalCount"] == 5
+
+    # Saving through a proxy model invalidates the pages of its table.
+    CNNReporter.objects.create(first_name="r6", last_name="x", email="r@test.com")
+    with assert_num_queries(2):
+        result = schema.execute(QUERY, context=info_with_context().context)
+    assert result.data["reporters"]["totalCount"] == 6
+
+
+@pytest.mark.skipif(not DJANGO_FILTER_INSTALLED, reason="django_filters not installed")
+def test_result_cache_filter_arguments(registry, reporters, info_with_context):
+    film = Film.objects.create(genre="do")
+    film.reporters.add(*Reporter.objects.filter(last_name="x"))
+    schema = get_schema(registry, DjangoFilterConnectionField)
+
+    query = """
+        query {
+          reporters(%s) {
+            edges {
+              node {
+                firstName
+              }
+            }
+          }
+        }
+    """
+    first = query % 'first: 5, lastName: "x", firstName: "r1"'
+    second = query % 'firstName: "r1", first: 5, lastName: "x"'
+    result = schema.execute(first, context=info_with_context().context)
+    assert result.data["reporters"]["edges"] == [{"node": {"firstName": "r1"}}]
+    # The arguments filter the same way, in any order.
+    with assert_num_queries(1):
+        cached = schema.execute(second, context=info_with_context().context)
+    assert cached.data == result.data
+
+    # Joined tables invalidate the pages too.
+    films = query % 'first: 5, films: ["{}"]'.format(to_global_id("FilmType", film.pk))
+    result = schema.execute(films, context=info_with_context().context)
+    assert len(result.data["reporters"]["edges"]) == 2
+    film.reporters.add(Reporter.objects.get(first_name="r0"))
+    result = schema.execute(films, context=info_with_context().context)
+    assert len(result.data["reporters"]["edges"]) == 3
+
+
+def test_result_cache_sliced_queryset(registry, reporters, info_with_context):
+    ReporterType = node_type(Reporter, registry, only_fields=("id", "first_name"))
+
+    class Query(graphene.ObjectType):
+        reporters = DjangoConnectionField(ReporterType, result_cache=ResultCache)
+
+        def resolve_reporters(self, info, **args):
+            return Reporter.objects.order_by("pk")[:3]
+
+    schema = graphene.Schema(query=Query)
+    query = "query { reporters(first: 2) { edges { node { firstName } } } }"
+
+    # Sliced querysets can't be refetched by primary key, so they aren't cached.
+    for _ in range(2):
+        result = schema.execute(query, context=info_with_context().context)
+        assert not result.errors
+        assert result.data["reporters"]["edges"] == [
+            {"node": {"firstName": "r0"}},
+            {"node": {"firstName": "r1"}},
+        ]
@@ -0,0 +1,132 @@
+import itertools
+
+import graphene
+
+from graphene import relay
+
+from graphene_djangorestframework.relay.fields import DjangoConnectionField
+from graphene_djangorestframework.relay.sequences import LazySequence
+
+from ..app.models import Reporter
+from ..schema import node_type
+
+
+class ReporterHits(LazySequence):
+    def __init__(self, size, countable=True):
+        self.size = size
+        self.countable = countable
+        self.slices = []
+        self.counts = 0
+
+    def slice(self, start, stop):
+        self.slices.append((start, stop))
+        stop = self.size if stop is None else min(stop, self.size)
+        return [
+            Reporter(id=i, first_name="r{}".format(i)) for i in range(start, stop)
+        ]
+
+    def count(self):
+        if not self.countable:
+            return super(ReporterHits, self).count()
+        self.counts += 1
+        return self.size
+
+
+def get_schema(registry, reporters):
+    ReporterType = node_type(
+        Reporter, registry, only_fields=("id", "first_name"), interfaces=(relay.Node,)
+    )
+
+    class Query(graphene.ObjectType):
+        reporters = DjangoConnectionField(ReporterType)
+
+        def resolve_reporters(self, info, **args):
+            return reporters
+
+    return graphene.Schema(query=Query)
+
+
+def execute(registry, reporters, arguments, selection, info_with_context):
+    query = "query { reporters%s { %s } }" % (arguments, selection)
+    schema = get_schema(registry, reporters)
+    result = schema.execute(query, context=info_with_context().context)
+    assert not result.errors
+    return result.data["reporters"]
+
+
+NAMES = "edges { node { firstName } } pageInfo { hasNextPage hasPreviousPage }"
+
+
+def get_names(data):
+    return [edge["node"]["firstName"] for edge in data["edges"]]
+
+
+def test_lazy_sequence_fetches_page(registry, info_with_context):
+    hits = ReporterHits(100)
+    data = execute(
+        registry,
+        hits,
+        '(first: 2, after: "YXJyYXljb25uZWN0aW9uOjk=")',
+        NAMES,
+        info_with_context,
+    )
+    assert get_names(data) == ["r10", "r11"]
+    assert data["pageInfo"] == {"hasNextPage": True, "hasPreviousPage": False}
+    # One result past the page tells whether another follows.
+    assert hits.slices == [(10, 13)]
+    assert hits.counts == 0
+
+
+def test_lazy_sequence_last(registry, info_with_context):
+    hits = ReporterHits(100)
+    data = execute(registry, hits, "(last: 2)", NAMES, info_with_context)
+    assert get_names(data) == ["r98", "r99"]
+    assert data["pageInfo"] == {"hasNextPage": False, "hasPreviousPage": True}
+    assert hits.slices == [(98, 100)]
+    assert hits.counts == 1
+
+
+def test_lazy_sequence_total_count(registry, info_with_context):
+    hits = ReporterHits(100)
+    data = execute(registry, hits, "(first: 1)", "totalCount", info_with_context)
+    assert data == {"totalCount": 100}
+    assert hits.counts == 1
+
+    # Without a count hook the whole sequence is counted.
+    hits = ReporterHits(5, countable=False)
+    data = execute(registry, hits, "(first: 1)", "totalCount", info_with_context)
+    assert data == {"totalCount": 5}
+    assert hits.slices == [(0, 2), (0, None)]
+
+
+def test_generator_fetches_page(registry, info_with_context):
+    consumed = []
+
+    def reporters():
+        for i in itertools.count():
+            consumed.append(i)
+            yield Reporter(id=i, first_name="r{}".format(i))
+
+    data = execute(
+        registry,
+        reporters(),
+        '(first: 2, after: "YXJyYXljb25uZWN0aW9uOjE=")',
+        NAMES,
+        info_with_context,
+    )
+    assert get_names(data) == ["r2", "r3"]
+    assert data["pageInfo"] == {"hasNextPage": True, "hasPreviousPage": False}
+    assert consumed == [0, 1, 2, 3, 4]
+
+
+def test_generator_total_count_and_last(registry, info_with_context):
+    def reporters():
+        for i in range(5):
+            yield Reporter(id=i, first_name="r{}".format(i))
+
+    data = execute(registry, reporters(), "(first: 2)", "totalCount", info_with_context)
+    assert data == {"totalCount": 5}
+
+    data = execute(registry, reporters(), "(last: 2)", NAMES, info_with_context)
+    assert get_names(data) == ["r3", "r4"]
+    assert data["pageInfo"] == {"hasNextPage": False, "hasPreviousPage": True}
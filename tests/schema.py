@@ -1,9 +1,14 @@
+from datetime import date, datetime
+
+import pytz
+
 import graphene
 from graphene import ObjectType, Schema
 
+from graphene_djangorestframework.relay.node import DjangoNode
 from graphene_djangorestframework.types import DjangoObjectType
 
-from .app.models import Reporter
+from .app.models import Article, Reporter
 
 
 class ReporterType(DjangoObjectType):
@@ -49,3 +54,41 @@ class MutationRoot(ObjectType):
 
 
 schema = Schema(query=QueryRoot, mutation=MutationRoot)
+
+
+def node_type(model, registry, **meta):
+    """
+    Create a DjangoObjectType of the model implementing DjangoNode, named
+    after the model, with the given Meta options.
+    """
+    meta.setdefault("interfaces", (DjangoNode,))
+    meta.update(model=model, registry=registry)
+    return type(
+        str("{}Type".format(model.__name__)),
+        (DjangoObjectType,),
+        {"Meta": type(str("Meta"), (), meta)},
+    )
+
+
+def create_reporter(**fields):
+    fields.setdefault("first_name", "r")
+    fields.setdefault("last_name", "r")
+    fields.setdefault("email", "r@test.com")
+    return Reporter.objects.create(**fields)
+
+
+def create_reporters(count=3, **fields):
+    """
+    Create reporters named r0, r1... in that order.
+    """
+    return [
+        create_reporter(first_name="r{}".format(i), **fields) for i in range(count)
+    ]
+
+
+def create_article(reporter, **fields):
+    fields.setdefault("headline", "a")
+    fields.setdefault("pub_date", date(2020, 1, 1))
+    fields.setdefault("pub_date_time", datetime(2020, 1, 1, tzinfo=pytz.UTC))
+    fields.setdefault("editor", reporter)
+    return Article.objects.create(reporter=reporter, **fields)
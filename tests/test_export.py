@@ -0,0 +1,121 @@
+import json
+
+import pytest
+
+import graphene
+
+from rest_framework.permissions import BasePermission
+from rest_framework.test import APIRequestFactory
+
+from graphene_djangorestframework.relay.fields import DjangoConnectionField
+from graphene_djangorestframework.testing import assert_num_queries
+from graphene_djangorestframework.views import GraphQLExportView
+
+from .app.models import Reporter
+from .schema import create_reporters, node_type
+
+pytestmark = pytest.mark.django_db
+
+
+class CountingPermission(BasePermission):
+    checks = 0
+
+    def has_permission(self, request, view):
+        CountingPermission.checks += 1
+        return True
+
+
+@pytest.fixture
+def schema(registry):
+    ReporterType = node_type(Reporter, registry, only_fields=("id", "first_name"))
+
+    class Query(graphene.ObjectType):
+        reporters = DjangoConnectionField(
+            ReporterType, permission_classes=[CountingPermission], max_limit=1
+        )
+
+    return graphene.Schema(query=Query)
+
+
+@pytest.fixture
+def reporters():
+    return create_reporters(count=5)
+
+
+def export(schema, query, chunk_size=2, max_rows=None, **kwargs):
+    class ExportView(GraphQLExportView):
+        graphene_export_chunk_size = chunk_size
+        graphene_export_max_rows = max_rows
+
+    request = APIRequestFactory().post(
+        "/graphql/export/", {"query": query}, format="json"
+    )
+    return ExportView.as_view(graphene_schema=schema, **kwargs)(request)
+
+
+def read_lines(response):
+    content = b"".join(response.streaming_content).decode("utf-8")
+    return [json.loads(line) for line in content.splitlines()]
+
+
+QUERY = "query { reporters { edges { node { firstName } } } }"
+
+
+def test_export_streams_every_node(schema, reporters):
+    CountingPermission.checks = 0
+
+    # Pages of two rows, each fetching one more to tell if another follows.
+    with assert_num_queries(3):
+        response = export(schema, QUERY)
+        assert response.status_code == 200
+        assert response["Content-Type"] == "application/x-ndjson"
+        lines = read_lines(response)
+
+    assert lines == [{"firstName": "r{}".format(i)} for i in range(5)]
+    assert CountingPermission.checks == 1
+
+
+def test_export_ignores_pagination_arguments(schema, reporters):
+    response = export(
+        schema,
+        'query { reporters(last: 1, after: "YXJyYXljb25uZWN0aW9uOjE=") '
+        "{ edges { node { firstName } } } }"
+    )
+    assert len(read_lines(response)) == 5
+
+
+def test_export_max_rows(schema, reporters):
+    response = export(schema, QUERY, max_rows=3)
+    lines = read_lines(response)
+    assert lines[:3] == [{"firstName": "r{}".format(i)} for i in range(3)]
+    assert lines[3] == {
+        "errors": [{"message": "Export stopped after the limit of 3 rows."}]
+    }
+
+    response = export(schema, QUERY, max_rows=5)
+    assert len(read_lines(response)) == 5
+
+
+def test_export_rejects_mutations(schema):
+    response = export(schema, "mutation { reporters }")
+    assert response.status_code == 400
+    response.render()
+    assert json.loads(response.content) == {
+        "errors": [{"message": "Only query operations can be exported."}]
+    }
+
+
+def test_export_requires_a_single_connection(schema):
+    response = export(
+        schema,
+        "query { reporters { edges { node { firstName } } } "
+        "other: reporters { edges { node { firstName } } } }"
+    )
+    assert response.status_code == 400
+
+
+def test_export_reports_errors(schema):
+    response = export(schema, "query { reporters { edges { node { lastName } } } }")
+    assert response.status_code == 400
+    response.render()
+    assert "errors" in json.loads(response.content)
@@ -1,3 +1,8 @@
+from datetime import datetime
+
+import pytest
+import pytz
+
 from django.utils.functional import SimpleLazyObject
 
 from rest_framework.permissions import IsAuthenticated
@@ -7,8 +12,9 @@ import graphene
 from graphene_djangorestframework.registry import Registry
 from graphene_djangorestframework.types import DjangoObjectType
 from graphene_djangorestframework.fields import DjangoField, DjangoListField
+from graphene_djangorestframework.testing import assert_num_queries
 
-from .app.models import Reporter
+from .app.models import Article, Reporter
 
 
 def test_django_field(info_with_context):
@@ -233,3 +239,64 @@ def test_django_list_field_with_permission_classes_anon(
     assert len(result.errors) == 1
     assert str(result.errors[0]) == "You do not have permission to perform this action."
     assert result.data == {"reporters": None}
+
+
+@pytest.mark.django_db
+@pytest.mark.parametrize("chunk_size, num_queries", [(None, 2), (2, 3), (5, 2)])
+def test_django_list_field_chunk_size(
+    optimize_queries, info_with_context, chunk_size, num_queries
+):
+    chunk_registry = Registry()
+
+    class ArticleType(DjangoObjectType):
+        class Meta:
+            model = Article
+            only_fields = ("id", "headline")
+            registry = chunk_registry
+
+    class ReporterType(DjangoObjectType):
+        class Meta:
+            model = Reporter
+            only_fields = ("id", "first_name", "articles")
+            registry = chunk_registry
+
+    class Query(graphene.ObjectType):
+        reporters = DjangoListField(ReporterType, chunk_size=chunk_size)
+
+        def resolve_reporters(self, info):
+            return Reporter.objects.order_by("pk")
+
+    for i in range(3):
+        reporter = Reporter.objects.create(
+            first_name="r{}".format(i), last_name="r", email="r@test.com"
+        )
+        Article.objects.create(
+            headline="a{}".format(i),
+            pub_date=datetime.now(),
+            pub_date_time=datetime.now(tz=pytz.UTC),
+            reporter=reporter,
+            editor=reporter,
+        )
+
+    schema = graphene.Schema(query=Query)
+    query = """
+        query {
+          reporters {
+            firstName
+            articles {
+              headline
+            }
+          }
+        }
+    """
+    # The articles are prefetched for every chunk of reporters.
+    with assert_num_queries(num_queries):
+        result = schema.execute(query, context=info_with_context().context)
+    assert not result.errors
+    assert result.data == {
+        "reporters": [
+            {"firstName": "r0", "articles": [{"headline": "a0"}]},
+            {"firstName": "r1", "articles": [{"headline": "a1"}]},
+            {"firstName": "r2", "articles": [{"headline": "a2"}]},
+        ]
+    }
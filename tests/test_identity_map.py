@@ -0,0 +1,237 @@
+import pytest
+
+import graphene
+
+from graphql_relay.node.node import to_global_id
+
+from graphene_djangorestframework.identity_map import IdentityMap
+from graphene_djangorestframework.fields import DjangoListField
+from graphene_djangorestframework.relay.node import DjangoNode
+from graphene_djangorestframework.settings import graphene_settings
+from graphene_djangorestframework.testing import assert_num_queries
+
+from .app.models import Article, CNNReporter, Pet, Reporter
+from .schema import create_article, create_reporter, node_type
+
+pytestmark = pytest.mark.django_db
+
+
+def get_schema(registry, reporter_queryset=None):
+    ReporterType = node_type(Reporter, registry, only_fields=("id", "first_name"))
+    if reporter_queryset is not None:
+        ReporterType.get_queryset = classmethod(lambda cls, info: reporter_queryset)
+
+    PetType = node_type(Pet, registry)
+    ArticleType = node_type(
+        Article, registry, only_fields=("id", "headline", "reporter"), interfaces=()
+    )
+
+    class Query(graphene.ObjectType):
+        reporter = DjangoNode.Field(ReporterType)
+        pet = DjangoNode.Field(PetType)
+        articles = DjangoListField(ArticleType)
+
+        def resolve_articles(self, info):
+            return Article.objects.all()
+
+    return graphene.Schema(query=Query)
+
+
+@pytest.fixture
+def schema(registry):
+    return get_schema(registry)
+
+
+@pytest.fixture
+def reporter():
+    reporter = create_reporter()
+    for i in range(3):
+        create_article(reporter, headline="a{}".format(i))
+    return reporter
+
+
+def test_identity_map_get_node(schema, reporter, info_with_context):
+    query = """
+        query Reporter($id: ID!) {
+          first: reporter(id: $id) {
+            firstName
+          }
+          second: reporter(id: $id) {
+            firstName
+          }
+        }
+    """
+
+    context = info_with_context().context
+    with assert_num_queries(1):
+        result = schema.execute(
+            query,
+            context=context,
+            variables={"id": to_global_id("ReporterType", reporter.pk)},
+        )
+    assert not result.errors
+    assert result.data == {"first": {"firstName": "r"}, "second": {"firstName": "r"}}
+    assert len(context["identity_map"]) == 1
+
+
+def test_identity_map_get_node_with_deferred_fields(
+    optimize_queries, schema, info_with_context
+):
+    pet = Pet.objects.create(name="Lassie", age=3)
+    query = """
+        query Pet($id: ID!) {
+          first: pet(id: $id) {
+            name
+          }
+          second: pet(id: $id) {
+            name
+          }
+          third: pet(id: $id) {
+            name
+            age
+          }
+          fourth: pet(id: $id) {
+            age
+          }
+        }
+    """
+
+    # Pets are loaded with only the selected columns, the second lookup
+    # shares the row of the first, the third needs the age as well.
+    context = info_with_context().context
+    with assert_num_queries(2) as queries:
+        result = schema.execute(
+            query, context=context, variables={"id": to_global_id("PetType", pet.pk)}
+        )
+    assert not result.errors
+    assert result.data == {
+        "first": {"name": "Lassie"},
+        "second": {"name": "Lassie"},
+        "third": {"name": "Lassie", "age": 3},
+        "fourth": {"age": 3},
+    }
+    assert '"app_pet"."age"' not in queries.captured_queries[0]["sql"]
+    assert context["identity_map"].get(Pet, pet.pk).get_deferred_fields() == set()
+
+
+def test_identity_map_get_node_with_queryset(registry, reporter, info_with_context):
+    query = """
+        query Reporter($id: ID!) {
+          first: reporter(id: $id) {
+            firstName
+          }
+          second: reporter(id: $id) {
+            firstName
+          }
+        }
+    """
+
+    # Types with get_queryset always query, the identity map may hold
+    # instances get_queryset would filter out.
+    schema = get_schema(registry, reporter_queryset=Reporter.objects.all())
+    with assert_num_queries(2):
+        result = schema.execute(
+            query,
+            context=info_with_context().context,
+            variables={"id": to_global_id("ReporterType", reporter.pk)},
+        )
+    assert not result.errors
+
+
+def test_identity_map_foreign_keys(schema, reporter, info_with_context, monkeypatch):
+    monkeypatch.setattr(graphene_settings, "OPTIMIZE_QUERIES", False)
+    query = """
+        query {
+          articles {
+            headline
+            reporter {
+              firstName
+            }
+          }
+        }
+    """
+
+    # Articles and the reporter they all share.
+    with assert_num_queries(2):
+        result = schema.execute(query, context=info_with_context().context)
+    assert not result.errors
+    assert result.data == {
+        "articles": [
+            {"headline": "a0", "reporter": {"firstName": "r"}},
+            {"headline": "a1", "reporter": {"firstName": "r"}},
+            {"headline": "a2", "reporter": {"firstName": "r"}},
+        ]
+    }
+
+
+def test_identity_map_foreign_keys_with_default_manager(
+    schema, reporter, info_with_context, monkeypatch
+):
+    # Only Does are visible, foreign keys are still traversed to others.
+    monkeypatch.setitem(
+        Reporter._meta.__dict__, "default_manager", Reporter.doe_objects
+    )
+    query = """
+        query Reporter($id: ID!) {
+          articles {
+            reporter {
+              firstName
+            }
+          }
+          reporter(id: $id) {
+            firstName
+          }
+        }
+    """
+
+    result = schema.execute(
+        query,
+        context=info_with_context().context,
+        variables={"id": to_global_id("ReporterType", reporter.pk)},
+    )
+    assert not result.errors
+    assert result.data["articles"][0] == {"reporter": {"firstName": "r"}}
+    # The reporter the articles loaded isn't returned in place of the
+    # default manager.
+    assert result.data["reporter"] is None
+
+
+def test_identity_map_disabled(schema, reporter, info_with_context, monkeypatch):
+    monkeypatch.setattr(graphene_settings, "OPTIMIZE_QUERIES", False)
+    monkeypatch.setattr(graphene_settings, "REQUEST_IDENTITY_MAP", False)
+    query = """
+        query {
+          articles {
+            reporter {
+              firstName
+            }
+          }
+        }
+    """
+
+    with assert_num_queries(4):
+        result = schema.execute(query, context=info_with_context().context)
+    assert not result.errors
+
+
+def test_identity_map_instances():
+    pet = Pet.objects.create(name="Lassie", age=3)
+    identity_map = IdentityMap()
+
+    instance = Pet.objects.only("name").get(pk=pet.pk)
+    identity_map.add(instance)
+    assert identity_map.get(Pet, pet.pk) is None
+    assert identity_map.get(Pet, pet.pk, ["id", "name"]) is instance
+    assert identity_map.get(Pet, pet.pk, ["id", "age"]) is None
+
+    # Columns loaded later are merged into the stored instance.
+    identity_map.add(Pet.objects.only("age").get(pk=pet.pk))
+    assert identity_map.get(Pet, pet.pk) is instance
+    assert (instance.name, instance.age) == ("Lassie", 3)
+    assert identity_map.get(Pet, str(pet.pk)) is instance
+    assert identity_map.get(Pet, "invalid") is None
+
+    reporter = create_reporter()
+    identity_map.add(Reporter.objects.get(pk=reporter.pk))
+    # The instance isn't a CNNReporter, even if they share the table.
+    assert identity_map.get(CNNReporter, reporter.pk) is None
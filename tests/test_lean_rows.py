@@ -0,0 +1,235 @@
+from datetime import date
+
+import pytest
+
+import graphene
+
+from django.db.models.signals import post_init
+from graphql_relay.node.node import to_global_id
+
+from graphene_djangorestframework.fields import DjangoListField
+from graphene_djangorestframework.relay.fields import DjangoConnectionField
+from graphene_djangorestframework.relay.node import DjangoNode
+from graphene_djangorestframework.rows import LeanRow, get_row_class
+from graphene_djangorestframework.testing import assert_num_queries
+from graphene_djangorestframework.types import DjangoObjectType
+
+from .app.models import Article, Reporter
+from .schema import create_article, create_reporter, node_type
+
+pytestmark = pytest.mark.django_db
+
+
+@pytest.fixture
+def reporters():
+    reporters = [
+        create_reporter(first_name="r{}".format(i), last_name="l{}".format(i))
+        for i in range(2)
+    ]
+    for i, reporter in enumerate(reporters):
+        create_article(
+            reporter, headline="a{}".format(i), pub_date=date(2020, 1, i + 1)
+        )
+    return reporters
+
+
+@pytest.fixture
+def instances(reporters):
+    """
+    Record the model instances created while the test runs, once its rows
+    are created.
+    """
+    created = []
+
+    def receiver(sender, instance, **kwargs):
+        created.append(instance)
+
+    post_init.connect(receiver)
+    yield created
+    post_init.disconnect(receiver)
+
+
+@pytest.fixture
+def schema(registry):
+    class ReporterType(DjangoObjectType, registry=registry):
+        full_name = graphene.String()
+
+        class Meta:
+            model = Reporter
+            only_fields = ("first_name", "last_name", "email", "articles")
+            interfaces = (DjangoNode,)
+            lean_rows = True
+
+        def resolve_full_name(self, info):
+            return "{} {}".format(self.first_name, self.last_name)
+
+    ArticleType = node_type(Article, registry, only_fields=("headline", "pub_date"))
+
+    class Query(graphene.ObjectType):
+        reporters = DjangoConnectionField(ReporterType)
+        reporter_list = DjangoListField(ReporterType)
+        articles = DjangoConnectionField(ArticleType, lean_rows=True)
+        model_articles = DjangoConnectionField(ArticleType)
+        keyset_articles = DjangoConnectionField(
+            ArticleType, lean_rows=True, keyset_pagination=True
+        )
+
+        def resolve_reporter_list(self, info, **args):
+            return Reporter.objects.order_by("-pk")
+
+        def resolve_articles(self, info, **args):
+            return Article.objects.order_by("headline")
+
+        def resolve_model_articles(self, info, **args):
+            return Article.objects.order_by("headline")
+
+        def resolve_keyset_articles(self, info, **args):
+            return Article.objects.order_by("-headline")
+
+    return graphene.Schema(query=Query)
+
+
+def test_row_class():
+    row_class = get_row_class(Reporter, ("id", "first_name"))
+    assert get_row_class(Reporter, ("id", "first_name")) is row_class
+    row = row_class((1, "r"))
+    assert isinstance(row, LeanRow)
+    assert (row.pk, row.id, row.first_name) == (1, 1, "r")
+    assert repr(row) == "<Reporter row: id=1, first_name='r'>"
+    with pytest.raises(AttributeError):
+        row.first_name = "s"
+
+
+def test_scalar_fields_are_resolved_from_rows(
+    schema, reporters, instances, info_with_context
+):
+    query = """
+        query {
+          reporters(first: 1) {
+            totalCount
+            edges {
+              node {
+                id
+                firstName
+              }
+            }
+          }
+          reporterList {
+            lastName
+          }
+        }
+    """
+    with assert_num_queries(3) as context:
+        result = schema.execute(query, context=info_with_context().context)
+    assert not result.errors
+    assert result.data["reporters"] == {
+        "totalCount": 2,
+        "edges": [
+            {
+                "node": {
+                    "id": to_global_id("ReporterType", reporters[0].pk),
+                    "firstName": "r0",
+                }
+            }
+        ],
+    }
+    assert result.data["reporterList"] == [{"lastName": "l1"}, {"lastName": "l0"}]
+    assert instances == []
+
+    # Only the selected columns are fetched.
+    sql = context.captured_queries[0]["sql"]
+    assert '"first_name"' in sql and '"last_name"' not in sql
+
+
+def test_connection_field_option(schema, instances, info_with_context):
+    query = """
+        query Articles($lean: Boolean!) {
+          articles(first: 2) @include(if: $lean) {
+            edges {
+              node {
+                headline
+                pubDate
+              }
+            }
+          }
+          modelArticles(first: 2) @skip(if: $lean) {
+            edges {
+              node {
+                headline
+                pubDate
+              }
+            }
+          }
+        }
+    """
+    expected = {
+        "edges": [
+            {"node": {"headline": "a0", "pubDate": "2020-01-01"}},
+            {"node": {"headline": "a1", "pubDate": "2020-01-02"}},
+        ]
+    }
+
+    result = schema.execute(
+        query, variables={"lean": True}, context=info_with_context().context
+    )
+    assert not result.errors
+    assert result.data["articles"] == expected
+    assert instances == []
+
+    result = schema.execute(
+        query, variables={"lean": False}, context=info_with_context().context
+    )
+    assert not result.errors
+    assert result.data["modelArticles"] == expected
+    assert len(instances) == 2
+
+
+def test_keyset_pagination(schema, instances, info_with_context):
+    query = """
+        query Articles($after: String) {
+          keysetArticles(first: 1, after: $after) {
+            edges {
+              cursor
+              node {
+                headline
+              }
+            }
+          }
+        }
+    """
+    result = schema.execute(query, context=info_with_context().context)
+    assert not result.errors
+    edge = result.data["keysetArticles"]["edges"][0]
+    assert edge["node"] == {"headline": "a1"}
+
+    # Cursors are encoded from the ordering values of the rows.
+    result = schema.execute(
+        query, variables={"after": edge["cursor"]}, context=info_with_context().context
+    )
+    assert not result.errors
+    edges = result.data["keysetArticles"]["edges"]
+    assert [edge["node"] for edge in edges] == [{"headline": "a0"}]
+    assert instances == []
+
+
+@pytest.mark.parametrize(
+    "selection", ["fullName", "articles { edges { node { headline } } }"]
+)
+def test_falls_back_to_instances(schema, instances, info_with_context, selection):
+    query = """
+        query {
+          reporters {
+            edges {
+              node {
+                firstName
+                %s
+              }
+            }
+          }
+        }
+    """ % (selection,)
+    result = schema.execute(query, context=info_with_context().context)
+    assert not result.errors
+    edges = result.data["reporters"]["edges"]
+    assert [edge["node"]["firstName"] for edge in edges] == ["r0", "r1"]
+    assert len([i for i in instances if isinstance(i, Reporter)]) == 2
@@ -0,0 +1,333 @@
+import pytest
+
+import graphene
+
+from graphql_relay.node.node import to_global_id
+
+from graphene_djangorestframework.types import DjangoObjectType
+from graphene_djangorestframework.fields import DjangoField, DjangoListField
+from graphene_djangorestframework.relay.node import DjangoNode
+from graphene_djangorestframework.relay.fields import DjangoConnectionField
+from graphene_djangorestframework.middleware import DeferredFieldsMiddleware
+from graphene_djangorestframework.testing import assert_num_queries
+
+from .app.models import Article, Film, Reporter
+from .schema import create_article, create_reporters, node_type
+
+pytestmark = [pytest.mark.django_db, pytest.mark.usefixtures("optimize_queries")]
+
+
+@pytest.fixture
+def reporters():
+    reporters = create_reporters()
+    for i, reporter in enumerate(reporters):
+        create_article(reporter, headline="a{}".format(i))
+        Film.objects.create().reporters.add(reporter)
+    return reporters
+
+
+@pytest.fixture
+def schema(registry):
+    class ReporterType(DjangoObjectType, registry=registry):
+        class Meta:
+            model = Reporter
+            interfaces = (DjangoNode,)
+            use_connection = False
+
+        def resolve_pets(self, info):
+            return self.pets.filter(first_name="r0")
+
+    node_type(Film, registry, interfaces=())
+
+    class ArticleType(DjangoObjectType, registry=registry):
+        reporter_name = DjangoField(graphene.String, select_related=("reporter",))
+        headline_length = DjangoField(graphene.Int, only=("headline",))
+        lang_name = DjangoField(graphene.String, only=())
+
+        class Meta:
+            model = Article
+            interfaces = (DjangoNode,)
+
+        def resolve_reporter_name(self, info):
+            return self.reporter.first_name
+
+        def resolve_headline_length(self, info):
+            return len(self.headline)
+
+        def resolve_lang_name(self, info):
+            return self.get_lang_display()
+
+    class Query(graphene.ObjectType):
+        articles = DjangoConnectionField(ArticleType)
+        reporters = DjangoListField(ReporterType)
+        reporter = DjangoNode.Field(ReporterType)
+
+        def resolve_reporters(self, info):
+            return Reporter.objects.all()
+
+    return graphene.Schema(query=Query)
+
+
+def test_optimizer_select_related_in_connection(schema, reporters, info_with_context):
+    query = """
+        query {
+          articles {
+            totalCount
+            edges {
+              node {
+                headline
+                reporter {
+                  firstName
+                }
+              }
+            }
+          }
+        }
+    """
+
+    # One count and one select, regardless of the number of edges.
+    with assert_num_queries(2):
+        result = schema.execute(query, context=info_with_context().context)
+    assert not result.errors
+    assert result.data["articles"]["totalCount"] == 3
+    assert [
+        edge["node"]["reporter"]["firstName"]
+        for edge in result.data["articles"]["edges"]
+    ] == ["r0", "r1", "r2"]
+
+
+def test_optimizer_prefetch_related_in_list(schema, reporters, info_with_context):
+    query = """
+        query {
+          reporters {
+            firstName
+            films {
+              genre
+            }
+          }
+        }
+    """
+
+    with assert_num_queries(2):
+        result = schema.execute(query, context=info_with_context().context)
+    assert not result.errors
+    assert result.data["reporters"] == [
+        {"firstName": "r0", "films": [{"genre": "OT"}]},
+        {"firstName": "r1", "films": [{"genre": "OT"}]},
+        {"firstName": "r2", "films": [{"genre": "OT"}]},
+    ]
+
+
+def test_optimizer_skips_prefetch_of_custom_resolver(
+    schema, reporters, info_with_context
+):
+    for reporter in reporters[1:]:
+        reporter.pets.add(reporters[0])
+    query = """
+        query {
+          reporters {
+            pets {
+              firstName
+            }
+          }
+        }
+    """
+
+    # The resolver filters the pets itself, one query per reporter and no
+    # prefetch of every pet.
+    with assert_num_queries(4):
+        result = schema.execute(query, context=info_with_context().context)
+    assert not result.errors
+    assert result.data["reporters"] == [
+        {"pets": []},
+        {"pets": [{"firstName": "r0"}]},
+        {"pets": [{"firstName": "r0"}]},
+    ]
+
+
+def test_optimizer_get_node_with_fragments(schema, reporters, info_with_context):
+    reporter = reporters[0]
+    Film.objects.create().reporters.add(reporter)
+    query = """
+        query Reporter($id: ID!) {
+          reporter(id: $id) {
+            ...ReporterFields
+          }
+        }
+
+        fragment ReporterFields on ReporterType {
+          ... on ReporterType {
+            films {
+              reporters {
+                firstName
+              }
+            }
+          }
+        }
+    """
+
+    with assert_num_queries(3):
+        result = schema.execute(
+            query,
+            context=info_with_context().context,
+            variables={"id": to_global_id("ReporterType", reporter.pk)},
+        )
+    assert not result.errors
+    assert result.data == {
+        "reporter": {
+            "films": [
+                {"reporters": [{"firstName": "r0"}]},
+                {"reporters": [{"firstName": "r0"}]},
+            ]
+        }
+    }
+
+
+def test_optimizer_field_hints(schema, reporters, info_with_context):
+    query = """
+        query {
+          articles {
+            edges {
+              node {
+                reporterName
+              }
+            }
+          }
+        }
+    """
+
+    with assert_num_queries(1):
+        result = schema.execute(query, context=info_with_context().context)
+    assert not result.errors
+    assert [
+        edge["node"]["reporterName"] for edge in result.data["articles"]["edges"]
+    ] == ["r0", "r1", "r2"]
+
+
+def test_optimizer_skipped_selections(schema, reporters, info_with_context):
+    query = """
+        query Articles($skip: Boolean!) {
+          articles {
+            edges {
+              node {
+                headline
+                reporter @skip(if: $skip) {
+                  firstName
+                }
+              }
+            }
+          }
+        }
+    """
+
+    with assert_num_queries(1) as context:
+        result = schema.execute(
+            query, context=info_with_context().context, variables={"skip": True}
+        )
+    assert not result.errors
+    assert "JOIN" not in context.captured_queries[-1]["sql"]
+
+
+def test_optimizer_only_selected_columns(schema, reporters, info_with_context):
+    query = """
+        query {
+          articles {
+            edges {
+              node {
+                id
+                headline
+                reporter {
+                  firstName
+                }
+              }
+            }
+          }
+        }
+    """
+
+    with assert_num_queries(1) as context:
+        result = schema.execute(query, context=info_with_context().context)
+    assert not result.errors
+
+    sql = context.captured_queries[-1]["sql"]
+    assert '"app_article"."headline"' in sql
+    assert '"app_article"."reporter_id"' in sql
+    assert '"app_article"."lang"' not in sql
+    assert '"app_article"."pub_date"' not in sql
+    # Reporter reads reporter_type in __init__, its columns can't be deferred.
+    assert '"app_reporter"."reporter_type"' in sql
+
+
+def test_optimizer_only_with_resolver_hints(schema, reporters, info_with_context):
+    query = """
+        query {
+          articles {
+            edges {
+              node {
+                headlineLength
+              }
+            }
+          }
+        }
+    """
+
+    with assert_num_queries(1) as context:
+        result = schema.execute(query, context=info_with_context().context)
+    assert not result.errors
+    assert [
+        edge["node"]["headlineLength"] for edge in result.data["articles"]["edges"]
+    ] == [2, 2, 2]
+
+    sql = context.captured_queries[-1]["sql"]
+    assert '"app_article"."headline"' in sql
+    assert '"app_article"."lang"' not in sql
+
+
+def test_optimizer_only_without_resolver_hints(schema, reporters, info_with_context):
+    query = """
+        query {
+          articles {
+            edges {
+              node {
+                reporterName
+              }
+            }
+          }
+        }
+    """
+
+    with assert_num_queries(1) as context:
+        result = schema.execute(query, context=info_with_context().context)
+    assert not result.errors
+
+    sql = context.captured_queries[-1]["sql"]
+    assert '"app_article"."lang"' in sql
+
+
+def test_optimizer_logs_deferred_fields(schema, reporters, info_with_context, caplog):
+    query = """
+        query {
+          articles {
+            edges {
+              node {
+                langName
+              }
+            }
+          }
+        }
+    """
+
+    # The resolver declares it doesn't need any column, but reads `lang`,
+    # loaded by an extra query per row.
+    with assert_num_queries(1 + len(reporters)):
+        result = schema.execute(
+            query,
+            context=info_with_context().context,
+            middleware=[DeferredFieldsMiddleware()],
+        )
+    assert not result.errors
+    assert result.data["articles"]["edges"][0]["node"]["langName"] == "Spanish"
+    assert (
+        "Resolving ArticleType.langName loaded the deferred fields lang of "
+        "app.Article with extra queries." in caplog.text
+    )
@@ -0,0 +1,106 @@
+import pytest
+
+import graphene
+
+from graphene_djangorestframework.relay.fields import DjangoConnectionField
+from graphene_djangorestframework.testing import assert_num_queries
+from graphene_djangorestframework.types import DjangoObjectType
+
+from .app.models import Article, Film, Reporter
+from .schema import create_article, create_reporters, node_type
+
+
+def get_schema(registry):
+    ReporterType = node_type(
+        Reporter, registry, only_fields=("first_name", "articles"), count_fields=True
+    )
+    ArticleType = node_type(Article, registry, only_fields=("headline", "reporter"))
+
+    class Query(graphene.ObjectType):
+        reporters = DjangoConnectionField(ReporterType)
+        articles = DjangoConnectionField(ArticleType)
+
+    return graphene.Schema(query=Query)
+
+
+@pytest.fixture
+def reporters():
+    reporters = create_reporters()
+    for i in range(3):
+        create_article(reporters[0], headline="a{}".format(i), editor=reporters[1])
+    reporters[0].pets.add(reporters[1], reporters[2])
+    Film.objects.create().reporters.add(reporters[0], reporters[1])
+    return reporters
+
+
+def test_count_fields(registry):
+    schema = get_schema(registry)
+    fields = schema.get_type("ReporterType").fields
+    assert str(fields["articlesCount"].type) == "Int!"
+    assert str(fields["petsCount"].type) == "Int!"
+    assert str(fields["filmsCount"].type) == "Int!"
+    # Only to-many relations are counted.
+    assert "articlesCount" not in schema.get_type("ArticleType").fields
+
+    with pytest.raises(AssertionError):
+
+        class ArticleCountType(DjangoObjectType, registry=registry):
+            class Meta:
+                model = Article
+                count_fields = ("reporter",)
+
+
+@pytest.mark.django_db
+def test_count_fields_are_annotated(registry, reporters, info_with_context):
+    schema = get_schema(registry)
+    query = """
+        query {
+          reporters {
+            edges {
+              node {
+                firstName
+                articlesCount
+                petsCount
+                filmsCount
+              }
+            }
+          }
+        }
+    """
+    with assert_num_queries(1):
+        result = schema.execute(query, context=info_with_context().context)
+    assert not result.errors
+    assert [edge["node"] for edge in result.data["reporters"]["edges"]] == [
+        {"firstName": "r0", "articlesCount": 3, "petsCount": 2, "filmsCount": 1},
+        {"firstName": "r1", "articlesCount": 0, "petsCount": 1, "filmsCount": 1},
+        {"firstName": "r2", "articlesCount": 0, "petsCount": 1, "filmsCount": 0},
+    ]
+
+
+@pytest.mark.django_db
+def test_count_fields_of_joined_rows(
+    optimize_queries, registry, reporters, info_with_context
+):
+    schema = get_schema(registry)
+    query = """
+        query {
+          articles(first: 1) {
+            edges {
+              node {
+                headline
+                reporter {
+                  articlesCount
+                }
+              }
+            }
+          }
+        }
+    """
+    # The reporter the optimizer joins to the article isn't annotated, its relation is
+    # counted separately.
+    with assert_num_queries(2):
+        result = schema.execute(query, context=info_with_context().context)
+    assert not result.errors
+    assert result.data["articles"]["edges"] == [
+        {"node": {"headline": "a0", "reporter": {"articlesCount": 3}}}
+    ]